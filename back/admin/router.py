@@ -1,6 +1,8 @@
 
 from fastapi import APIRouter
-from back.database import fetch_one, fetch_all
+from back.database import fetch_one, fetch_all, get_pool_stats
+from back.daily.worker_locations.partitions import location_partition_manager
+from back.daily.safety_logs.storage import danger_image_store
 
 router = APIRouter()
 
@@ -25,3 +27,28 @@ async def get_system_stats():
             "system_status": "정상"
         }
     }
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """DB Connection Pool 현황 (checkout/overflow 및 요청 공유 연결 통계)"""
+    return {"success": True, "data": get_pool_stats()}
+
+@router.get("/location-partitions")
+async def get_location_partitions():
+    """위치 로그 파티션 현황 (생성/삭제 통계 및 파티션 목록)"""
+    partitions = await location_partition_manager.list_partitions()
+    return {"success": True, "data": {**location_partition_manager.get_stats(), "partitions": partitions}}
+
+@router.get("/blob-store")
+async def get_blob_store_stats():
+    """위험 구역 사진 저장소 현황 (저장/중복 제거/GC 건수)"""
+    return {"success": True, "data": danger_image_store.get_stats()}
+
+@router.post("/blob-store/gc")
+async def run_blob_store_gc(full: bool = False):
+    """
+    사진 저장소 GC 즉시 실행
+    - full=true: 저장소 전체를 DB 참조와 대조해 고아 파일 정리 (재시작 등으로 유실된 GC 후보 포함)
+    """
+    collected = await danger_image_store.collect(force_all=full)
+    return {"success": True, "data": {"collected": collected}}
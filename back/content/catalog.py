@@ -0,0 +1,37 @@
+from typing import Any, List, Optional, TypedDict
+from back.utils.catalog_cache import CatalogCache
+from back.content.work_info.repository import work_info_repository
+from back.content.danger_info.repository import danger_info_repository
+from back.content.safety_info.repository import safety_info_repo
+
+class WorkInfoRow(TypedDict):
+    id: int
+    work_type: str
+    base_risk_score: Optional[int]
+    checklist_items: Optional[List[Any]]
+
+class DangerInfoRow(TypedDict):
+    id: int
+    danger_type: str
+    icon: Optional[str]
+    color: Optional[str]
+    description: Optional[str]
+    safety_guidelines: Optional[Any]
+    risk_level: Optional[int]
+
+class SafetyInfoRow(TypedDict, total=False):
+    id: int
+    category: str
+    title: str
+    description: Optional[str]
+    checklist: Optional[Any]
+    risk_factors: Optional[Any]
+    safety_measures: Optional[Any]
+    required_ppe: Optional[Any]
+    summary: Optional[str]
+    embedding: Optional[Any]
+
+# [CONTENT] 콘텐츠 마스터 카탈로그 (프로세스 단위 메모리 캐시, 정렬은 각 repository get_all 기준)
+work_info_catalog: CatalogCache[WorkInfoRow] = CatalogCache("work_info", work_info_repository.get_all)
+danger_info_catalog: CatalogCache[DangerInfoRow] = CatalogCache("danger_info", danger_info_repository.get_all)
+safety_info_catalog: CatalogCache[SafetyInfoRow] = CatalogCache("safety_info", safety_info_repo.get_all)
@@ -1,17 +1,23 @@
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from back.content.danger_info.repository import danger_info_repository
+from back.utils.versioning import resource_versions
+from back.content.catalog import danger_info_catalog
 
 router = APIRouter()
 
 @router.get("/")
-async def list_danger_info():
+async def list_danger_info(request: Request, response: Response):
     """위험 요소 정보 목록 조회"""
-    data = await danger_info_repository.get_all()
+    cached = resource_versions.not_modified(request, response, "danger_info")
+    if cached:
+        return cached
+    data = await danger_info_catalog.get_all()
     return {"success": True, "data": data}
 
 @router.post("/")
 async def create_danger_info(data: dict):
     """새로운 위험 요소 정보 생성"""
     result = await danger_info_repository.create(data)
+    await danger_info_catalog.invalidate()  # 캐시 재적재 + 목록 ETag 변경
     return {"success": True, "data": result}
@@ -1,14 +1,20 @@
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import Optional
 from back.content.safety_info.service import safety_info_service
-from back.content.safety_info.repository import safety_info_repo
+from back.content.catalog import safety_info_catalog
+from back.utils.versioning import resource_versions
 
 router = APIRouter()
 
 @router.get("/")
-async def list_safety_info(category: Optional[str] = None):
-    data = await safety_info_repo.get_all(category)
+async def list_safety_info(request: Request, response: Response, category: Optional[str] = None):
+    cached = resource_versions.not_modified(request, response, "safety_info", category)
+    if cached:
+        return cached
+    data = await safety_info_catalog.get_all()
+    if category:
+        data = [row for row in data if row["category"] == category]
     return {"success": True, "data": data}
 
 
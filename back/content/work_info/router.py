@@ -1,9 +1,13 @@
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from back.content.work_info.service import work_info_service
+from back.utils.versioning import resource_versions
 
 router = APIRouter()
 
 @router.get("/")
-async def list_work_info():
+async def list_work_info(request: Request, response: Response):
+    cached = resource_versions.not_modified(request, response, "work_info")
+    if cached:
+        return cached
     return await work_info_service.get_work_info_list()
@@ -1,11 +1,17 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, UniqueConstraint, Index
 from back.database import Base
 from datetime import datetime
 
 class daily_attendance(Base):
     """[DAILY] 일일 출역 기록"""
     __tablename__ = "daily_attendance"
+    # 작업자 1명당 프로젝트·날짜별 1건 (출근 upsert의 ON CONFLICT 대상)
+    __table_args__ = (
+        UniqueConstraint("user_id", "project_id", "date", name="uq_attendance_user_project_date"),
+        Index("ix_daily_attendance_project_id_date", "project_id", "date"),
+        Index("ix_daily_attendance_user_id_date", "user_id", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("sys_users.id", ondelete="CASCADE"), nullable=False)
     project_id = Column(Integer, ForeignKey("project_master.id", ondelete="CASCADE"), nullable=False)
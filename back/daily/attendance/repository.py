@@ -1,6 +1,7 @@
 
-from back.database import fetch_all, fetch_one, insert_and_return
-from datetime import date
+from back.database import fetch_all, fetch_one, insert_and_return, insert_and_return_all
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
 
 class attendance_repository:
     """[DAILY_ATTENDANCE] 데이터 접근"""
@@ -20,20 +21,164 @@ class attendance_repository:
         sql = "SELECT * FROM daily_attendance WHERE user_id = :uid AND date = :d"
         return await fetch_one(sql, {"uid": uid, "d": d})
 
+    @staticmethod
+    async def get_worker_status_board(pid: int, d: date, limit: Optional[int] = None, offset: int = 0):
+        """
+        프로젝트 투입 인원(ACTIVE)의 출퇴근·작업계획·안전점검 현황 (단일 쿼리)
+        - 작업계획/출결/점검 로그는 CTE에서 미리 집계 후 조인
+        - 점검 로그는 created_at 범위 조건으로 조회 (인덱스 사용 가능)
+        - 정렬: 출근 중 > 퇴근 > 미출근, 업체명, 이름 / total_count: 페이지 적용 전 전체 건수
+        - 전체 건수는 페이지와 별도로 집계해 항상 1행 이상 반환 (페이지가 비면 user_id가 NULL인 1행)
+        """
+        sql = """
+            WITH planned AS (
+                SELECT DISTINCT dwu.worker_id
+                FROM daily_work_plans dwp
+                JOIN daily_worker_users dwu ON dwu.plan_id = dwp.id
+                WHERE dwp.project_id = :pid AND dwp.date = :d
+            ),
+            att AS (
+                SELECT user_id, check_in_time, check_out_time
+                FROM daily_attendance
+                WHERE project_id = :pid AND date = :d
+            ),
+            safety AS (
+                SELECT user_id, COUNT(*) AS check_count
+                FROM daily_safety_logs
+                WHERE project_id = :pid AND created_at >= :day_start AND created_at < :day_end
+                GROUP BY user_id
+            ),
+            board AS (
+                SELECT
+                    u.id AS user_id,
+                    u.full_name,
+                    u.phone,
+                    u.job_title AS position,
+                    c.name AS company_name,
+                    c.trade_type,
+                    (pl.worker_id IS NOT NULL) AS is_planned,
+                    a.check_in_time,
+                    a.check_out_time,
+                    COALESCE(s.check_count, 0) > 0 AS safety_checked,
+                    CASE
+                        WHEN a.check_in_time IS NULL THEN 1
+                        WHEN a.check_out_time IS NULL THEN 3
+                        ELSE 2
+                    END AS sort_score
+                FROM project_users pu
+                JOIN sys_users u ON u.id = pu.user_id
+                LEFT JOIN sys_companies c ON c.id = u.company_id
+                LEFT JOIN planned pl ON pl.worker_id = u.id
+                LEFT JOIN att a ON a.user_id = u.id
+                LEFT JOIN safety s ON s.user_id = u.id
+                WHERE pu.project_id = :pid AND pu.status = 'ACTIVE'
+            ),
+            page AS (
+                SELECT * FROM board
+                ORDER BY sort_score DESC, company_name NULLS LAST, full_name, user_id
+                LIMIT CAST(:limit AS integer) OFFSET CAST(:offset AS integer)
+            ),
+            total AS (
+                SELECT COUNT(*) AS total_count FROM board
+            )
+            SELECT page.*, total.total_count
+            FROM total
+            LEFT JOIN page ON TRUE
+            ORDER BY page.sort_score DESC, page.company_name NULLS LAST, page.full_name, page.user_id
+        """
+        day_start = datetime.combine(d, time.min)
+        return await fetch_all(sql, {
+            "pid": pid, "d": d,
+            "day_start": day_start, "day_end": day_start + timedelta(days=1),
+            "limit": limit, "offset": offset,
+        })
+
     @staticmethod
     async def upsert_check_in(uid: int, pid: int, d: date):
-        from datetime import datetime
-        # 이미 있는지 확인
-        existing = await attendance_repository.get_user_today(uid, d)
-        if existing:
-            sql = "UPDATE daily_attendance SET check_in_time = :now, status = 'IN' WHERE id = :id"
-            await insert_and_return(sql, {"now": datetime.now(), "id": existing['id']})
-        else:
-            sql = """
-                INSERT INTO daily_attendance (user_id, project_id, date, check_in_time, status)
-                VALUES (:uid, :pid, :d, :now, 'IN')
-                RETURNING *
-            """
-            await insert_and_return(sql, {"uid": uid, "pid": pid, "d": d, "now": datetime.now()})
-        return True
+        """출근 처리 (한 번의 upsert, uq_attendance_user_project_date 기준)"""
+        sql = """
+            INSERT INTO daily_attendance (user_id, project_id, date, check_in_time, status)
+            VALUES (:uid, :pid, :d, :now, 'IN')
+            ON CONFLICT (user_id, project_id, date)
+            DO UPDATE SET check_in_time = EXCLUDED.check_in_time, status = 'IN'
+            RETURNING *
+        """
+        return await insert_and_return(sql, {"uid": uid, "pid": pid, "d": d, "now": datetime.now()})
+
+    @staticmethod
+    async def bulk_check_in(scans: List[Tuple[int, int, date, datetime]]):
+        """
+        출근 일괄 처리 (게이트 리더기) - (user_id, project_id, date, scanned_at) 목록을 한 번의 upsert로 반영
+        - 같은 (user_id, project_id, date)가 중복되면 안 됨 (호출 측에서 정리)
+        - 이미 출근 기록이 있으면 더 이른 시각 유지, 존재하지 않는 사용자/프로젝트는 건너뜀
+        """
+        if not scans:
+            return []
+        sql = """
+            INSERT INTO daily_attendance (user_id, project_id, date, check_in_time, status)
+            SELECT t.user_id, t.project_id, t.d, t.scanned_at, 'IN'
+            FROM unnest(
+                CAST(:uids AS integer[]), CAST(:pids AS integer[]),
+                CAST(:dates AS date[]), CAST(:times AS timestamp[])
+            ) AS t(user_id, project_id, d, scanned_at)
+            JOIN sys_users u ON u.id = t.user_id
+            JOIN project_master p ON p.id = t.project_id
+            ON CONFLICT (user_id, project_id, date)
+            DO UPDATE SET check_in_time = LEAST(daily_attendance.check_in_time, EXCLUDED.check_in_time), status = 'IN'
+            RETURNING id, user_id, project_id, date, check_in_time, status
+        """
+        return await insert_and_return_all(sql, {
+            "uids": [s[0] for s in scans],
+            "pids": [s[1] for s in scans],
+            "dates": [s[2] for s in scans],
+            "times": [s[3] for s in scans],
+        })
+
+    @staticmethod
+    async def apply_gate_events(rows: List[dict]):
+        """
+        게이트 출입 이벤트 일괄 반영 - 작업자·프로젝트·날짜별로 집계된 행을 한 번의 upsert로 반영
+        - rows: {user_id, project_id, date, first_in, last_out, last_direction, last_at}
+        - 출근은 더 이른 시각, 퇴근은 더 늦은 시각 유지
+        - 상태는 이번 묶음의 마지막 이벤트가 기존 기록보다 늦을 때만 갱신
+        """
+        if not rows:
+            return []
+        sql = """
+            WITH t AS (
+                SELECT e.*
+                FROM unnest(
+                    CAST(:uids AS integer[]), CAST(:pids AS integer[]), CAST(:dates AS date[]),
+                    CAST(:first_ins AS timestamp[]), CAST(:last_outs AS timestamp[]),
+                    CAST(:directions AS text[]), CAST(:last_ats AS timestamp[])
+                ) AS e(user_id, project_id, d, first_in, last_out, last_direction, last_at)
+                JOIN sys_users u ON u.id = e.user_id
+                JOIN project_master p ON p.id = e.project_id
+            )
+            INSERT INTO daily_attendance (user_id, project_id, date, check_in_time, check_out_time, status)
+            SELECT t.user_id, t.project_id, t.d, t.first_in, t.last_out, t.last_direction
+            FROM t
+            ON CONFLICT (user_id, project_id, date)
+            DO UPDATE SET
+                check_in_time = LEAST(daily_attendance.check_in_time, EXCLUDED.check_in_time),
+                check_out_time = GREATEST(daily_attendance.check_out_time, EXCLUDED.check_out_time),
+                status = CASE
+                    WHEN (
+                        SELECT t.last_at FROM t
+                        WHERE t.user_id = EXCLUDED.user_id AND t.project_id = EXCLUDED.project_id AND t.d = EXCLUDED.date
+                    ) >= COALESCE(GREATEST(daily_attendance.check_in_time, daily_attendance.check_out_time), '-infinity')
+                    THEN EXCLUDED.status
+                    ELSE daily_attendance.status
+                END
+            RETURNING id, user_id, project_id, date, check_in_time, check_out_time, status
+        """
+        return await insert_and_return_all(sql, {
+            "uids": [r["user_id"] for r in rows],
+            "pids": [r["project_id"] for r in rows],
+            "dates": [r["date"] for r in rows],
+            "first_ins": [r["first_in"] for r in rows],
+            "last_outs": [r["last_out"] for r in rows],
+            "directions": [r["last_direction"] for r in rows],
+            "last_ats": [r["last_at"] for r in rows],
+        })
 
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException
-from back.daily.attendance.service import attendance_service
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from back.daily.attendance.service import attendance_service, gate_batch_results
+from back.daily.attendance.schema import BulkCheckInRequest
+from back.utils.versioning import resource_versions
+from back.utils.date_utils import get_today
 from typing import List, Optional
+import json
 
 router = APIRouter()
 
 @router.get("")
-async def list_attendance(project_id: int):
+async def list_attendance(request: Request, response: Response, project_id: int):
+    cached = resource_versions.not_modified(request, response, "attendance", project_id, get_today())
+    if cached:
+        return cached
     data = await attendance_service.get_today_list(project_id)
     return {"success": True, "data": data}
 
@@ -31,91 +38,92 @@ async def check_in(data: dict):
         
     try:
         await attendance_service.do_check_in(uid, pid)
+        await resource_versions.bump("attendance", pid, get_today())
         return {"success": True, "message": "출근 처리되었습니다."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/check-in/bulk")
+async def bulk_check_in(req: BulkCheckInRequest):
+    """
+    [DEVICE] 게이트 리더기 일괄 출근 (배지 스캔 여러 건을 한 번에 반영)
+    - 중복 스캔은 작업자·프로젝트·날짜별 가장 이른 스캔만 반영
+    - applied: 실제 반영된 출근 건수 (존재하지 않는 사용자/프로젝트 제외)
+    """
+    result = await attendance_service.do_bulk_check_in(req)
+    return {"success": True, "accepted": result["accepted"], "applied": result["applied"], "data": result["rows"]}
+
+async def _ndjson_objects(request: Request):
+    """요청 본문을 받는 대로 줄 단위 JSON으로 변환 (전체 본문을 메모리에 올리지 않음)"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_json_line(line)
+    if buffer.strip():
+        yield _parse_json_line(buffer)
+
+def _parse_json_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None  # 검증 단계에서 거부 처리
+
+async def _json_objects(events: list):
+    for event in events:
+        yield event
+
+@router.post("/gate-events")
+async def ingest_gate_events(request: Request):
+    """
+    [DEVICE] 게이트(개찰구) 출입 이벤트 일괄 수집 (출근/퇴근)
+    - Content-Type: application/x-ndjson → 줄 단위 스트림 처리
+    - 그 외 JSON: 이벤트 배열 또는 {"events": [...]}
+    - 이벤트: {event_id, user_id, project_id, direction: IN|OUT, timestamp}
+    - event_id로 중복 제거, Idempotency-Key 헤더 지정 시 같은 키의 재요청은 이전 결과 반환
+    """
+    idempotency_key = request.headers.get("idempotency-key")
+    if idempotency_key:
+        replay = gate_batch_results.get(idempotency_key)
+        if replay is not None:
+            return {**replay, "replayed": True}
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items = _ndjson_objects(request)
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid JSON body")
+        events = body.get("events") if isinstance(body, dict) else body
+        if not isinstance(events, list):
+            raise HTTPException(status_code=400, detail="events array is required")
+        items = _json_objects(events)
+
+    result = {"success": True, "data": await attendance_service.ingest_gate_events(items)}
+    if idempotency_key:
+        gate_batch_results.set(idempotency_key, result)
+    return result
+
 @router.get("/project-status")
-async def get_project_worker_status(project_id: int, d: Optional[str] = None):
+async def get_project_worker_status(
+    project_id: int,
+    d: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
     """
     [MANAGER] 프로젝트 투입 인원의 출퇴근 및 안전점검 현황 조회
     - project_id: 프로젝트 ID
     - d: 날짜 (YYYY-MM-DD), 미지정 시 오늘
+    - limit/offset: 페이지 (미지정 시 전체), total: 전체 인원 수
+    - 정렬: 1순위 상태(출근 중 > 퇴근 > 미출근), 2순위 업체명, 3순위 이름
     """
     from datetime import date as dt_date
-    from back.database import fetch_all
-    
-    target_date = dt_date.fromisoformat(d) if d else dt_date.today()
-    
-    # 1. 해당 날짜에 작업 계획이 있거나 실제 출결 기록이 있는 작업자 조회 (날짜별 관리)
-    # 1. 대상 작업자 및 오늘 작업 계획 포함 여부 조회
-    sql_workers = """
-        SELECT 
-            u.id as user_id,
-            u.full_name,
-            u.phone,
-            u.job_title as position,
-            c.name as company_name,
-            c.trade_type,
-            EXISTS (
-                SELECT 1 FROM daily_worker_users dwu
-                JOIN daily_work_plans dwp ON dwu.plan_id = dwp.id
-                WHERE dwu.worker_id = u.id AND dwp.project_id = :pid AND dwp.date = :d
-            ) as is_planned
-        FROM sys_users u
-        JOIN project_users pu ON u.id = pu.user_id
-        LEFT JOIN sys_companies c ON u.company_id = c.id
-        WHERE pu.project_id = :pid AND pu.status = 'ACTIVE'
-    """
-    workers = await fetch_all(sql_workers, {"pid": project_id, "d": target_date})
-    
-    # 2. 각 작업자의 출퇴근 기록 조회
-    sql_attendance = """
-        SELECT user_id, check_in_time, check_out_time, status
-        FROM daily_attendance
-        WHERE project_id = :pid AND date = :d
-    """
-    attendance_records = await fetch_all(sql_attendance, {"pid": project_id, "d": target_date})
-    attendance_map = {r['user_id']: r for r in attendance_records}
-    
-    # 3. 각 작업자의 안전 점검 로그 조회
-    sql_safety = """
-        SELECT user_id, COUNT(*) as check_count
-        FROM daily_safety_logs
-        WHERE project_id = :pid AND cast(created_at as date) = :d
-        GROUP BY user_id
-    """
-    safety_records = await fetch_all(sql_safety, {"pid": project_id, "d": target_date})
-    safety_map = {r['user_id']: r['check_count'] for r in safety_records}
-    
-    # 4. 데이터 병합 및 정렬 로직
-    result = []
-    for worker in workers:
-        uid = worker['user_id']
-        att = attendance_map.get(uid, {})
-        safety_checked = safety_map.get(uid, 0) > 0
-        
-        # 정렬 점수 계산 (출근 중: 3, 퇴근: 2, 미출근: 1)
-        sort_score = 1
-        if att.get('check_in_time'):
-            sort_score = 3 if not att.get('check_out_time') else 2
-        
-        result.append({
-            "user_id": uid,
-            "full_name": worker['full_name'],
-            "phone": worker['phone'],
-            "position": worker['position'],
-            "company_name": worker['company_name'],
-            "trade_type": worker['trade_type'],
-            "is_planned": worker['is_planned'],
-            "check_in_time": att.get('check_in_time'),
-            "check_out_time": att.get('check_out_time'),
-            "safety_checked": safety_checked,
-            "sort_score": sort_score
-        })
-    
-    # 정렬: 1순위 상태(점수), 2순위 업체명, 3순위 이름
-    result.sort(key=lambda x: (-x['sort_score'], x['company_name'], x['full_name']))
-    
-    return {"success": True, "data": result}
 
+    target_date = dt_date.fromisoformat(d) if d else dt_date.today()
+    board = await attendance_service.get_worker_status_board(project_id, target_date, limit, offset)
+    return {"success": True, "data": board["items"], "total": board["total"]}
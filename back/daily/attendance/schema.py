@@ -1,10 +1,28 @@
 
 from pydantic import BaseModel
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, List, Literal
 
 class AttendanceResponse(BaseModel):
     id: int
     user_id: int
     full_name: str
     check_in_time: Optional[datetime] = None
+
+class AttendanceScan(BaseModel):
+    """게이트 리더기 배지 스캔 1건"""
+    user_id: int
+    project_id: Optional[int] = None  # 미지정 시 요청의 project_id
+    scanned_at: Optional[datetime] = None  # 미지정 시 서버 수신 시각
+
+class BulkCheckInRequest(BaseModel):
+    project_id: Optional[int] = None
+    scans: List[AttendanceScan]
+
+class GateEvent(BaseModel):
+    """게이트(개찰구) 출입 이벤트 1건"""
+    event_id: str  # 장비가 부여한 고유 ID (중복 전송 제거용 멱등 키)
+    user_id: int
+    project_id: int
+    direction: Literal["IN", "OUT"]
+    timestamp: Optional[datetime] = None  # 미지정 시 서버 수신 시각
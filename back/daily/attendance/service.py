@@ -1,6 +1,44 @@
 
 from back.daily.attendance.repository import attendance_repository
-from datetime import date
+from back.daily.attendance.schema import GateEvent
+from back.utils.cache import TTLCache
+from back.utils.versioning import resource_versions
+from back.utils.date_utils import to_local_naive
+from datetime import date, datetime
+from pydantic import ValidationError
+from typing import Any, AsyncIterable, Dict, List, Optional
+import os
+
+# === 게이트 이벤트 설정 ===
+GATE_EVENT_FLUSH_SIZE = int(os.getenv("GATE_EVENT_FLUSH_SIZE", "500"))  # 이 건수마다 DB 반영 (스트림 중간 반영)
+GATE_EVENT_DEDUP_TTL = float(os.getenv("GATE_EVENT_DEDUP_TTL", "86400"))  # 처리한 event_id 보관 시간(초)
+GATE_EVENT_DEDUP_MAX = int(os.getenv("GATE_EVENT_DEDUP_MAX", "200000"))
+GATE_EVENT_MAX_ERRORS = 20  # 응답에 포함할 거부 사유 최대 건수
+
+# 처리 완료된 event_id (장비 재전송 중복 제거)
+processed_gate_events = TTLCache(ttl=GATE_EVENT_DEDUP_TTL, max_entries=GATE_EVENT_DEDUP_MAX)
+# 요청 단위 Idempotency-Key -> 처리 결과 (같은 키로 재요청 시 결과 재사용)
+gate_batch_results = TTLCache(ttl=GATE_EVENT_DEDUP_TTL, max_entries=4096)
+
+def _aggregate_gate_events(events: List[GateEvent]) -> List[dict]:
+    """작업자·프로젝트·날짜별 집계: 최초 IN, 최종 OUT, 마지막 이벤트 방향/시각"""
+    groups: Dict[tuple, dict] = {}
+    for ev in events:
+        key = (ev.user_id, ev.project_id, ev.timestamp.date())
+        row = groups.get(key)
+        if row is None:
+            row = groups[key] = {
+                "user_id": ev.user_id, "project_id": ev.project_id, "date": key[2],
+                "first_in": None, "last_out": None, "last_direction": ev.direction, "last_at": ev.timestamp,
+            }
+        if ev.direction == "IN":
+            if row["first_in"] is None or ev.timestamp < row["first_in"]:
+                row["first_in"] = ev.timestamp
+        elif row["last_out"] is None or ev.timestamp > row["last_out"]:
+            row["last_out"] = ev.timestamp
+        if ev.timestamp >= row["last_at"]:
+            row["last_direction"], row["last_at"] = ev.direction, ev.timestamp
+    return list(groups.values())
 
 class attendance_service:
     """[DAILY_ATTENDANCE] 비즈니스 로직"""
@@ -12,7 +50,89 @@ class attendance_service:
     async def get_my_status(uid: int):
         return await attendance_repository.get_user_today(uid, date.today())
 
+    @staticmethod
+    async def get_worker_status_board(pid: int, d: date, limit: Optional[int] = None, offset: int = 0):
+        """출퇴근 현황판 (total: 페이지 적용 전 전체 인원)"""
+        rows = await attendance_repository.get_worker_status_board(pid, d, limit, offset)
+        total = rows[0]["total_count"] if rows else 0
+        items = [r for r in rows if r["user_id"] is not None]  # offset이 범위를 넘으면 빈 페이지
+        for r in items:
+            del r["total_count"]
+        return {"total": total, "items": items}
+
     @staticmethod
     async def do_check_in(uid: int, pid: int):
         return await attendance_repository.upsert_check_in(uid, pid, date.today())
 
+    @staticmethod
+    async def do_bulk_check_in(req):
+        """
+        게이트 리더기 일괄 출근: 같은 작업자·프로젝트·날짜의 중복 스캔은 가장 이른 스캔만 남긴 뒤 한 번에 upsert
+        """
+        now = datetime.now()
+        earliest = {}
+        for scan in req.scans:
+            pid = scan.project_id or req.project_id
+            if pid is None:
+                continue
+            # timezone 포함 시각은 로컬 naive로 통일 (naive 기본값과 비교, timestamp[] 바인딩)
+            scanned_at = to_local_naive(scan.scanned_at) if scan.scanned_at else now
+            key = (scan.user_id, pid, scanned_at.date())
+            if key not in earliest or scanned_at < earliest[key]:
+                earliest[key] = scanned_at
+
+        rows = await attendance_repository.bulk_check_in([(*key, t) for key, t in earliest.items()])
+        for pid, d in {(r["project_id"], r["date"]) for r in rows}:
+            await resource_versions.bump("attendance", pid, d)
+        return {"accepted": len(req.scans), "applied": len(rows), "rows": rows}
+
+    @staticmethod
+    async def ingest_gate_events(items: AsyncIterable[Any]) -> dict:
+        """
+        게이트 출입 이벤트 수집 (NDJSON 스트림/JSON 배열 공통)
+        - 검증 실패 건은 거부 목록에 기록하고 계속 진행
+        - event_id 기준 중복 제거 (같은 묶음 안 + 최근 처리분)
+        - GATE_EVENT_FLUSH_SIZE건마다 집계 후 한 번의 upsert로 반영
+        """
+        stats = {"received": 0, "duplicates": 0, "rejected": 0, "applied_events": 0, "attendance_rows": 0}
+        errors: List[dict] = []
+        pending: Dict[str, GateEvent] = {}
+        touched = set()
+
+        async def flush():
+            if not pending:
+                return
+            events = list(pending.values())
+            pending.clear()
+            rows = await attendance_repository.apply_gate_events(_aggregate_gate_events(events))
+            for ev in events:
+                processed_gate_events.set(ev.event_id, True)
+            stats["applied_events"] += len(events)
+            stats["attendance_rows"] += len(rows)
+            touched.update((r["project_id"], r["date"]) for r in rows)
+
+        now = datetime.now()
+        async for raw in items:
+            index = stats["received"]
+            stats["received"] += 1
+            try:
+                event = GateEvent.model_validate(raw)
+            except ValidationError as e:
+                stats["rejected"] += 1
+                if len(errors) < GATE_EVENT_MAX_ERRORS:
+                    errors.append({"index": index, "error": e.errors(include_url=False)[0]["msg"]})
+                continue
+
+            if event.event_id in pending or processed_gate_events.get(event.event_id):
+                stats["duplicates"] += 1
+                continue
+            event.timestamp = to_local_naive(event.timestamp) if event.timestamp else now
+            pending[event.event_id] = event
+            if len(pending) >= GATE_EVENT_FLUSH_SIZE:
+                await flush()
+        await flush()
+
+        for pid, d in touched:
+            await resource_versions.bump("attendance", pid, d)
+        return {**stats, "errors": errors}
+
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Date
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Date, UniqueConstraint
 from back.database import Base
 from datetime import datetime
 
@@ -19,6 +19,10 @@ class daily_notices(Base):
 class daily_notice_reads(Base):
     """[DAILY] 공지사항 확인 기록"""
     __tablename__ = "daily_notice_reads"
+    # 공지 1건당 사용자별 1회 (확인 처리 ON CONFLICT 대상, notice_id 조회 인덱스 겸용)
+    __table_args__ = (
+        UniqueConstraint("notice_id", "user_id", name="uq_notice_reads_notice_user"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     notice_id = Column(Integer, ForeignKey("daily_notices.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("sys_users.id", ondelete="CASCADE"), nullable=False)
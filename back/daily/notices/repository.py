@@ -82,10 +82,14 @@ class notices_repository:
     async def mark_as_read(notice_id: int, user_id: int):
         """공지사항 확인 기록 저장"""
         sql = """
-            INSERT INTO daily_notice_reads (notice_id, user_id)
-            VALUES (:notice_id, :user_id)
-            ON CONFLICT (notice_id, user_id) DO NOTHING
-            RETURNING *
+            WITH ins AS (
+                INSERT INTO daily_notice_reads (notice_id, user_id)
+                VALUES (:notice_id, :user_id)
+                ON CONFLICT (notice_id, user_id) DO NOTHING
+                RETURNING *
+            )
+            SELECT ins.*, n.project_id, n.date
+            FROM ins JOIN daily_notices n ON n.id = ins.notice_id
         """
         return await insert_and_return(sql, {"notice_id": notice_id, "user_id": user_id})
 
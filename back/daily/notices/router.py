@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from back.daily.notices.repository import notices_repository
 from back.utils.sse_manager import sse_notice_manager
+from back.utils.versioning import resource_versions
 import asyncio
 import json
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional, List
 
@@ -26,13 +28,22 @@ class NoticeCreate(BaseModel):
     created_by: Optional[int] = None
 
 @router.get("")
-async def list_notices(project_id: Optional[int] = None, date: Optional[str] = None):
+async def list_notices(request: Request, response: Response, project_id: Optional[int] = None, date: Optional[str] = None):
+    # 변경 없으면 304 (날짜 형식이 잘못되면 필터 미적용과 동일하게 취급)
+    try:
+        scope_date = datetime.strptime(date, '%Y-%m-%d').date() if date else None
+    except ValueError:
+        scope_date = None
+    cached = resource_versions.not_modified(request, response, "notices", project_id, scope_date)
+    if cached:
+        return cached
     notices = await notices_repository.get_all_notices(project_id, date)
     return {"success": True, "data": notices}
 
 @router.post("")
 async def create_notice(req: NoticeCreate):
     notice = await notices_repository.create_notice(req.model_dump())
+    await resource_versions.bump("notices", notice["project_id"], notice["date"])
     
     # [REAL-TIME] SSE로 신규 공지 즉시 전송
     await sse_notice_manager.broadcast(notice["project_id"], {
@@ -50,6 +61,8 @@ async def get_latest_emergency(project_id: int):
 @router.post("/{notice_id}/read")
 async def mark_as_read(notice_id: int, user_id: int):
     result = await notices_repository.mark_as_read(notice_id, user_id)
+    if result:
+        await resource_versions.bump("notices", result["project_id"], result["date"])  # read_count 변경
     return {"success": True, "data": result}
 
 @router.get("/{notice_id}/read-status")
@@ -84,6 +97,11 @@ async def push_alert(req: PushAlertRequest):
     
     return {"success": True, "message": f"{len(req.user_ids) or '전체'} 명에게 알림을 전송했습니다."}
 
+# [SSE] 구독자별 지연/폐기 통계 (운영 모니터링용)
+@router.get("/sse/stats")
+async def sse_stats(project_id: Optional[int] = None):
+    return {"success": True, "data": sse_notice_manager.get_stats(project_id)}
+
 # [SSE] 공지 및 알림 실시간 단방향 수신 엔드포인트
 @router.get("/sse/{project_id}/{user_id}")
 async def sse_endpoint(project_id: int, user_id: int):
@@ -91,11 +109,18 @@ async def sse_endpoint(project_id: int, user_id: int):
         queue = sse_notice_manager.subscribe(project_id, user_id)
         try:
             while True:
-                # 큐에서 메시지 대기
-                data = await queue.get()
-                yield f"data: {data}\n\n"
-        except asyncio.CancelledError:
+                # 큐에서 메시지 대기 (일정 시간 없으면 keepalive 주석 프레임 전송)
+                data = await sse_notice_manager.next_message(queue)
+                if data is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"data: {data}\n\n"
+        finally:
+            # 정상 종료/연결 끊김/취소 모두 구독 해지
             sse_notice_manager.unsubscribe(project_id, user_id, queue)
-            raise
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
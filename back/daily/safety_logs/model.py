@@ -1,11 +1,15 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, Date, Index
 from back.database import Base
 from datetime import datetime
 
 class daily_safety_logs(Base):
     """[DAILY] 안전 점검 기록"""
     __tablename__ = "daily_safety_logs"
+    __table_args__ = (
+        Index("ix_daily_safety_logs_project_id_user_id_created_at", "project_id", "user_id", "created_at"),
+        Index("ix_daily_safety_logs_project_id_created_at", "project_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("project_master.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("sys_users.id", ondelete="CASCADE"), nullable=False)
@@ -18,6 +22,9 @@ class daily_safety_logs(Base):
 class daily_danger_zones(Base):
     """[DAILY] 일일 동적 위험 구역 (신고 및 승인 프로세스 포함)"""
     __tablename__ = "daily_danger_zones"
+    __table_args__ = (
+        Index("ix_daily_danger_zones_zone_id_date", "zone_id", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     zone_id = Column(Integer, ForeignKey("project_zones.id", ondelete="CASCADE"), nullable=False)
     danger_info_id = Column(Integer, ForeignKey("content_danger_info.id", ondelete="SET NULL"), nullable=True, comment="위험 요소 템플릿")
@@ -30,9 +37,16 @@ class daily_danger_zones(Base):
 class daily_danger_images(Base):
     """[DAILY] 위험 구역 현장 사진 (ID 기반 관리 체계 전환)"""
     __tablename__ = "daily_danger_images"
+    __table_args__ = (
+        Index("ix_daily_danger_images_danger_zone_id", "danger_zone_id"),
+        Index("ix_daily_danger_images_image_url", "image_url"),  # 저장소 참조 확인 (GC)
+    )
     id = Column(Integer, primary_key=True, index=True)
     danger_zone_id = Column(Integer, ForeignKey("daily_danger_zones.id", ondelete="CASCADE"), nullable=False)
     danger_info_id = Column(Integer, nullable=True, comment="경로 생성을 위한 위험 요소 ID (De-normalization)")
     image_url = Column(String, nullable=False, comment="저장된 파일의 최종 이름 또는 부분 경로")
+    thumb_url = Column(String, nullable=True, comment="썸네일 파일명 (백그라운드 생성, 생성 전 NULL)")
+    medium_url = Column(String, nullable=True, comment="중간 크기 파일명 (백그라운드 생성, 생성 전 NULL)")
+    variant_status = Column(String, nullable=True, comment="파생 이미지 생성 상태: NULL(대기), READY, FAILED(디코딩 불가 등, 재시도 안 함)")
     note = Column(String, nullable=True, comment="사진 설명")
     created_at = Column(DateTime, default=datetime.now)
@@ -1,26 +1,31 @@
 
-from back.database import fetch_all, insert_and_return
-from datetime import date
+from back.database import execute, fetch_all, insert_and_return, insert_and_return_all
+from datetime import date, datetime
+from typing import List, Optional
+import json
+from back.content.catalog import danger_info_catalog
 
 class safety_logs_repository:
     """[DAILY_SAFETY] 위험 구역 및 점검 로그 데이터 접근"""
     @staticmethod
     async def get_hazards(zid: int, d: date):
         sql = """
-            SELECT 
-                dz.*, 
-                COALESCE(di.danger_type, dz.risk_type) as risk_type, -- 호환성 유지
-                COALESCE(di.danger_type, dz.risk_type) as danger_type_label, -- 신규 표준
-                di.icon,
-                di.color,
-                di.risk_level,
-                i.image_url
+            SELECT dz.*, i.image_url, i.thumb_url, i.medium_url
             FROM daily_danger_zones dz
             LEFT JOIN daily_danger_images i ON dz.id = i.danger_zone_id
-            LEFT JOIN content_danger_info di ON dz.danger_info_id = di.id
             WHERE dz.zone_id = :zid AND dz.date = :d
         """
-        return await fetch_all(sql, {"zid": zid, "d": d})
+        hazards = await fetch_all(sql, {"zid": zid, "d": d})
+        # 위험 요소 표시 정보는 카탈로그 캐시에서 채움 (content_danger_info 조인 제거)
+        await danger_info_catalog.enrich(
+            hazards, "danger_info_id",
+            {"danger_type": "danger_type", "icon": "icon", "color": "color", "risk_level": "risk_level"}
+        )
+        for h in hazards:
+            label = h.pop("danger_type") or h["risk_type"]
+            h["risk_type"] = label  # 호환성 유지
+            h["danger_type_label"] = label  # 신규 표준
+        return hazards
     
     @staticmethod
     async def get_by_project(pid: int, d: date):
@@ -29,19 +34,30 @@ class safety_logs_repository:
             SELECT 
                 dz.*, 
                 z.name as zone_name, 
-                z.level,
-                di.danger_type,
-                di.icon,
-                di.color,
-                di.risk_level
+                z.level
             FROM daily_danger_zones dz
             JOIN project_zones z ON dz.zone_id = z.id
-            LEFT JOIN content_danger_info di ON dz.danger_info_id = di.id
             WHERE z.project_id = :pid AND dz.date = :d
             ORDER BY z.level, z.name
         """
-        return await fetch_all(sql, {"pid": pid, "d": d})
+        dangers = await fetch_all(sql, {"pid": pid, "d": d})
+        return await danger_info_catalog.enrich(
+            dangers, "danger_info_id",
+            {"danger_type": "danger_type", "icon": "icon", "color": "color", "risk_level": "risk_level"}
+        )
     
+    @staticmethod
+    async def get_danger_zone_counts(pid: int, d: date):
+        """프로젝트의 구역별 위험 등록 건수 (위치 판별용)"""
+        sql = """
+            SELECT dz.zone_id, COUNT(*) as cnt
+            FROM daily_danger_zones dz
+            JOIN project_zones z ON dz.zone_id = z.id
+            WHERE z.project_id = :pid AND dz.date = :d
+            GROUP BY dz.zone_id
+        """
+        return await fetch_all(sql, {"pid": pid, "d": d})
+
     @staticmethod
     async def create_danger_zone(data: dict):
         """위험 구역 생성 (신고자 및 상태 추가)"""
@@ -70,37 +86,88 @@ class safety_logs_repository:
         """
         return await insert_and_return(sql, params)
 
+    @staticmethod
+    async def add_danger_images(danger_zone_id: int, danger_info_id: Optional[int], filenames: List[str]):
+        """위험 구역 사진 일괄 등록 (multi-row INSERT, 파일명만 저장)"""
+        if not filenames:
+            return []
+        sql = """
+            INSERT INTO daily_danger_images (danger_zone_id, danger_info_id, image_url, created_at)
+            SELECT CAST(:dzid AS integer), CAST(:diid AS integer), t.url, NOW()
+            FROM unnest(CAST(:urls AS varchar[])) AS t(url)
+            RETURNING id, image_url
+        """
+        return await insert_and_return_all(sql, {"dzid": danger_zone_id, "diid": danger_info_id, "urls": filenames})
+
+    @staticmethod
+    async def set_image_variants(image_id: int, thumb_url: Optional[str], medium_url: Optional[str]):
+        """파생 이미지 파일명 기록 (구역 스냅샷 갱신용으로 zone_id, date 반환, 이미지가 삭제됐으면 None)"""
+        sql = """
+            UPDATE daily_danger_images i
+            SET thumb_url = :thumb, medium_url = :medium, variant_status = 'READY'
+            FROM daily_danger_zones dz
+            WHERE i.id = :id AND dz.id = i.danger_zone_id
+            RETURNING i.id, dz.zone_id, dz.date
+        """
+        return await insert_and_return(sql, {"id": image_id, "thumb": thumb_url, "medium": medium_url})
+
+    @staticmethod
+    async def mark_variants_failed(image_id: int):
+        """파생 이미지 생성 실패 기록 (원본 URL로 대체 표시, 재기동 백필 대상에서 제외)"""
+        await execute("UPDATE daily_danger_images SET variant_status = 'FAILED' WHERE id = :id", {"id": image_id})
+
+    @staticmethod
+    async def get_referenced_image_keys(keys: List[str]):
+        """저장소 키 중 아직 사진 행(원본/썸네일/중간 크기)이 참조하는 키 집합 (Blob GC 참조 확인)"""
+        if not keys:
+            return set()
+        sql = """
+            SELECT image_url AS k FROM daily_danger_images WHERE image_url = ANY(:keys)
+            UNION SELECT thumb_url FROM daily_danger_images WHERE thumb_url = ANY(:keys)
+            UNION SELECT medium_url FROM daily_danger_images WHERE medium_url = ANY(:keys)
+        """
+        rows = await fetch_all(sql, {"keys": keys})
+        return {r["k"] for r in rows}
+
+    @staticmethod
+    async def get_images_without_variants(limit: int = 500):
+        """파생 이미지가 아직 없는 최근 사진 (기동 시 재처리 대상)"""
+        sql = """
+            SELECT id, image_url FROM daily_danger_images
+            WHERE thumb_url IS NULL AND variant_status IS NULL
+            ORDER BY id DESC
+            LIMIT :limit
+        """
+        return await fetch_all(sql, {"limit": limit})
+
     @staticmethod
     async def approve_hazard(danger_id: int):
-        """근로자 신고 위험 구역 승인"""
-        from back.database import execute
-        sql = "UPDATE daily_danger_zones SET status = 'APPROVED' WHERE id = :id"
-        await execute(sql, {"id": danger_id})
-        return True
+        """근로자 신고 위험 구역 승인 (승인된 행 반환, 없으면 None)"""
+        sql = "UPDATE daily_danger_zones SET status = 'APPROVED' WHERE id = :id RETURNING id, zone_id, date"
+        return await insert_and_return(sql, {"id": danger_id})
 
     
     @staticmethod
     async def delete_danger_zone(danger_id: int):
-        """위험 구역 삭제 및 물리 파일 정리 (Flat 구조 대응)"""
-        from back.database import execute, fetch_all
-        import os
-        
-        # 1. 삭제 전 이미지 정보 확보
-        sql_info = "SELECT image_url FROM daily_danger_images WHERE danger_zone_id = :id"
-        images = await fetch_all(sql_info, {"id": danger_id})
-        
-        # 2. 물리 파일 삭제 (Flat 구조: uploads/daily_danger_images/파일명)
-        for img in images:
-            file_path = f"uploads/daily_danger_images/{img['image_url']}"
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    print(f"이미지 파일 삭제 실패: {file_path}, {e}")
-
-        # 3. DB 삭제 (Cascade 설정으로 daily_danger_images 행도 자동 삭제됨)
-        await execute("DELETE FROM daily_danger_zones WHERE id = :id", {"id": danger_id})
-        return True
+        """
+        위험 구역 삭제 (Cascade 설정으로 daily_danger_images 행도 자동 삭제됨)
+        - 삭제된 행(zone_id, date)과 사진 키 목록(images)을 반환
+        - 사진 파일은 다른 신고와 공유될 수 있으므로 호출 측에서 저장소 GC 후보로 등록 (즉시 삭제하지 않음)
+        """
+        sql = """
+            WITH imgs AS (
+                SELECT image_url, thumb_url, medium_url FROM daily_danger_images WHERE danger_zone_id = :id
+            ),
+            del AS (
+                DELETE FROM daily_danger_zones WHERE id = :id RETURNING id, zone_id, date
+            )
+            SELECT del.*, COALESCE((SELECT json_agg(imgs) FROM imgs), '[]'::json) AS images
+            FROM del
+        """
+        deleted = await insert_and_return(sql, {"id": danger_id})
+        if deleted and isinstance(deleted["images"], str):
+            deleted["images"] = json.loads(deleted["images"])
+        return deleted
 
     @staticmethod
     async def create_log(data: dict):
@@ -126,3 +193,37 @@ class safety_logs_repository:
         }
         return await insert_and_return(sql, params)
 
+    @staticmethod
+    async def bulk_create_logs(project_id: int, user_id: int, logs: List[dict], created_at: datetime):
+        """
+        안전 점검 로그 일괄 생성 (multi-row INSERT, 단일 왕복)
+        - logs: [{log_type, note, plan_id, checklist_data}]
+        - 다른 프로젝트이거나 존재하지 않는 plan_id 행은 건너뜀 (FK 오류로 전체가 실패하지 않도록)
+        """
+        if not logs:
+            return []
+        sql = """
+            INSERT INTO daily_safety_logs (project_id, user_id, log_type, note, plan_id, checklist_data, created_at)
+            SELECT CAST(:pid AS integer), CAST(:uid AS integer), t.log_type, t.note, t.plan_id,
+                   CAST(t.checklist AS json), CAST(:created_at AS timestamp)
+            FROM unnest(
+                CAST(:types AS varchar[]), CAST(:notes AS text[]),
+                CAST(:plan_ids AS integer[]), CAST(:checklists AS text[])
+            ) AS t(log_type, note, plan_id, checklist)
+            WHERE t.plan_id IS NULL
+               OR EXISTS (SELECT 1 FROM daily_work_plans p WHERE p.id = t.plan_id AND p.project_id = CAST(:pid AS integer))
+            RETURNING id, log_type, plan_id
+        """
+        return await insert_and_return_all(sql, {
+            "pid": project_id,
+            "uid": user_id,
+            "created_at": created_at,
+            "types": [log["log_type"] for log in logs],
+            "notes": [log.get("note") for log in logs],
+            "plan_ids": [log.get("plan_id") for log in logs],
+            "checklists": [
+                json.dumps(log["checklist_data"], ensure_ascii=False) if log.get("checklist_data") is not None else None
+                for log in logs
+            ],
+        })
+
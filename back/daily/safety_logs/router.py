@@ -1,15 +1,20 @@
 
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.responses import RedirectResponse
 from typing import List, Optional
-import os
-import uuid
 from datetime import date as dt_date
+from back.database import transaction
 from back.daily.safety_logs.repository import safety_logs_repository
+from back.daily.worker_locations.geofence import geofence_engine
+from back.project.locations.snapshot import zone_snapshot_store
+from back.daily.safety_logs.variants import danger_image_variants
+from back.daily.safety_logs.storage import danger_image_store, UPLOAD_DIR
+from back.utils.upload_utils import stage_uploads, remove_files, UploadTooLarge
+from back.utils.blob_store import BLOB_URL_EXPIRES
 
 router = APIRouter()
-
-# 업로드 루트 경로 설정 (Flat 구조)
-UPLOAD_DIR = "uploads/daily_danger_images"
+# 원격(S3) 저장소 사용 시 기존 /uploads 경로를 서명 URL로 리다이렉트 (main에서 /uploads 마운트보다 먼저 등록)
+uploads_router = APIRouter()
 
 @router.get("/")
 async def get_safety_logs(project_id: int, date: str):
@@ -28,69 +33,87 @@ async def report_danger(
 ):
     """
     [REAL-WORLD] 위험 지역 신고 및 사진 업로드
+    - 사진은 청크 단위로 임시 저장 (파일 I/O는 스레드 풀, 파일당 UPLOAD_MAX_BYTES 제한 → 413)
+    - 위험 구역 행과 사진 행은 한 트랜잭션에서 기록 (사진은 multi-row INSERT)
     """
-    # 1. 위험 구역 생성
-    danger_zone = await safety_logs_repository.create_danger_zone({
-        "project_id": project_id,
-        "zone_id": zone_id,
-        "user_id": user_id,
-        "status": status,
-        "date": dt_date.today().isoformat(),
-        "danger_info_id": danger_info_id,
-        "risk_type": risk_type,
-        "description": description
-    })
-    
-    if not danger_zone:
-        return {"success": False, "message": "위험 구역 생성 실패"}
+    # 1. 사진 임시 저장 (DB 트랜잭션 밖에서 디스크 I/O 처리)
+    try:
+        staged = await stage_uploads(files, UPLOAD_DIR)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
-    danger_zone_id = danger_zone["id"]
-    saved_images = []
+    # 2. 사진 저장 (트랜잭션 밖: 원격 저장소 업로드 중 DB 연결을 점유하지 않음)
+    # 사진은 내용 해시(sha256) 키로 저장 → 같은 사진은 한 번만 저장하고 여러 행이 공유
+    keys = []
+    try:
+        for s in staged:
+            keys.append(await danger_image_store.put_staged(s))
 
-    # 2. 사진 저장 (Flat 구조: uploads/daily_danger_images/파일명)
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        # 3. 위험 구역 + 사진 기록 (하나라도 실패하면 모두 롤백)
+        async with transaction():
+            danger_zone = await safety_logs_repository.create_danger_zone({
+                "project_id": project_id,
+                "zone_id": zone_id,
+                "user_id": user_id,
+                "status": status,
+                "date": dt_date.today().isoformat(),
+                "danger_info_id": danger_info_id,
+                "risk_type": risk_type,
+                "description": description
+            })
+            if danger_zone:
+                image_rows = await safety_logs_repository.add_danger_images(danger_zone["id"], danger_info_id, keys)
+    except BaseException:
+        # 저장소에 올린 blob은 참조가 없으면 지연 GC에서 정리
+        await remove_files(s["path"] for s in staged)
+        for key in keys:
+            danger_image_store.release(key)
+        raise
 
-    from back.database import execute
+    if not danger_zone:
+        for key in keys:
+            danger_image_store.release(key)
+        return {"success": False, "message": "위험 구역 생성 실패"}
 
-    for file in files:
-        # 파일명 규칙: danger_zone_id + uuid
-        ext = os.path.splitext(file.filename)[1]
-        filename = f"{danger_zone_id}_{uuid.uuid4().hex}{ext}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # DB 기록 (파일명만 저장)
-        img_sql = """
-            INSERT INTO daily_danger_images (danger_zone_id, danger_info_id, image_url, created_at)
-            VALUES (:dzid, :diid, :url, NOW())
-        """
-        await execute(img_sql, {
-            "dzid": danger_zone_id,
-            "diid": danger_info_id,
-            "url": filename  # 파일명만 저장
-        })
-        saved_images.append(filename)
+    await geofence_engine.on_danger_changed(danger_zone["zone_id"], danger_zone["date"], +1)
+    await zone_snapshot_store.mark_zones([danger_zone["zone_id"]], danger_zone["date"], project_id)
+    # 썸네일/중간 크기 이미지는 백그라운드에서 생성
+    danger_image_variants.enqueue(image_rows)
 
     return {
         "success": True, 
         "data": {
             "danger_zone": danger_zone,
-            "images": saved_images
+            "images": keys
         }
     }
 
 @router.put("/approve/{danger_id}")
 async def approve_danger(danger_id: int):
     """신고된 위험 구역 승인 처리"""
-    success = await safety_logs_repository.approve_hazard(danger_id)
-    return {"success": success}
+    approved = await safety_logs_repository.approve_hazard(danger_id)
+    if approved:
+        await zone_snapshot_store.mark_zones([approved["zone_id"]], approved["date"])
+    return {"success": approved is not None}
 
 @router.delete("/danger/{danger_id}")
 async def delete_danger(danger_id: int):
-    """위험 구역 제거 (물리 파일 포함)"""
-    success = await safety_logs_repository.delete_danger_zone(danger_id)
-    return {"success": success}
+    """위험 구역 제거 (사진 파일은 다른 행이 참조하지 않을 때 지연 GC로 삭제)"""
+    deleted = await safety_logs_repository.delete_danger_zone(danger_id)
+    if deleted:
+        for img in deleted["images"]:
+            danger_image_store.release(img["image_url"], [n for n in (img["thumb_url"], img["medium_url"]) if n])
+        await geofence_engine.on_danger_changed(deleted["zone_id"], deleted["date"], -1)
+        await zone_snapshot_store.mark_zones([deleted["zone_id"]], deleted["date"])
+    return {"success": deleted is not None}
+
+@uploads_router.get("/uploads/daily_danger_images/{key}", include_in_schema=False)
+async def redirect_danger_image(key: str):
+    """위험 구역 사진 (원격 저장소) - 서명 URL로 리다이렉트, 같은 URL을 재사용해 브라우저 캐시 적중"""
+    if key.startswith(".") or "/" in key:
+        raise HTTPException(status_code=404, detail="Not Found")
+    url = danger_image_store.signed_url(key)
+    if url is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    # 리다이렉트 자체도 서명 URL 재사용 구간 동안 캐시
+    return RedirectResponse(url, status_code=307, headers={"Cache-Control": f"private, max-age={BLOB_URL_EXPIRES // 2}"})
@@ -0,0 +1,11 @@
+from back.daily.safety_logs.repository import safety_logs_repository
+from back.utils.blob_store import BlobStore, create_backend
+
+# 업로드 루트 경로 (Flat 구조, /uploads StaticFiles로 서빙)
+UPLOAD_DIR = "uploads/daily_danger_images"
+
+# 싱글톤 인스턴스 (위험 구역 사진 저장소: sha256 키, daily_danger_images 참조 기준 GC)
+danger_image_store = BlobStore(
+    create_backend(UPLOAD_DIR, prefix="daily_danger_images/"),
+    find_referenced=safety_logs_repository.get_referenced_image_keys,
+)
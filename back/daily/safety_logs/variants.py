@@ -0,0 +1,30 @@
+from contextlib import asynccontextmanager
+from typing import Dict
+from back.database import try_advisory_lock
+from back.daily.safety_logs.repository import safety_logs_repository
+from back.daily.safety_logs.storage import danger_image_store, UPLOAD_DIR
+from back.project.locations.snapshot import zone_snapshot_store
+from back.utils.blob_store import LocalBlobBackend
+from back.utils.image_variants import ImageVariantWorker
+
+async def _on_variants_ready(image_id: int, variants: Dict[str, str]):
+    """파생 이미지 파일명 기록 후 해당 구역 지도 스냅샷 갱신"""
+    updated = await safety_logs_repository.set_image_variants(image_id, variants.get("thumb"), variants.get("medium"))
+    if updated:
+        await zone_snapshot_store.mark_zones([updated["zone_id"]], updated["date"])
+
+@asynccontextmanager
+async def _backfill_pending():
+    """파생 이미지 없는 사진 목록 - 잠금을 얻은 워커만 받고, 처리 끝날 때까지 잠금 유지 (워커마다 중복 변환 방지)"""
+    async with try_advisory_lock("daily_danger_images_variant_backfill") as acquired:
+        yield await safety_logs_repository.get_images_without_variants() if acquired else []
+
+# 싱글톤 인스턴스 (위험 구역 사진 썸네일/중간 크기 생성)
+danger_image_variants = ImageVariantWorker(
+    UPLOAD_DIR,
+    on_complete=_on_variants_ready,
+    on_failed=safety_logs_repository.mark_variants_failed,
+    backfill=_backfill_pending,
+)
+# 변환은 로컬 파일 기준 → 로컬 저장소에서만 사용 (S3 백엔드에서는 원본으로 대체)
+danger_image_variants.enabled = danger_image_variants.enabled and isinstance(danger_image_store.backend, LocalBlobBackend)
@@ -1,11 +1,15 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Index
 from back.database import Base
 from datetime import datetime
 
 class daily_work_plans(Base):
     """[DAILY] 오늘의 세부 작업 계획"""
     __tablename__ = "daily_work_plans"
+    __table_args__ = (
+        Index("ix_daily_work_plans_project_id_date", "project_id", "date"),
+        Index("ix_daily_work_plans_zone_id_date", "zone_id", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("project_master.id", ondelete="CASCADE"), nullable=False)
     zone_id = Column(Integer, ForeignKey("project_zones.id", ondelete="CASCADE"), nullable=False)
@@ -19,6 +23,10 @@ class daily_work_plans(Base):
 class daily_worker_users(Base):
     """[DAILY] 오늘의 인원 투입 현황 (작업자 매핑)"""
     __tablename__ = "daily_worker_users"
+    __table_args__ = (
+        Index("ix_daily_worker_users_plan_id", "plan_id"),
+        Index("ix_daily_worker_users_worker_id", "worker_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     plan_id = Column(Integer, ForeignKey("daily_work_plans.id", ondelete="CASCADE"), nullable=False)
     worker_id = Column(Integer, ForeignKey("sys_users.id", ondelete="CASCADE"), nullable=False)
@@ -1,6 +1,8 @@
 
-from back.database import fetch_all, insert_and_return, execute
+from back.database import fetch_all, insert_and_return, insert_and_return_all
 from datetime import date
+from typing import Dict, List
+from back.content.catalog import work_info_catalog
 
 class task_plans_repository:
     """[DAILY_TASKS] 일일 실무 계획 데이터 접근"""
@@ -8,37 +10,50 @@ class task_plans_repository:
     @staticmethod
     async def get_by_project(pid: int, d: date):
         sql = """
-            SELECT t.*, z.name as zone_name, z.level, wi.work_type
+            SELECT t.*, z.name as zone_name, z.level
             FROM daily_work_plans t
             JOIN project_zones z ON t.zone_id = z.id
-            LEFT JOIN content_work_info wi ON t.work_info_id = wi.id
             WHERE t.project_id = :pid AND t.date = :d
         """
-        return await fetch_all(sql, {"pid": pid, "d": d})
+        plans = await fetch_all(sql, {"pid": pid, "d": d})
+        return await work_info_catalog.enrich(plans, "work_info_id", {"work_type": "work_type"})
 
     @staticmethod
-    async def get_worker_users(plan_id: int):
-        # daily_worker_users 테이블 사용 (최종 명칭)
+    async def get_worker_users_by_plans(plan_ids: List[int]) -> Dict[int, list]:
+        """여러 작업 계획의 투입 인원을 한 번에 조회 (plan_id -> 작업자 목록)"""
+        workers_by_plan: Dict[int, list] = {pid: [] for pid in plan_ids}
+        if not plan_ids:
+            return workers_by_plan
         sql = """
-            SELECT u.id, u.full_name, u.role, u.job_title, c.name as company_name
+            SELECT wa.plan_id, u.id, u.full_name, u.role, u.job_title, c.name as company_name
             FROM daily_worker_users wa
             JOIN sys_users u ON wa.worker_id = u.id
             LEFT JOIN sys_companies c ON u.company_id = c.id
-            WHERE wa.plan_id = :pid
+            WHERE wa.plan_id = ANY(:pids)
         """
-        return await fetch_all(sql, {"pid": plan_id})
+        for row in await fetch_all(sql, {"pids": list(plan_ids)}):
+            workers_by_plan[row.pop("plan_id")].append(row)
+        return workers_by_plan
+
+    @staticmethod
+    async def attach_workers(plans: list) -> list:
+        """작업 계획 목록에 workers 필드 채우기 (계획 수와 무관하게 쿼리 1회)"""
+        workers_by_plan = await task_plans_repository.get_worker_users_by_plans([p["id"] for p in plans])
+        for plan in plans:
+            plan["workers"] = workers_by_plan.get(plan["id"], [])
+        return plans
     
     @staticmethod
     async def get_by_zone(zone_id: int, d: date):
         """특정 구역의 오늘 작업 계획 조회"""
         sql = """
-            SELECT t.*, z.name as zone_name, z.level, wi.work_type
+            SELECT t.*, z.name as zone_name, z.level
             FROM daily_work_plans t
             JOIN project_zones z ON t.zone_id = z.id
-            LEFT JOIN content_work_info wi ON t.work_info_id = wi.id
             WHERE t.zone_id = :zid AND t.date = :d
         """
-        return await fetch_all(sql, {"zid": zone_id, "d": d})
+        plans = await fetch_all(sql, {"zid": zone_id, "d": d})
+        return await work_info_catalog.enrich(plans, "work_info_id", {"work_type": "work_type"})
     
     @staticmethod
     async def create_task(data: dict):
@@ -79,36 +94,59 @@ class task_plans_repository:
             SET work_info_id = :work_info_id, description = :description, 
                 calculated_risk_score = :risk_score, status = :status
             WHERE id = :task_id
+            RETURNING id, project_id, zone_id, date
         """
-        await execute(sql, {**data, "task_id": task_id})
-        return True
+        return await insert_and_return(sql, {**data, "task_id": task_id})
 
     @staticmethod
     async def update_task_status(task_id: int, status: str):
         """작업 계획 상태만 수정"""
-        sql = "UPDATE daily_work_plans SET status = :status WHERE id = :task_id"
-        await execute(sql, {"status": status, "task_id": task_id})
-        return True
-    
+        sql = "UPDATE daily_work_plans SET status = :status WHERE id = :task_id RETURNING id, project_id, zone_id, date"
+        return await insert_and_return(sql, {"status": status, "task_id": task_id})
+
+    @staticmethod
+    async def start_plans(project_id: int, plan_ids: List[int]):
+        """점검 완료된 작업 계획 일괄 착수 (PLANNED -> IN_PROGRESS, 이미 진행/완료된 계획은 유지)"""
+        if not plan_ids:
+            return []
+        sql = """
+            UPDATE daily_work_plans SET status = 'IN_PROGRESS'
+            WHERE id = ANY(CAST(:ids AS integer[])) AND project_id = :pid AND status = 'PLANNED'
+            RETURNING id, project_id, zone_id, date
+        """
+        return await insert_and_return_all(sql, {"ids": plan_ids, "pid": project_id})
+
     @staticmethod
     async def delete_task(task_id: int):
         """작업 계획 삭제"""
-        await execute("DELETE FROM daily_work_plans WHERE id = :id", {"id": task_id})
-        return True
+        return await insert_and_return(
+            "DELETE FROM daily_work_plans WHERE id = :id RETURNING id, project_id, zone_id, date",
+            {"id": task_id}
+        )
     
     @staticmethod
     async def assign_worker(plan_id: int, worker_id: int):
         """작업자 배정"""
         sql = """
-            INSERT INTO daily_worker_users (plan_id, worker_id)
-            VALUES (:plan_id, :worker_id)
+            WITH ins AS (
+                INSERT INTO daily_worker_users (plan_id, worker_id)
+                VALUES (:plan_id, :worker_id)
+                RETURNING plan_id
+            )
+            SELECT p.id, p.project_id, p.zone_id, p.date
+            FROM daily_work_plans p JOIN ins ON p.id = ins.plan_id
         """
-        await execute(sql, {"plan_id": plan_id, "worker_id": worker_id})
-        return True
+        return await insert_and_return(sql, {"plan_id": plan_id, "worker_id": worker_id})
     
     @staticmethod
     async def remove_worker(plan_id: int, worker_id: int):
         """작업자 제거"""
-        await execute("DELETE FROM daily_worker_users WHERE plan_id = :pid AND worker_id = :wid", 
-                     {"pid": plan_id, "wid": worker_id})
-        return True
+        sql = """
+            WITH del AS (
+                DELETE FROM daily_worker_users WHERE plan_id = :pid AND worker_id = :wid
+                RETURNING plan_id
+            )
+            SELECT DISTINCT p.id, p.project_id, p.zone_id, p.date
+            FROM daily_work_plans p JOIN del ON p.id = del.plan_id
+        """
+        return await insert_and_return(sql, {"pid": plan_id, "wid": worker_id})
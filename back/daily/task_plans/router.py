@@ -1,17 +1,24 @@
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List, Optional
 from datetime import date
 from back.daily.task_plans.service import task_plans_service
+from back.daily.task_plans.schema import SafetyCheckRequest
 from back.daily.task_plans.repository import task_plans_repository
 from back.daily.safety_logs.repository import safety_logs_repository
+from back.daily.worker_locations.geofence import geofence_engine
+from back.project.locations.snapshot import zone_snapshot_store
+from back.utils.versioning import resource_versions
 
 router = APIRouter()
 
 @router.get("")
-async def list_task_plans(project_id: int = 1, d: Optional[date] = None):
+async def list_task_plans(request: Request, response: Response, project_id: int = 1, d: Optional[date] = None):
     # 오늘 날짜를 기본값으로 설정
     target_date = d or date.today()
+    cached = resource_versions.not_modified(request, response, "task_plans", project_id, target_date)
+    if cached:
+        return cached
     return await task_plans_service.get_plans_with_details(project_id, target_date)
 
 @router.get("/zone/{zone_id}")
@@ -21,9 +28,8 @@ async def get_zone_detail(zone_id: int, d: Optional[date] = None):
     tasks = await task_plans_repository.get_by_zone(zone_id, target_date)
     dangers = await safety_logs_repository.get_hazards(zone_id, target_date)
     
-    # 각 작업에 배정된 작업자 정보 추가
-    for task in tasks:
-        task['workers'] = await task_plans_repository.get_worker_users(task['id'])
+    # 각 작업에 배정된 작업자 정보 추가 (한 번에 조회)
+    await task_plans_repository.attach_workers(tasks)
     
     return {
         "success": True,
@@ -37,45 +43,66 @@ async def get_zone_detail(zone_id: int, d: Optional[date] = None):
 async def create_task_plan(data: dict):
     """작업 계획 생성"""
     task = await task_plans_repository.create_task(data)
+    if task:
+        await zone_snapshot_store.mark_zones([task["zone_id"]], task["date"], task["project_id"])
+        await resource_versions.bump("task_plans", task["project_id"], task["date"])
     return {"success": True, "data": task}
 
 @router.put("/{task_id}")
 async def update_task_plan(task_id: int, data: dict):
     """작업 계획 수정"""
-    await task_plans_repository.update_task(task_id, data)
+    task = await task_plans_repository.update_task(task_id, data)
+    if task:
+        await zone_snapshot_store.mark_zones([task["zone_id"]], task["date"], task["project_id"])
+        await resource_versions.bump("task_plans", task["project_id"], task["date"])
     return {"success": True, "message": "수정되었습니다."}
 
 @router.delete("/{task_id}")
 async def delete_task_plan(task_id: int):
     """작업 계획 삭제"""
-    await task_plans_repository.delete_task(task_id)
+    task = await task_plans_repository.delete_task(task_id)
+    if task:
+        await zone_snapshot_store.mark_zones([task["zone_id"]], task["date"], task["project_id"])
+        await resource_versions.bump("task_plans", task["project_id"], task["date"])
     return {"success": True, "message": "삭제되었습니다."}
 
 @router.post("/{task_id}/workers")
 async def assign_worker_to_task(task_id: int, data: dict):
     """작업에 작업자 배정"""
-    await task_plans_repository.assign_worker(task_id, data['worker_id'])
+    task = await task_plans_repository.assign_worker(task_id, data['worker_id'])
+    if task:
+        await zone_snapshot_store.mark_zones([task["zone_id"]], task["date"], task["project_id"])
+        await resource_versions.bump("task_plans", task["project_id"], task["date"])
     return {"success": True, "message": "작업자가 배정되었습니다."}
 
 @router.delete("/{task_id}/workers/{worker_id}")
 async def remove_worker_from_task(task_id: int, worker_id: int):
     """작업에서 작업자 제거"""
-    await task_plans_repository.remove_worker(task_id, worker_id)
+    task = await task_plans_repository.remove_worker(task_id, worker_id)
+    if task:
+        await zone_snapshot_store.mark_zones([task["zone_id"]], task["date"], task["project_id"])
+        await resource_versions.bump("task_plans", task["project_id"], task["date"])
     return {"success": True, "message": "작업자가 제거되었습니다."}
 
 @router.post("/dangers")
 async def create_danger_zone(data: dict):
     """위험 구역 생성"""
     danger = await safety_logs_repository.create_danger_zone(data)
+    if danger:
+        await geofence_engine.on_danger_changed(danger["zone_id"], danger["date"], +1)
+        await zone_snapshot_store.mark_zones([danger["zone_id"]], danger["date"])
     return {"success": True, "data": danger}
 
 @router.delete("/dangers/{danger_id}")
 async def delete_danger_zone(danger_id: int):
     """위험 구역 삭제"""
-    await safety_logs_repository.delete_danger_zone(danger_id)
+    deleted = await safety_logs_repository.delete_danger_zone(danger_id)
+    if deleted:
+        await geofence_engine.on_danger_changed(deleted["zone_id"], deleted["date"], -1)
+        await zone_snapshot_store.mark_zones([deleted["zone_id"]], deleted["date"])
     return {"success": True, "message": "위험 구역이 삭제되었습니다."}
 @router.post("/safety-check")
-async def submit_safety_check(data: dict):
+async def submit_safety_check(req: SafetyCheckRequest):
     """
     일일 안전 점검 제출 (작업 및 위험 요소 확인)
     Payload:
@@ -89,31 +116,10 @@ async def submit_safety_check(data: dict):
             { "danger_id": int, "checked": bool }
         ]
     }
+    - 모든 점검 로그는 한 번의 INSERT, 작업 상태(PLANNED -> IN_PROGRESS)는 같은 트랜잭션에서 갱신
+    - 응답 data: 생성된 로그 ID, 착수 처리된 계획 ID, 프로젝트에 없어 건너뛴 계획 ID
     """
-    project_id = data.get("project_id")
-    worker_id = data.get("worker_id")
-    plan_results = data.get("plan_results", [])
-    
-    # 1. 작업별 안전 점검 로그 생성 및 상태 업데이트
-    for plan_res in plan_results:
-        plan_id = plan_res['plan_id']
-        checked_items = plan_res.get('checked_items', [])
-        
-        # 로그 생성
-        log_data = {
-            "project_id": project_id,
-            "user_id": worker_id,
-            "log_type": "WORK_SAFETY_CHECK",
-            "note": "작업 전 안전 점검 완료",
-            "plan_id": plan_id,
-            "checklist_data": checked_items  # JSON 형태로 저장
-        }
-        await safety_logs_repository.create_log(log_data)
-        
-        # 작업 계획 상태 업데이트 (PLANNED -> IN_PROGRESS)
-        # 이미 진행중이면 건너뛰거나 유지
-        
-    return {"success": True, "message": "안전 점검이 완료되었습니다."}
+    return await task_plans_service.submit_safety_check(req)
 
 @router.get("/my-log")
 async def get_my_safety_logs(project_id: int, worker_id: int, d: Optional[date] = None):
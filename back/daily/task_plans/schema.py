@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Any, List
+
+class PlanCheckResult(BaseModel):
+    """작업별 안전 점검 결과"""
+    plan_id: int
+    checked_items: List[Any] = []  # 카탈로그 checklist_items와 같은 형식 (문자열/객체 모두 허용)
+
+class DangerCheckResult(BaseModel):
+    """위험 요소 확인 결과"""
+    danger_id: int
+    checked: bool = True
+
+class SafetyCheckRequest(BaseModel):
+    """일일 안전 점검 제출 (작업 + 위험 요소)"""
+    project_id: int
+    worker_id: int
+    plan_results: List[PlanCheckResult] = []
+    danger_results: List[DangerCheckResult] = []
@@ -1,5 +1,11 @@
 
 from back.daily.task_plans.repository import task_plans_repository
+from back.daily.task_plans.schema import SafetyCheckRequest
+from back.daily.safety_logs.repository import safety_logs_repository
+from back.project.locations.snapshot import zone_snapshot_store
+from back.utils.versioning import resource_versions
+from back.utils.date_utils import get_now
+from back.database import transaction
 from datetime import date
 
 class TaskPlansService:
@@ -8,9 +14,8 @@ class TaskPlansService:
         # 1. 작업 계획 목록 조회 (프로젝트 기준)
         plans = await task_plans_repository.get_by_project(project_id, target_date)
         
-        # 2. 각 계획별 투입 인원 상세 정보 매핑
-        for plan in plans:
-            plan['workers'] = await task_plans_repository.get_worker_users(plan['id'])
+        # 2. 계획별 투입 인원 상세 정보 매핑 (전체 계획을 한 번에 조회)
+        await task_plans_repository.attach_workers(plans)
             
         return {"success": True, "data": plans}
 
@@ -19,4 +24,58 @@ class TaskPlansService:
         # 작업 계획 생성 로직 (나중에 상세화 가능)
         return {"success": True, "message": "성공적으로 등록되었습니다."}
 
+    @staticmethod
+    async def submit_safety_check(req: SafetyCheckRequest):
+        """
+        일일 안전 점검 일괄 제출
+        - 작업별 점검 + 위험 요소 확인 로그를 multi-row INSERT 한 번으로 기록
+        - 점검한 작업 계획은 같은 트랜잭션에서 PLANNED -> IN_PROGRESS (로그와 상태가 함께 커밋/롤백)
+        """
+        # 같은 계획/위험 요소가 중복 제출되면 마지막 값 사용
+        plans = {r.plan_id: r for r in req.plan_results}
+        dangers = {r.danger_id: r for r in req.danger_results}
+        logs = [
+            {
+                "log_type": "WORK_SAFETY_CHECK",
+                "note": "작업 전 안전 점검 완료",
+                "plan_id": r.plan_id,
+                "checklist_data": r.checked_items,
+            }
+            for r in plans.values()
+        ] + [
+            {
+                "log_type": "DANGER_CHECK",
+                "note": "위험 요소 확인 완료" if r.checked else "위험 요소 미확인",
+                "plan_id": None,
+                "checklist_data": {"danger_id": r.danger_id, "checked": r.checked},
+            }
+            for r in dangers.values()
+        ]
+
+        now = get_now()
+        async with transaction():
+            created = await safety_logs_repository.bulk_create_logs(req.project_id, req.worker_id, logs, now)
+            checked_plan_ids = sorted({row["plan_id"] for row in created if row["plan_id"] is not None})
+            started = await task_plans_repository.start_plans(req.project_id, checked_plan_ids)
+
+        # 커밋 후 캐시/스냅샷 갱신 (작업 상태 변경 구역, 현황판 점검 여부)
+        zones_by_date = {}
+        for plan in started:
+            zones_by_date.setdefault(plan["date"], set()).add(plan["zone_id"])
+        for d, zone_ids in zones_by_date.items():
+            await zone_snapshot_store.mark_zones(zone_ids, d, req.project_id)
+            await resource_versions.bump("task_plans", req.project_id, d)
+        if created:
+            await resource_versions.bump("attendance", req.project_id, now.date())
+
+        return {
+            "success": True,
+            "message": "안전 점검이 완료되었습니다.",
+            "data": {
+                "log_ids": [row["id"] for row in created],
+                "started_plan_ids": [plan["id"] for plan in started],
+                "skipped_plan_ids": sorted(set(plans) - set(checked_plan_ids)),
+            },
+        }
+
 task_plans_service = TaskPlansService()
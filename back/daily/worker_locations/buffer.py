@@ -0,0 +1,109 @@
+
+import asyncio
+import os
+from typing import List, Dict, Any, Optional
+from sqlalchemy.exc import DataError, IntegrityError
+from back.daily.worker_locations.repository import worker_locations_repository
+from back.database import spawn_detached
+
+def _is_row_error(e: BaseException) -> bool:
+    """행 데이터 때문에 실패했는지 (FK 위반/형식 오류 → 재시도해도 실패), DB 연결 장애 등은 False"""
+    while e is not None:
+        if isinstance(e, (IntegrityError, DataError, ValueError, TypeError)):
+            return True
+        e = e.__cause__
+    return False
+
+class LocationWriteBuffer:
+    """
+    [Write-Behind] 위치 로그 버퍼
+    - 수신한 핑은 메모리에 쌓아두고, 건수(max_rows) 또는 시간(flush_interval) 조건이 되면 일괄 INSERT
+    - 요청 경로에서는 DB를 기다리지 않음 (커넥션 풀 점유 최소화)
+    """
+    def __init__(self, max_rows: int = 500, flush_interval: float = 1.0, max_pending: int = 50000):
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending  # DB 장애 시 메모리 상한 (초과분은 오래된 것부터 폐기)
+        self.pending: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.rejected = 0  # 데이터 오류로 저장하지 못하고 버린 행
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, rows: List[Dict[str, Any]]):
+        """핑 적재 (건수 조건 충족 시 백그라운드 flush 예약)"""
+        self.pending.extend(rows)
+        self._trim()
+        if len(self.pending) >= self.max_rows and not self._flush_lock.locked():
+            spawn_detached(self.flush())
+
+    def _trim(self):
+        overflow = len(self.pending) - self.max_pending
+        if overflow > 0:
+            del self.pending[:overflow]
+            self.dropped += overflow
+
+    async def flush(self):
+        """쌓인 핑을 max_rows 단위로 잘라 일괄 저장"""
+        async with self._flush_lock:
+            while self.pending:
+                batch = self.pending[:self.max_rows]
+                del self.pending[:len(batch)]
+                unsaved = await self._insert_isolating(batch)
+                if unsaved:
+                    # DB 장애 등 일시적 실패: 저장 못 한 행만 다시 앞쪽에 넣고 다음 주기에 재시도
+                    self.pending[:0] = unsaved
+                    self._trim()
+                    break
+
+    async def _insert_isolating(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        일괄 저장, 행 데이터 오류(FK 위반 등)면 반으로 나눠 재시도해 문제 행만 버림
+        - 불량 행 하나가 뒤따르는 정상 배치를 막지 않도록 함
+        :return: 일시적 장애로 저장하지 못한 행 (재시도 대상, 이미 저장된 행은 제외)
+        """
+        try:
+            await worker_locations_repository.bulk_insert(batch)
+            return []
+        except Exception as e:
+            if not _is_row_error(e):
+                print(f"❌ 위치 로그 일괄 저장 실패 ({len(batch)}건): {e}")
+                return batch
+            if len(batch) == 1:
+                self.rejected += 1
+                print(f"⚠️ 위치 로그 폐기 (worker_id={batch[0].get('worker_id')}): {e}")
+                return []
+        mid = len(batch) // 2
+        unsaved = await self._insert_isolating(batch[:mid])
+        if unsaved:
+            return unsaved + batch[mid:]
+        return await self._insert_isolating(batch[mid:])
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """주기 작업 종료 후 남은 핑까지 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> dict:
+        return {"pending": len(self.pending), "dropped": self.dropped, "rejected": self.rejected}
+
+# 싱글톤 인스턴스
+location_write_buffer = LocationWriteBuffer(
+    max_rows=int(os.getenv("LOCATION_FLUSH_ROWS", "500")),
+    flush_interval=float(os.getenv("LOCATION_FLUSH_INTERVAL", "1.0")),
+)
@@ -0,0 +1,289 @@
+
+import asyncio
+import json
+import math
+from datetime import date
+from typing import Dict, Optional, Tuple
+from back.project.master.repository import project_repository
+from back.project.locations.repository import locations_repository
+from back.daily.safety_logs.repository import safety_logs_repository
+from back.sys.users.repository import users_repository
+from back.utils.spatial_index import STRTree, polygon_bbox, polygon_area, point_in_polygon
+from back.utils.date_utils import get_today
+
+# 위도 1도 ≈ 111,320m (프론트 CommonMap.jsx 격자 계산과 동일한 상수)
+METERS_PER_DEGREE = 111320.0
+
+# zone_type -> 위험도
+ALERT_BY_ZONE_TYPE = {"DANGER": "DANGER", "RESTRICTED": "WARNING"}
+ALERT_RANK = {"SAFE": 0, "WARNING": 1, "DANGER": 2}
+
+ZoneHit = Tuple[int, str, str]  # (zone_id, zone_name, alert_level)
+
+class ProjectGrid:
+    """
+    프로젝트 1개의 회전 격자 (project_master 격자 설정 + project_zones 셀)
+    - 프론트(CommonMap.jsx)와 같은 방식: 중심(lat, lng) 기준, A행이 북쪽, 1열이 서쪽, grid_angle만큼 반시계 회전
+    - 좌표 -> 셀 변환은 역회전 + 나눗셈 한 번 (O(1), DB 조회 없음)
+    - points(폴리곤)가 있는 비정형 구역은 층별 STR-Tree로 색인 (격자 셀보다 우선)
+    - 오늘 daily_danger_zones가 등록된 구역은 DANGER로 격상
+    """
+    __slots__ = (
+        "project_id", "lat0", "lng0", "cos_lat0", "cos_a", "sin_a",
+        "spacing", "rows", "cols", "half_w", "half_h", "cells", "polygons",
+        "zone_ids", "levels", "default_level", "danger_counts", "danger_date"
+    )
+
+    def __init__(self, project: dict, zones: list):
+        self.project_id = project["id"]
+        self.lat0 = float(project.get("lat") or 37.5665)
+        self.lng0 = float(project.get("lng") or 126.9780)
+        self.cos_lat0 = math.cos(math.radians(self.lat0))
+
+        angle = math.radians(float(project.get("grid_angle") or 0.0))
+        self.cos_a = math.cos(angle)
+        self.sin_a = math.sin(angle)
+
+        self.spacing = float(project.get("grid_spacing") or 10.0)
+        self.rows = int(project.get("grid_rows") or 5)
+        self.cols = int(project.get("grid_cols") or 5)
+        self.half_w = self.cols * self.spacing / 2
+        self.half_h = self.rows * self.spacing / 2
+
+        # (level, row, col) -> (zone_id, name, alert_level)
+        self.cells: Dict[Tuple[str, int, int], ZoneHit] = {}
+        # level -> STRTree[(zone_id, name, alert_level, local_points, area)]
+        self.polygons: Dict[str, STRTree] = {}
+        self.zone_ids = set()
+        self.levels = set()
+        # GPS는 층 구분이 불가하므로 층 미지정 시 지상 1층 기준 (구역 없는 프로젝트 포함)
+        self.default_level = "1F"
+
+        by_level: Dict[str, list] = {}
+        for z in zones:
+            by_level.setdefault(z["level"], []).append(z)
+        for level, level_zones in by_level.items():
+            self.rebuild_level(level, level_zones)
+
+        # 오늘 위험 구역 (zone_id -> 등록 건수)
+        self.danger_counts: Dict[int, int] = {}
+        self.danger_date = None
+
+    def rebuild_level(self, level: str, zones: list):
+        """한 층의 셀/폴리곤 색인만 다시 구성 (구역 변경 시 증분 갱신)"""
+        for key in [k for k in self.cells if k[0] == level]:
+            self.zone_ids.discard(self.cells.pop(key)[0])
+        old_tree = self.polygons.pop(level, None)
+        if old_tree is not None and old_tree.root is not None:
+            for entry in self._iter_tree(old_tree):
+                self.zone_ids.discard(entry[0])
+
+        poly_items = []
+        for z in zones:
+            alert = ALERT_BY_ZONE_TYPE.get(z.get("zone_type") or "NORMAL", "SAFE")
+            points = z.get("points")
+            if isinstance(points, str):
+                points = json.loads(points)
+            if points and len(points) >= 3:
+                local = [self.to_local(p[0], p[1]) for p in points]
+                poly_items.append((polygon_bbox(local), (z["id"], z["name"], alert, local, polygon_area(local))))
+            elif z.get("row_index") is not None and z.get("col_index") is not None:
+                self.cells[(level, z["row_index"], z["col_index"])] = (z["id"], z["name"], alert)
+            else:
+                continue
+            self.zone_ids.add(z["id"])
+
+        if poly_items:
+            self.polygons[level] = STRTree(poly_items)
+        if zones:
+            self.levels.add(level)
+        else:
+            self.levels.discard(level)
+        # 1층 구역이 없으면 가장 낮은 정렬 순서의 층 기준
+        self.default_level = "1F" if "1F" in self.levels or not self.levels else sorted(self.levels)[0]
+
+    @staticmethod
+    def _iter_tree(tree: STRTree):
+        stack = [tree.root]
+        while stack:
+            _, children, leaf = stack.pop()
+            for _, child in children:
+                if leaf:
+                    yield child
+                else:
+                    stack.append(child)
+
+    def to_local(self, lat: float, lng: float) -> Tuple[float, float]:
+        """위경도 -> 격자 기준 로컬 좌표(m) (x: 동쪽, y: 북쪽, 회전 해제)"""
+        y = (lat - self.lat0) * METERS_PER_DEGREE
+        x = (lng - self.lng0) * self.cos_lat0 * METERS_PER_DEGREE
+        return x * self.cos_a + y * self.sin_a, -x * self.sin_a + y * self.cos_a
+
+    def locate(self, lat: float, lng: float, level: Optional[str] = None) -> Optional[ZoneHit]:
+        level = level or self.default_level
+        ux, uy = self.to_local(lat, lng)
+
+        hit = None
+        tree = self.polygons.get(level)
+        if tree is not None:
+            # 겹치는 폴리곤은 위험도 높은 순, 같으면 면적 작은(더 구체적인) 구역 우선
+            best = None
+            for zone_id, name, alert, local, area in tree.query_point(ux, uy):
+                if point_in_polygon(ux, uy, local):
+                    key = (-ALERT_RANK[alert], area)
+                    if best is None or key < best[0]:
+                        best = (key, (zone_id, name, alert))
+            if best is not None:
+                hit = best[1]
+
+        if hit is None:
+            col = math.floor((ux + self.half_w) / self.spacing)
+            row = math.floor((self.half_h - uy) / self.spacing)
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                return None
+            hit = self.cells.get((level, row, col))
+            if hit is None:
+                return None
+
+        if self.danger_counts.get(hit[0]):
+            return hit[0], hit[1], "DANGER"
+        return hit
+
+class GeofenceEngine:
+    """
+    [Geofencing] 프로젝트별 격자를 메모리에 유지하고 핑마다 O(1)로 구역 판별
+    - 격자는 프로젝트 첫 핑 시점에 한 번 로드 (동시 요청은 Lock으로 1회만 조회)
+    - 프로젝트 수정/삭제 시 invalidate()로 재계산
+    - 구역 변경은 층 단위 재색인(on_zone_changed), 위험 구역 변경은 카운트만 갱신(on_danger_changed)
+    - attach(broker) 후에는 변경을 브로커로 발행 → 모든 프로세스의 캐시에 반영 (다중 워커/노드)
+    """
+    CHANNEL = "geofence"
+
+    def __init__(self):
+        self.grids: Dict[int, Optional[ProjectGrid]] = {}
+        self.worker_projects: Dict[int, int] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self.broker = None
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 (startup에서 broker.start() 전에 호출)"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+
+    async def _on_broker_message(self, payload: dict):
+        kind = payload["kind"]
+        if kind == "invalidate":
+            self._invalidate(payload.get("project_id"))
+        elif kind == "forget_worker":
+            self.worker_projects.pop(payload["worker_id"], None)
+        elif kind == "zone":
+            await self._rebuild_level(payload["project_id"], payload["level"])
+        elif kind == "danger":
+            self._apply_danger(payload["zone_id"], date.fromisoformat(payload["date"]), payload["delta"])
+
+    async def _publish(self, payload: dict):
+        """브로커로 발행 (미연결 시 현재 프로세스에만 반영)"""
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, payload)
+        else:
+            await self._on_broker_message(payload)
+
+    async def get_grid(self, project_id: int) -> Optional[ProjectGrid]:
+        grid = self.grids.get(project_id)
+        if grid is not None and grid.danger_date == get_today():
+            return grid
+        if project_id in self.grids and grid is None:
+            return None
+
+        lock = self._locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            if project_id not in self.grids:
+                project = await project_repository.get_by_id(project_id)
+                zones = await locations_repository.get_zones_by_project(project_id) if project else []
+                self.grids[project_id] = ProjectGrid(project, zones) if project else None
+            grid = self.grids[project_id]
+            if grid is not None and grid.danger_date != get_today():
+                await self._load_dangers(grid)  # 날짜가 바뀌면 위험 구역만 다시 로드
+        return grid
+
+    @staticmethod
+    async def _load_dangers(grid: ProjectGrid):
+        today = get_today()
+        rows = await safety_logs_repository.get_danger_zone_counts(grid.project_id, today)
+        grid.danger_counts = {r["zone_id"]: r["cnt"] for r in rows}
+        grid.danger_date = today
+
+    async def resolve_project(self, worker_id: int) -> Optional[int]:
+        """작업자 소속 프로젝트 (최초 1회만 조회, 미소속은 캐시하지 않음)"""
+        pid = self.worker_projects.get(worker_id)
+        if pid is None:
+            pid = await users_repository.get_user_project(worker_id)
+            if pid is not None:
+                self.worker_projects[worker_id] = pid
+        return pid
+
+    async def locate(self, project_id: int, lat: float, lng: float, level: Optional[str] = None) -> Optional[ZoneHit]:
+        grid = await self.get_grid(project_id)
+        if grid is None:
+            return None
+        return grid.locate(lat, lng, level)
+
+    async def zone_alert(self, project_id: Optional[int], zone_id: int, zone_type: Optional[str]) -> str:
+        """구역 ID로 위험도 판별 (BLE 등 좌표 없이 구역이 정해진 경우)"""
+        alert = ALERT_BY_ZONE_TYPE.get(zone_type or "NORMAL", "SAFE")
+        grid = await self.get_grid(project_id) if project_id is not None else None
+        if grid is not None and grid.danger_counts.get(zone_id):
+            return "DANGER"
+        return alert
+
+    async def invalidate(self, project_id: Optional[int] = None):
+        """격자 캐시 무효화 (project_id 미지정 시 전체, 모든 프로세스)"""
+        self._invalidate(project_id)
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {"kind": "invalidate", "project_id": project_id})
+
+    def _invalidate(self, project_id: Optional[int]):
+        if project_id is None:
+            self.grids.clear()
+        else:
+            self.grids.pop(project_id, None)
+
+    def _grid_of_zone(self, zone_id: int) -> Optional[ProjectGrid]:
+        for grid in self.grids.values():
+            if grid is not None and zone_id in grid.zone_ids:
+                return grid
+        return None
+
+    async def on_zone_changed(self, project_id: int, level: str):
+        """구역 추가/수정/삭제 시 해당 층 색인만 재구성 (격자 미로드 상태면 다음 핑에서 전체 로드)"""
+        await self._publish({"kind": "zone", "project_id": project_id, "level": level})
+
+    async def _rebuild_level(self, project_id: int, level: str):
+        grid = self.grids.get(project_id)
+        if grid is None:
+            return
+        zones = await locations_repository.get_zones_by_level(project_id, level)
+        grid.rebuild_level(level, zones)
+
+    async def on_danger_changed(self, zone_id: int, d: date, delta: int):
+        """daily_danger_zones 등록(+1)/삭제(-1) 반영 (오늘 날짜 분만, 조회 없음)"""
+        await self._publish({"kind": "danger", "zone_id": zone_id, "date": d.isoformat(), "delta": delta})
+
+    def _apply_danger(self, zone_id: int, d: date, delta: int):
+        grid = self._grid_of_zone(zone_id)
+        if grid is None or grid.danger_date != d:
+            return
+        count = grid.danger_counts.get(zone_id, 0) + delta
+        if count > 0:
+            grid.danger_counts[zone_id] = count
+        else:
+            grid.danger_counts.pop(zone_id, None)
+
+    async def forget_worker(self, worker_id: int):
+        """작업자 소속 변경(승인/거절) 시 매핑 제거 (모든 프로세스)"""
+        self.worker_projects.pop(worker_id, None)
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {"kind": "forget_worker", "worker_id": worker_id})
+
+# 싱글톤 인스턴스
+geofence_engine = GeofenceEngine()
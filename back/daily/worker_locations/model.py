@@ -1,13 +1,22 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Float, DateTime, Index
 from back.database import Base
 from datetime import datetime
 
 class daily_worker_locations(Base):
-    """[DAILY] 작업자 위치 추적 로그"""
+    """
+    [DAILY] 작업자 위치 추적 로그 (append-only)
+    - timestamp 기준 RANGE 파티션 테이블, 파티션 생성/보관기간 삭제는 partitions.py 에서 관리
+    - PK는 파티션 키를 포함해야 하므로 (id, timestamp)
+    """
     __tablename__ = "daily_worker_locations"
+    __table_args__ = (
+        Index("ix_daily_worker_locations_worker_id_timestamp", "worker_id", "timestamp"),
+        Index("ix_daily_worker_locations_zone_id_timestamp", "zone_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     worker_id = Column(Integer, ForeignKey("sys_users.id"), nullable=False)
     
     # 추적 방식: GPS 또는 BLE (Bluetooth Low Energy)
@@ -25,4 +34,4 @@ class daily_worker_locations(Base):
     # 3. [핵심] 판별된 구역 (Calculated Zone)
     zone_id = Column(Integer, ForeignKey("project_zones.id", ondelete="SET NULL"), nullable=True, comment="최종 판별 구역")
     
-    timestamp = Column(DateTime, default=datetime.now)
+    timestamp = Column(DateTime, primary_key=True, default=datetime.now)
@@ -0,0 +1,240 @@
+import asyncio
+import os
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from sqlalchemy import text
+from back.database import engine, fetch_all, fetch_one
+
+TABLE = "daily_worker_locations"
+# DDL이 부모 테이블 잠금을 오래 기다리면(긴 조회 등) 포기하고 다음 주기에 재시도 → INSERT/조회가 뒤에 줄 서지 않음
+LOCK_TIMEOUT = os.getenv("LOCATION_PARTITION_LOCK_TIMEOUT", "5s")
+PURGE_BATCH = 10000  # legacy DEFAULT 파티션 정리 시 트랜잭션당 삭제 건수
+
+class LocationPartitionManager:
+    """
+    [Partition] daily_worker_locations 시간 파티션 관리
+    - 일/주 단위 RANGE 파티션을 보관기간 시작(오늘 - retention_days)부터 premake 기간 앞까지 생성
+    - 수신 시각이 [오늘 - retention_days, 오늘 + premake) 밖이거나 가장 오래된 파티션보다 이르면 ingest에서 거부 (accepts)
+      → DEFAULT 파티션 불필요
+    - 기존 일반 테이블 이전은 scripts/partition_worker_locations.py (과거 범위 파티션 생성 후 행 복사)
+    - 보관기간(retention_days)이 지난 파티션은 DETACH CONCURRENTLY 후 DROP (대량 DELETE 없음)
+    - DDL은 단계마다 짧은 단독 트랜잭션 + lock_timeout, 워커 간 중복 실행은 세션 advisory lock으로 방지
+    - 이전 버전이 만든 DEFAULT 파티션이 있으면: 새 파티션 생성 시 해당 범위 행을 옮기고, 만료 행 정리 후 비면 삭제
+      (DEFAULT 파티션이 있는 동안은 CONCURRENTLY 불가 → 일반 DETACH)
+    - 파티션 테이블이 아닌 기존 테이블이면 아무 작업도 하지 않음 (마이그레이션 전)
+    """
+    LOCK_KEY = "daily_worker_locations_partitions"
+
+    def __init__(self, interval: str = "day", premake: int = 3, retention_days: int = 90, check_interval: float = 3600.0):
+        if interval not in ("day", "week"):
+            raise ValueError(f"LOCATION_PARTITION_INTERVAL must be 'day' or 'week': {interval}")
+        self.interval = interval
+        self.premake = premake
+        self.retention_days = retention_days  # 0 이하: 삭제하지 않음
+        self.check_interval = check_interval
+        self.partitioned = False
+        self.created = 0
+        self.dropped = 0
+        self.last_run: Optional[datetime] = None
+        self.earliest: Optional[datetime] = None  # 가장 오래된 파티션의 하한 (그 이전 시각은 저장 불가)
+        self._task: Optional[asyncio.Task] = None
+
+    def _period_start(self, d: date) -> date:
+        return d - timedelta(days=d.weekday()) if self.interval == "week" else d
+
+    def _step(self) -> timedelta:
+        return timedelta(days=7 if self.interval == "week" else 1)
+
+    @staticmethod
+    def partition_name(start: date) -> str:
+        return f"{TABLE}_p{start:%Y%m%d}"
+
+    def accepts(self, ts: datetime, today: Optional[date] = None) -> bool:
+        """
+        저장 가능한 수신 시각인지 (시계가 틀린 기기의 미래/과거 시각 차단)
+        - 상한은 premake 기간의 시작까지 (자정 직후 다음 파티션 생성 전에도 안전)
+        """
+        if not self.partitioned:
+            return True
+        today = today or date.today()
+        if ts >= datetime.combine(today + timedelta(days=self.premake), time.min):
+            return False
+        if self.retention_days > 0 and ts < datetime.combine(today - timedelta(days=self.retention_days), time.min):
+            return False
+        if self.earliest is not None and ts < self.earliest:
+            return False
+        return True
+
+    async def is_partitioned(self) -> bool:
+        row = await fetch_one("SELECT relkind FROM pg_class WHERE relname = :t AND relkind IN ('r', 'p')", {"t": TABLE})
+        return row is not None and row["relkind"] == "p"
+
+    async def list_partitions(self) -> List[dict]:
+        """하위 파티션 목록 (name, 하한/상한 시각, default 여부, DETACH CONCURRENTLY 중단 여부)"""
+        rows = await fetch_all("""
+            SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound, i.inhdetachpending AS detach_pending
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = :t
+            ORDER BY c.relname
+        """, {"t": TABLE})
+        result = []
+        for r in rows:
+            lower = re.search(r"FROM \('([^']+)'\)", r["bound"] or "")
+            upper = re.search(r"TO \('([^']+)'\)", r["bound"] or "")
+            result.append({
+                "name": r["name"],
+                "lower": datetime.fromisoformat(lower.group(1)) if lower else None,
+                "upper": datetime.fromisoformat(upper.group(1)) if upper else None,
+                "is_default": (r["bound"] or "").strip().upper() == "DEFAULT",
+                "detach_pending": bool(r["detach_pending"]),
+            })
+        return result
+
+    @staticmethod
+    async def _ddl(*statements: str, params: Optional[dict] = None):
+        """짧은 단독 트랜잭션으로 실행 (lock_timeout 적용, 커밋 즉시 부모 테이블 잠금 해제)"""
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            result = None
+            for sql in statements:
+                result = await conn.execute(text(sql), params or {})
+            return result
+
+    async def ensure_partitions(self, today: Optional[date] = None):
+        """보관기간 시작(보관기간 무제한이면 오늘)부터 premake 기간까지 파티션 생성"""
+        today = today or date.today()
+        start = today - timedelta(days=self.retention_days) if self.retention_days > 0 else today
+        await self.ensure_range(start, today + timedelta(days=self.premake))
+
+    async def ensure_range(self, start: date, end: date):
+        """start ~ end 날짜를 덮는 파티션 생성 (없는 것만, 파티션마다 별도 트랜잭션)"""
+        start = self._period_start(start)
+        partitions = await self.list_partitions()
+        existing = {p["name"] for p in partitions}
+        default = next((p["name"] for p in partitions if p["is_default"]), None)
+        while start <= end:
+            name = self.partition_name(start)
+            if name not in existing:
+                try:
+                    await self._create_partition(name, start, start + self._step(), default)
+                    self.created += 1
+                except Exception as e:
+                    print(f"❌ 위치 로그 파티션 생성 실패 ({name}): {e}")
+            start += self._step()
+
+    async def _create_partition(self, name: str, lower: date, upper: date, default: Optional[str]):
+        bound = f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        if default is None:
+            await self._ddl(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} {bound}")
+            return
+        # DEFAULT 파티션에 같은 범위 행이 있으면 PARTITION OF 생성이 실패 → 새 테이블로 옮긴 뒤 ATTACH (한 트랜잭션)
+        await self._ddl(
+            f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+            f"WITH moved AS (DELETE FROM {default} WHERE timestamp >= :lower AND timestamp < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {name} {bound}",
+            params={"lower": datetime.combine(lower, time.min), "upper": datetime.combine(upper, time.min)},
+        )
+
+    async def drop_expired(self, lock_conn, today: Optional[date] = None):
+        """
+        상한 시각이 보관기간 이전인 파티션 삭제
+        - lock_conn: AUTOCOMMIT 연결 (DETACH CONCURRENTLY는 트랜잭션 블록 밖에서만 실행 가능)
+        """
+        if self.retention_days <= 0:
+            return
+        cutoff = datetime.combine((today or date.today()) - timedelta(days=self.retention_days), time.min)
+        partitions = await self.list_partitions()
+        default = next((p["name"] for p in partitions if p["is_default"]), None)
+        for p in partitions:
+            if p["is_default"] or p["upper"] is None or p["upper"] > cutoff:
+                continue
+            if p["detach_pending"]:
+                # 이전 DETACH CONCURRENTLY가 중단된 파티션 마무리
+                await lock_conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {p['name']} FINALIZE"))
+            elif default is None:
+                await lock_conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {p['name']} CONCURRENTLY"))
+            else:
+                await self._ddl(f"ALTER TABLE {TABLE} DETACH PARTITION {p['name']}")
+            await self._ddl(f"DROP TABLE IF EXISTS {p['name']}")
+            self.dropped += 1
+        if default is not None:
+            await self._purge_default(default, cutoff)
+
+    async def _purge_default(self, default: str, cutoff: datetime):
+        """legacy DEFAULT 파티션의 만료 행을 나눠 삭제하고, 비면 DEFAULT 파티션 삭제 (이후 CONCURRENTLY 사용 가능)"""
+        while True:
+            result = await self._ddl(
+                f"DELETE FROM {default} WHERE ctid IN "
+                f"(SELECT ctid FROM {default} WHERE timestamp < :cutoff LIMIT {PURGE_BATCH})",
+                params={"cutoff": cutoff},
+            )
+            if result.rowcount < PURGE_BATCH:
+                break
+        if await fetch_one(f"SELECT 1 AS x FROM {default} LIMIT 1") is None:
+            await self._ddl(f"DROP TABLE IF EXISTS {default}")
+
+    async def run_once(self):
+        self.partitioned = await self.is_partitioned()
+        if not self.partitioned:
+            return
+        async with engine.connect() as conn:
+            lock_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            # 세션 단위 잠금 (다른 워커는 대기 후 이미 생성된 파티션 확인), DDL 트랜잭션과 무관하게 유지
+            await lock_conn.execute(text("SELECT pg_advisory_lock(hashtext(:k))"), {"k": self.LOCK_KEY})
+            try:
+                await self.ensure_partitions()
+                await self.drop_expired(lock_conn)
+            finally:
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(hashtext(:k))"), {"k": self.LOCK_KEY})
+        lowers = [p["lower"] for p in await self.list_partitions() if p["lower"] is not None]
+        self.earliest = min(lowers) if lowers else None
+        self.last_run = datetime.now()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"❌ 위치 로그 파티션 관리 실패: {e}")
+
+    async def start(self):
+        """기동 시 1회 실행 (오늘 파티션 보장) 후 주기 실행"""
+        try:
+            await self.run_once()
+        except Exception as e:
+            print(f"❌ 위치 로그 파티션 관리 실패: {e}")
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "partitioned": self.partitioned,
+            "retention_days": self.retention_days,
+            "created": self.created,
+            "dropped": self.dropped,
+            "last_run": self.last_run,
+            "earliest": self.earliest,
+        }
+
+# 싱글톤 인스턴스
+location_partition_manager = LocationPartitionManager(
+    interval=os.getenv("LOCATION_PARTITION_INTERVAL", "day"),
+    premake=int(os.getenv("LOCATION_PARTITION_PREMAKE_DAYS", "3")),
+    retention_days=int(os.getenv("LOCATION_RETENTION_DAYS", "90")),
+    check_interval=float(os.getenv("LOCATION_PARTITION_CHECK_INTERVAL", "3600")),
+)
@@ -0,0 +1,160 @@
+
+from back.database import execute, fetch_all, stream_rows
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+class worker_locations_repository:
+    """[DAILY_WORKER_LOCATIONS] 위치 로그 데이터 접근"""
+
+    @staticmethod
+    async def bulk_insert(rows: List[Dict[str, Any]]):
+        """
+        위치 로그 일괄 저장 (multi-row INSERT)
+        - 컬럼별 배열을 unnest로 펼쳐 한 번의 INSERT(단일 왕복/단일 트랜잭션)로 처리
+        """
+        if not rows:
+            return 0
+
+        sql = """
+            INSERT INTO daily_worker_locations
+                (worker_id, tracking_mode, lat, lng, beacon_id, rssi, distance, zone_id, timestamp)
+            SELECT * FROM unnest(
+                CAST(:worker_ids AS integer[]),
+                CAST(:modes AS varchar[]),
+                CAST(:lats AS double precision[]),
+                CAST(:lngs AS double precision[]),
+                CAST(:beacon_ids AS integer[]),
+                CAST(:rssis AS integer[]),
+                CAST(:distances AS double precision[]),
+                CAST(:zone_ids AS integer[]),
+                CAST(:timestamps AS timestamp[])
+            )
+        """
+        await execute(sql, {
+            "worker_ids": [r["worker_id"] for r in rows],
+            "modes": [r["tracking_mode"] for r in rows],
+            "lats": [r.get("lat") for r in rows],
+            "lngs": [r.get("lng") for r in rows],
+            "beacon_ids": [r.get("beacon_id") for r in rows],
+            "rssis": [r.get("rssi") for r in rows],
+            "distances": [r.get("distance") for r in rows],
+            "zone_ids": [r.get("zone_id") for r in rows],
+            "timestamps": [r["timestamp"] for r in rows],
+        })
+        return len(rows)
+
+    @staticmethod
+    def stream_trajectory(worker_id: int, start: datetime, end: datetime, interval_sec: int = 0):
+        """
+        작업자 GPS 궤적 (시간순 스트리밍, 서버 사이드 커서)
+        - timestamp 범위 조건으로 해당 파티션만 조회 (worker_id, timestamp) 인덱스 사용
+        - interval_sec > 0: 구간(초)마다 첫 점만 DB에서 골라 전송 (고정 간격 축약)
+        """
+        params = {"wid": worker_id, "start": start, "end": end, "sec": interval_sec}
+        if interval_sec > 0:
+            sql = """
+                SELECT DISTINCT ON (s.bucket) s.timestamp, s.lat, s.lng, s.zone_id
+                FROM (
+                    SELECT timestamp, lat, lng, zone_id, floor(extract(epoch FROM timestamp) / :sec) AS bucket
+                    FROM daily_worker_locations
+                    WHERE worker_id = :wid AND timestamp >= :start AND timestamp < :end
+                      AND lat IS NOT NULL AND lng IS NOT NULL
+                ) s
+                ORDER BY s.bucket, s.timestamp
+            """
+        else:
+            sql = """
+                SELECT timestamp, lat, lng, zone_id
+                FROM daily_worker_locations
+                WHERE worker_id = :wid AND timestamp >= :start AND timestamp < :end
+                  AND lat IS NOT NULL AND lng IS NOT NULL
+                ORDER BY timestamp
+            """
+        return stream_rows(sql, params)
+
+    # 구역 방문(진입~이탈) 계산: 작업자별 시간순 핑에서 구역이 바뀌거나 max_gap 이상 끊기면 새 방문
+    # 이탈 시각 = 다음 핑 시각 (max_gap 이내일 때), 끊긴 경우 마지막 핑 시각
+    _VISITS_CTE = """
+        WITH pings AS (
+            SELECT
+                l.worker_id, l.zone_id, l.timestamp,
+                LAG(l.zone_id) OVER w AS prev_zone,
+                LAG(l.timestamp) OVER w AS prev_ts,
+                LEAD(l.timestamp) OVER w AS next_ts
+            FROM daily_worker_locations l
+            WHERE l.timestamp >= :start AND l.timestamp < :end
+              AND l.worker_id IN (SELECT user_id FROM project_users WHERE project_id = :pid)
+              AND (CAST(:wid AS integer) IS NULL OR l.worker_id = CAST(:wid AS integer))
+            WINDOW w AS (PARTITION BY l.worker_id ORDER BY l.timestamp)
+        ),
+        marked AS (
+            SELECT *,
+                CASE
+                    WHEN prev_ts IS NULL
+                      OR prev_zone IS DISTINCT FROM zone_id
+                      OR timestamp - prev_ts > make_interval(secs => :max_gap)
+                    THEN 1 ELSE 0
+                END AS is_start
+            FROM pings
+        ),
+        numbered AS (
+            SELECT *, SUM(is_start) OVER (PARTITION BY worker_id ORDER BY timestamp) AS visit_no
+            FROM marked
+        ),
+        visits AS (
+            SELECT
+                n.worker_id, n.zone_id,
+                MIN(n.timestamp) AS entered_at,
+                MAX(CASE
+                    WHEN n.next_ts IS NOT NULL AND n.next_ts - n.timestamp <= make_interval(secs => :max_gap)
+                    THEN n.next_ts ELSE n.timestamp
+                END) AS exited_at,
+                COUNT(*) AS ping_count
+            FROM numbered n
+            WHERE n.zone_id IS NOT NULL
+            GROUP BY n.worker_id, n.zone_id, n.visit_no
+        )
+    """
+
+    @staticmethod
+    def stream_zone_visits(pid: int, start: datetime, end: datetime, max_gap: int,
+                           worker_id: Optional[int] = None, zone_id: Optional[int] = None):
+        """프로젝트 구역별 진입/이탈 이벤트 (방문 단위, 시간순 스트리밍)"""
+        sql = worker_locations_repository._VISITS_CTE + """
+            SELECT
+                v.worker_id, u.full_name AS worker_name,
+                v.zone_id, z.name AS zone_name, z.level,
+                v.entered_at, v.exited_at,
+                EXTRACT(EPOCH FROM v.exited_at - v.entered_at)::int AS dwell_sec,
+                v.ping_count
+            FROM visits v
+            JOIN project_zones z ON z.id = v.zone_id AND z.project_id = :pid
+            JOIN sys_users u ON u.id = v.worker_id
+            WHERE CAST(:zid AS integer) IS NULL OR v.zone_id = CAST(:zid AS integer)
+            ORDER BY v.entered_at, v.worker_id
+        """
+        return stream_rows(sql, {
+            "pid": pid, "start": start, "end": end, "max_gap": max_gap,
+            "wid": worker_id, "zid": zone_id,
+        })
+
+    @staticmethod
+    async def get_zone_dwell(pid: int, start: datetime, end: datetime, max_gap: int,
+                             worker_id: Optional[int] = None):
+        """프로젝트 구역별 체류 시간 집계 (총 체류 초, 방문 수, 방문 작업자 수)"""
+        sql = worker_locations_repository._VISITS_CTE + """
+            SELECT
+                v.zone_id, z.name AS zone_name, z.level,
+                SUM(EXTRACT(EPOCH FROM v.exited_at - v.entered_at))::int AS total_dwell_sec,
+                COUNT(*) AS visit_count,
+                COUNT(DISTINCT v.worker_id) AS worker_count,
+                MIN(v.entered_at) AS first_entered_at,
+                MAX(v.exited_at) AS last_exited_at
+            FROM visits v
+            JOIN project_zones z ON z.id = v.zone_id AND z.project_id = :pid
+            GROUP BY v.zone_id, z.name, z.level
+            ORDER BY total_dwell_sec DESC
+        """
+        return await fetch_all(sql, {
+            "pid": pid, "start": start, "end": end, "max_gap": max_gap, "wid": worker_id,
+        })
@@ -1,27 +1,91 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from back.database import get_db
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from datetime import date as dt_date, datetime
+from typing import Literal, Optional
 
-from back.daily.worker_locations.schema import WorkerLocationCreate, WorkerLocationResponse
-from back.daily.worker_locations.service import create_worker_location
+from back.daily.worker_locations.schema import (
+    WorkerLocationCreate, WorkerLocationResponse,
+    WorkerLocationBatchCreate, WorkerLocationBatchResponse
+)
+from back.daily.worker_locations.service import (
+    create_worker_location, create_worker_locations_batch,
+    get_worker_trajectory, get_zone_events, get_zone_dwell
+)
 
 router = APIRouter(prefix="/api/daily/worker/location", tags=["[DAILY] 작업자 위치 관제"])
 
 @router.post("", response_model=WorkerLocationResponse, summary="작업자 위치 전송 (GPS/BLE)")
-async def report_location(
-    location_data: WorkerLocationCreate,
-    db: AsyncSession = Depends(get_db)
-):
+async def report_location(location_data: WorkerLocationCreate):
     """
     작업자 앱에서 5~10초 간격으로 위치 정보를 전송함.
     - tracking_mode: 'GPS' 또는 'BLE'
     - lat, lng: GPS 좌표 (BLE일 경우 null)
     - beacon_id: 감지된 비콘 ID (GPS일 경우 null)
+    - 저장은 Write-Behind 버퍼를 통해 일괄 처리됨 (data_id는 null)
     """
     try:
-        result = await create_worker_location(db, location_data)
+        result = await create_worker_location(location_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/batch", response_model=WorkerLocationBatchResponse, summary="작업자 위치 일괄 전송")
+async def report_locations_batch(batch: WorkerLocationBatchCreate):
+    """
+    여러 핑을 한 요청으로 전송 (게이트웨이 또는 오프라인 구간에서 모아둔 핑).
+    - pings: WorkerLocationCreate 목록 (timestamp로 측정 시각 지정 가능)
+    """
+    try:
+        return await create_worker_locations_batch(batch.pings)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/trajectory", summary="작업자 이동 궤적 조회 (축약)")
+async def get_trajectory(
+    worker_id: int,
+    start: datetime,
+    end: datetime,
+    method: Literal["dp", "interval"] = "dp",
+    tolerance_m: float = Query(3.0, gt=0, le=100),
+    interval_sec: int = Query(10, ge=1, le=3600),
+    max_points: int = Query(2000, ge=2, le=20000),
+):
+    """
+    작업자의 기간 내 GPS 궤적 (사고 조사용).
+    - method=dp: Douglas-Peucker 단순화 (tolerance_m: 허용 오차 m)
+    - method=interval: interval_sec 간격마다 첫 점 (DB에서 축약)
+    - 최대 조회 기간: TRAJECTORY_MAX_HOURS (기본 24시간)
+    """
+    try:
+        data = await get_worker_trajectory(worker_id, start, end, method, tolerance_m, interval_sec, max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "data": data}
+
+@router.get("/zones/events", summary="구역 진입/이탈 이벤트 조회")
+async def get_zone_entry_exit_events(
+    project_id: int,
+    d: Optional[str] = None,
+    worker_id: Optional[int] = None,
+    zone_id: Optional[int] = None,
+    max_gap_sec: int = Query(300, ge=10, le=3600),
+):
+    """
+    프로젝트의 하루 구역 방문 목록 (진입 시각, 이탈 시각, 체류 초).
+    - max_gap_sec: 핑이 이 시간 이상 끊기면 이탈로 간주
+    """
+    target_date = dt_date.fromisoformat(d) if d else dt_date.today()
+    data = await get_zone_events(project_id, target_date, max_gap_sec, worker_id, zone_id)
+    return {"success": True, "data": data}
+
+@router.get("/zones/dwell", summary="구역별 체류 시간 집계")
+async def get_zone_dwell_times(
+    project_id: int,
+    d: Optional[str] = None,
+    worker_id: Optional[int] = None,
+    max_gap_sec: int = Query(300, ge=10, le=3600),
+):
+    """프로젝트의 하루 구역별 총 체류 시간/방문 수/방문 인원 (체류 시간 내림차순)"""
+    target_date = dt_date.fromisoformat(d) if d else dt_date.today()
+    data = await get_zone_dwell(project_id, target_date, max_gap_sec, worker_id)
+    return {"success": True, "data": data}
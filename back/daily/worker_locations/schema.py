@@ -1,12 +1,23 @@
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
+class BeaconReading(BaseModel):
+    """BLE 스캔 1건 (beacon_id 또는 uuid/major/minor 중 하나로 식별)"""
+    beacon_id: Optional[int] = Field(None, description="비콘 ID (PK)")
+    uuid: Optional[str] = Field(None, description="비콘 UUID")
+    major: Optional[int] = Field(None, description="Major ID")
+    minor: Optional[int] = Field(None, description="Minor ID")
+    rssi: Optional[int] = Field(None, description="신호 세기 (-dBm)")
+    distance: Optional[float] = Field(None, description="추정 거리 (m)")
+
 class WorkerLocationBase(BaseModel):
     """작업자 위치 전송 요청 기본 스키마"""
     worker_id: int = Field(..., description="작업자 ID (PK)")
     tracking_mode: str = Field(..., description="추적 모드 ('GPS' or 'BLE')", example="GPS")
+    project_id: Optional[int] = Field(None, description="프로젝트 ID (없으면 작업자 소속 프로젝트)")
+    level: Optional[str] = Field(None, description="층 정보 (예: '1F', 'B1'), 없으면 1F 기준")
     
     # GPS (tracking_mode='GPS')
     lat: Optional[float] = Field(None, description="위도 (GPS)")
@@ -16,6 +27,10 @@ class WorkerLocationBase(BaseModel):
     beacon_id: Optional[int] = Field(None, description="감지된 비콘 ID (PK)")
     rssi: Optional[int] = Field(None, description="신호 세기 (-dBm)")
     distance: Optional[float] = Field(None, description="추정 거리 (m)")
+    beacons: Optional[List[BeaconReading]] = Field(None, description="다중 비콘 스캔 결과 (BLE)")
+
+    # 단말에서 모아 보낸 핑(배치)의 측정 시각 (없으면 서버 수신 시각)
+    timestamp: Optional[datetime] = Field(None, description="측정 시각")
 
 class WorkerLocationCreate(WorkerLocationBase):
     """위치 정보 생성 DTO"""
@@ -24,8 +39,18 @@ class WorkerLocationCreate(WorkerLocationBase):
 class WorkerLocationResponse(BaseModel):
     """위치 정보 저장 결과 및 Zone 판별 응답"""
     success: bool
-    data_id: int
+    data_id: Optional[int] = Field(None, description="저장된 로그 ID (Write-Behind 버퍼 적재 시 null)")
     matched_zone_id: Optional[int] = Field(None, description="판별된 구역 ID (없으면 null)")
     matched_zone_name: Optional[str] = Field(None, description="판별된 구역 명칭 (예: '1F-A구역')")
     alert_level: Optional[str] = Field("SAFE", description="위험도 (SAFE, WARNING, DANGER)")
     message: Optional[str] = None
+
+class WorkerLocationBatchCreate(BaseModel):
+    """위치 정보 일괄 전송 DTO (게이트웨이/앱에서 여러 핑을 묶어 전송)"""
+    pings: List[WorkerLocationCreate] = Field(..., description="위치 핑 목록")
+
+class WorkerLocationBatchResponse(BaseModel):
+    """일괄 전송 결과 (핑 순서대로 Zone 판별 결과 포함)"""
+    success: bool
+    accepted: int
+    results: List[WorkerLocationResponse] = []
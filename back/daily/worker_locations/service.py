@@ -1,96 +1,214 @@
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from typing import Optional, Tuple
-from sqlalchemy import text
-from back.project.locations.model import project_zones
-from back.device.beacons.model import device_beacons
-from back.daily.worker_locations.model import daily_worker_locations
-
-async def calculate_current_zone(db: AsyncSession, lat: Optional[float], lng: Optional[float]) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple, List
+from back.daily.worker_locations.buffer import location_write_buffer
+from back.daily.worker_locations.partitions import location_partition_manager
+from back.daily.worker_locations.repository import worker_locations_repository
+from back.daily.worker_locations.trajectory import radial_filter, douglas_peucker, strip_projection
+from back.daily.worker_locations.geofence import geofence_engine
+from back.device.beacons.registry import beacon_registry
+from back.utils.websocket_manager import worker_position_manager
+from back.utils.date_utils import get_now, format_to_datetime_str, to_local_naive
+
+async def calculate_current_zone(project_id: Optional[int], lat: Optional[float], lng: Optional[float], level: Optional[str] = None) -> Tuple[Optional[int], Optional[str], Optional[str]]:
     """
     [Geofencing] GPS 좌표가 어떤 Zone(구역)에 포함되는지 계산.
-    현재는 project_zones에 절대 좌표가 없으므로 추후 구현 예정.
+    - 메모리에 올린 프로젝트 회전 격자로 셀 계산 (핑당 DB 조회 없음)
+    - level 미지정 시 지상 1층 기준
     """
-    if lat is None or lng is None:
+    if lat is None or lng is None or project_id is None:
         return None, None, "UNKNOWN"
 
-        
-    # # 실제로는 PostGIS 같은 공간 DB를 써야 하지만, 여기서는 단순 사각형(MBR) 포함 여부로 간단히 구현
-    # # 가정: project_zones 테이블에 lat_min, lat_max, lng_min, lng_max 컬럼이 있다고 가정하거나,
-    # #       points(JSON) 필드를 파싱해야 함.
-    # #       현재는 'points' 필드(JSON)에 [[lat, lng], ...] 형태로 저장되어 있다고 가정.
-    
-    # query = select(project_zones).where(project_zones.is_active == True)
-    # result = await db.execute(query)
-    # zones = result.scalars().all()
-
-    # for zone in zones:
-    #     # JSON 포인트 데이터 파싱 (예: "[[37.1, 127.1], [37.2, 127.2], ...]")
-    #     # 실제 구현에선 points 데이터 구조에 따라 파싱 로직 필요
-    #     # 여기서는 임시로 '가장 단순한 거리 계산'으로 근접 Zone 찾기 (반경 20m 이내)
-    #     # (Zone의 중심점 center_lat, center_lng가 있다고 가정하거나, points의 첫 번째 점 사용)
-        
-    #     if not zone.points:
-    #         continue
-            
-    #     try:
-    #         # Points가 문자열이면 JSON 파싱, 리스트면 그대로 사용
-    #         import json
-    #         points = json.loads(zone.points) if isinstance(zone.points, str) else zone.points
-            
-    #         if not points or len(points) < 1:
-    #             continue
-
-    #         # 임시: 첫 번째 점(기준점)과의 거리 계산 (유클리드 거리 근사치)
-    #         # 0.0001도 약 11m (위도 기준)
-    #         # 반경 0.0002도 (약 20m) 이내면 진입으로 간주
-    #         center_lat, center_lng = points[0][0], points[0][1]
-            
-    #         if abs(lat - center_lat) < 0.0002 and abs(lng - center_lng) < 0.0002:
-    #             # 위험 구역인지 확인 (daily_danger_zones 테이블 조회 필요하지만 일단 Zone 속성으로 판단)
-    #             return zone.id, zone.name, "WARNING" if "위험" in zone.name else "SAFE"
-                
-    #     except Exception as e:
-    #         print(f"[Zone Check Error] {e}")
-    #         continue
-
-    # TODO: 추후 project_zones의 lat/lng가 채워지거나, project_master 기준 상대좌표 계산 로직 구현 필요
-    # 현재는 안전하게 None 리턴 (Zone 매핑 없음)
-    return None, None, "SAFE"
-
-async def create_worker_location(db: AsyncSession, location_data):
-    """위치 정보 저장"""
-    
-    # 1. Zone 판별 (추후 로직 활성화 시 사용)
+    hit = await geofence_engine.locate(project_id, lat, lng, level)
+    if hit is None:
+        return None, None, "SAFE"  # 현장 격자 밖
+    return hit
+
+async def calculate_beacon_zone(worker_id: int, location_data) -> Tuple[Optional[int], Optional[str], Optional[str], Optional[int], Optional[float], Optional[int]]:
+    """
+    [BLE] 비콘 판독값으로 구역 판별 (메모리 레지스트리 사용, 핑당 DB 조회 없음)
+    :return: (zone_id, zone_name, alert_level, beacon_id, distance, project_id)
+    """
+    if location_data.beacons:
+        readings = [b.model_dump() for b in location_data.beacons]
+    elif location_data.beacon_id is not None:
+        readings = [{"beacon_id": location_data.beacon_id, "rssi": location_data.rssi, "distance": location_data.distance}]
+    else:
+        return None, None, "UNKNOWN", None, None, None
+
+    hit = await beacon_registry.resolve(worker_id, readings)
+    if hit is None:
+        return None, None, "SAFE", location_data.beacon_id, location_data.distance, None
+
+    alert = await geofence_engine.zone_alert(hit["project_id"], hit["zone_id"], hit["zone_type"])
+    return hit["zone_id"], hit["zone_name"], alert, hit["beacon_id"], hit["distance"], hit["project_id"]
+
+async def _resolve_ping(location_data):
+    """핑 1건의 Zone 판별 후 (저장용 row, 응답) 반환 - 저장할 수 없는 시각이면 row는 None"""
+    timestamp = to_local_naive(location_data.timestamp) if location_data.timestamp else get_now()
+    if not location_partition_manager.accepts(timestamp):
+        # 기기 시계 오류 등으로 파티션 범위(보관기간~선생성 기간)를 벗어난 시각
+        return None, {
+            "success": False,
+            "data_id": None,
+            "matched_zone_id": None,
+            "matched_zone_name": None,
+            "alert_level": "UNKNOWN",
+            "message": f"측정 시각이 허용 범위를 벗어났습니다 ({format_to_datetime_str(timestamp)})"
+        }
+
     mapped_zone_id = None
     alert_level = "SAFE"
     zone_name = None
-    
-    if location_data.tracking_mode == "GPS":
-        mapped_zone_id, zone_name, alert_level = await calculate_current_zone(db, location_data.lat, location_data.lng)
-    
-    # 2. DB 저장
-    new_log = daily_worker_locations(
-        worker_id=location_data.worker_id,
-        tracking_mode=location_data.tracking_mode,
-        lat=location_data.lat,
-        lng=location_data.lng,
-        beacon_id=location_data.beacon_id,
-        rssi=location_data.rssi,
-        distance=location_data.distance,
-        zone_id=mapped_zone_id # 판별된 구역
-    )
-    
-    db.add(new_log)
-    await db.commit()
-    await db.refresh(new_log)
-    
-    return {
+    project_id = location_data.project_id
+    beacon_id = location_data.beacon_id
+    distance = location_data.distance
+
+    if location_data.tracking_mode == "BLE":
+        mapped_zone_id, zone_name, alert_level, beacon_id, distance, beacon_project_id = await calculate_beacon_zone(
+            location_data.worker_id, location_data
+        )
+        project_id = project_id or beacon_project_id
+    elif location_data.tracking_mode == "GPS":
+        project_id = project_id or await geofence_engine.resolve_project(location_data.worker_id)
+        mapped_zone_id, zone_name, alert_level = await calculate_current_zone(
+            project_id, location_data.lat, location_data.lng, location_data.level
+        )
+
+    row = {
+        "worker_id": location_data.worker_id,
+        "tracking_mode": location_data.tracking_mode,
+        "lat": location_data.lat,
+        "lng": location_data.lng,
+        "beacon_id": beacon_id,  # 다중 스캔 시 판별 구역의 최근접 비콘
+        "rssi": location_data.rssi,
+        "distance": distance,
+        "zone_id": mapped_zone_id,  # 판별된 구역
+        "timestamp": timestamp
+    }
+    result = {
         "success": True,
-        "data_id": new_log.id,
+        "data_id": None,
         "matched_zone_id": mapped_zone_id,
         "matched_zone_name": zone_name,
         "alert_level": alert_level,
-        "message": f"위치 저장 완료 (Zone: {zone_name})" if zone_name else "위치 저장 완료 (Zone 미감지)"
+        "message": f"위치 수신 완료 (Zone: {zone_name})" if zone_name else "위치 수신 완료 (Zone 미감지)"
     }
+
+    # 관제 지도 실시간 전송 (tick 단위로 모아서 전송되므로 여기서는 대기 없음)
+    if project_id is not None:
+        worker_position_manager.publish(project_id, row["worker_id"], {
+            "worker_id": row["worker_id"],
+            "tracking_mode": row["tracking_mode"],
+            "lat": row["lat"],
+            "lng": row["lng"],
+            "zone_id": mapped_zone_id,
+            "zone_name": zone_name,
+            "alert_level": alert_level,
+            "timestamp": format_to_datetime_str(row["timestamp"])
+        })
+    return row, result
+
+async def create_worker_location(location_data):
+    """위치 정보 저장 (Write-Behind 버퍼에 적재 후 즉시 응답)"""
+    row, result = await _resolve_ping(location_data)
+    if row is not None:
+        location_write_buffer.add([row])
+    return result
+
+async def create_worker_locations_batch(pings: List):
+    """위치 정보 일괄 저장 (여러 핑을 한 번에 판별 후 버퍼에 적재)"""
+    rows = []
+    results = []
+    for ping in pings:
+        row, result = await _resolve_ping(ping)
+        if row is not None:
+            rows.append(row)
+        results.append(result)
+
+    location_write_buffer.add(rows)
+    return {"success": True, "accepted": len(rows), "results": results}
+
+# === 위치 이력 조회 (궤적/체류) ===
+TRAJECTORY_MAX_HOURS = int(os.getenv("TRAJECTORY_MAX_HOURS", "24"))  # 궤적 조회 최대 기간
+ZONE_EVENTS_MAX = int(os.getenv("ZONE_EVENTS_MAX", "20000"))  # 진입/이탈 이벤트 응답 최대 건수
+
+def _day_range(d: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(d, time.min)
+    return start, start + timedelta(days=1)
+
+async def get_worker_trajectory(worker_id: int, start: datetime, end: datetime, method: str = "dp",
+                                tolerance_m: float = 3.0, interval_sec: int = 10, max_points: int = 2000):
+    """
+    작업자 궤적 (축약 후 반환, 원본 핑을 메모리에 모두 올리지 않음)
+    - method=interval: DB에서 interval_sec 마다 첫 점만 선택, max_points 초과분은 읽지 않음 (truncated)
+    - method=dp: 스트리밍 거리 필터(tolerance/2) 후 Douglas-Peucker(tolerance),
+      max_points 초과 시 tolerance를 2배씩 늘려 재단순화
+    """
+    # timezone 포함 ISO 문자열(…Z, +09:00)은 로컬 naive로 변환 (timestamp 컬럼 바인딩, naive/aware 비교 오류 방지)
+    start, end = to_local_naive(start), to_local_naive(end)
+    if end <= start:
+        raise ValueError("end must be after start")
+    if end - start > timedelta(hours=TRAJECTORY_MAX_HOURS):
+        raise ValueError(f"조회 기간은 최대 {TRAJECTORY_MAX_HOURS}시간입니다.")
+
+    truncated = False
+    if method == "interval":
+        points = []
+        rows = worker_locations_repository.stream_trajectory(worker_id, start, end, max(1, interval_sec))
+        try:
+            async for row in rows:
+                if len(points) >= max_points:
+                    truncated = True
+                    break
+                points.append(row)
+        finally:
+            await rows.aclose()
+        source_count = len(points)
+    else:
+        rows = worker_locations_repository.stream_trajectory(worker_id, start, end)
+        try:
+            filtered = await radial_filter(rows, tolerance_m / 2)
+        finally:
+            await rows.aclose()
+        source_count = len(filtered)
+        points = douglas_peucker(filtered, tolerance_m)
+        while len(points) > max_points:
+            tolerance_m *= 2
+            points = douglas_peucker(points, tolerance_m)
+        strip_projection(points)
+
+    return {
+        "worker_id": worker_id,
+        "start": start,
+        "end": end,
+        "method": method,
+        "tolerance_m": tolerance_m if method != "interval" else None,
+        "source_count": source_count,
+        "count": len(points),
+        "truncated": truncated,
+        "points": points,
+    }
+
+async def get_zone_events(project_id: int, d: date, max_gap_sec: int = 300,
+                          worker_id: Optional[int] = None, zone_id: Optional[int] = None):
+    """프로젝트 하루 구역 진입/이탈 이벤트 (방문 1건 = entered_at ~ exited_at)"""
+    start, end = _day_range(d)
+    events = []
+    truncated = False
+    rows = worker_locations_repository.stream_zone_visits(project_id, start, end, max_gap_sec, worker_id, zone_id)
+    try:
+        async for row in rows:
+            if len(events) >= ZONE_EVENTS_MAX:
+                truncated = True
+                break
+            events.append(row)
+    finally:
+        await rows.aclose()
+    return {"count": len(events), "truncated": truncated, "events": events}
+
+async def get_zone_dwell(project_id: int, d: date, max_gap_sec: int = 300, worker_id: Optional[int] = None):
+    """프로젝트 하루 구역별 체류 시간 집계"""
+    start, end = _day_range(d)
+    return await worker_locations_repository.get_zone_dwell(project_id, start, end, max_gap_sec, worker_id)
@@ -0,0 +1,73 @@
+import math
+from typing import AsyncIterator, List, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+
+class LocalProjection:
+    """기준점 주변 위경도 → 평면 좌표(m) 변환 (equirectangular, 현장 규모에서 오차 무시 가능)"""
+    def __init__(self, lat0: float, lng0: float):
+        self.lat0 = lat0
+        self.lng0 = lng0
+        self.kx = math.cos(math.radians(lat0)) * math.pi / 180 * EARTH_RADIUS_M
+        self.ky = math.pi / 180 * EARTH_RADIUS_M
+
+    def xy(self, lat: float, lng: float) -> Tuple[float, float]:
+        return (lng - self.lng0) * self.kx, (lat - self.lat0) * self.ky
+
+async def radial_filter(rows: AsyncIterator[dict], min_distance_m: float) -> List[dict]:
+    """
+    스트리밍 1차 축약: 직전 유지 점에서 min_distance_m 이내인 점은 버림 (정지 구간 제거)
+    - 첫 점과 마지막 점은 항상 유지, 각 점에 평면 좌표(_x, _y) 부여
+    """
+    kept: List[dict] = []
+    projection = None
+    last = None
+    pending_last = None
+    min_sq = min_distance_m * min_distance_m
+    async for row in rows:
+        if projection is None:
+            projection = LocalProjection(row["lat"], row["lng"])
+        row["_x"], row["_y"] = projection.xy(row["lat"], row["lng"])
+        if last is None or (row["_x"] - last["_x"]) ** 2 + (row["_y"] - last["_y"]) ** 2 >= min_sq:
+            kept.append(row)
+            last = row
+            pending_last = None
+        else:
+            pending_last = row
+    if pending_last is not None:
+        kept.append(pending_last)
+    return kept
+
+def _segment_distance(p: dict, a: dict, b: dict) -> float:
+    dx, dy = b["_x"] - a["_x"], b["_y"] - a["_y"]
+    if dx == 0 and dy == 0:
+        return math.hypot(p["_x"] - a["_x"], p["_y"] - a["_y"])
+    t = ((p["_x"] - a["_x"]) * dx + (p["_y"] - a["_y"]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(p["_x"] - (a["_x"] + t * dx), p["_y"] - (a["_y"] + t * dy))
+
+def douglas_peucker(points: List[dict], tolerance_m: float) -> List[dict]:
+    """Douglas-Peucker 경로 단순화 (반복 구현, 재귀 깊이 제한 없음) - 점에는 _x, _y가 있어야 함"""
+    if len(points) <= 2:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist, index = 0.0, -1
+        for i in range(start + 1, end):
+            d = _segment_distance(points[i], points[start], points[end])
+            if d > max_dist:
+                max_dist, index = d, i
+        if index != -1 and max_dist > tolerance_m:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [p for p, k in zip(points, keep) if k]
+
+def strip_projection(points: List[dict]) -> List[dict]:
+    for p in points:
+        p.pop("_x", None)
+        p.pop("_y", None)
+    return points
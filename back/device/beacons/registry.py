@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from back.device.beacons.repository import beacons_repository
+
+# 로그-거리 경로 손실 모델 기본값 (1m 기준 RSSI, 실내 감쇠 지수)
+DEFAULT_TX_POWER = -59
+DEFAULT_PATH_LOSS = 2.0
+
+def estimate_distance(rssi: float, tx_power: float = DEFAULT_TX_POWER, n: float = DEFAULT_PATH_LOSS) -> float:
+    """RSSI -> 추정 거리(m)"""
+    return 10 ** ((tx_power - rssi) / (10 * n))
+
+class BeaconRegistry:
+    """
+    [BLE] 비콘 레지스트리 + 작업자별 RSSI 평활화
+    - device_beacons(uuid/major/minor -> zone)를 메모리에 적재, 핑마다 조회하지 않음
+    - 비콘 등록/삭제, 구역 삭제 시 invalidate() (DB 직접 수정 대비 reload_interval 주기 재적재)
+      attach(broker) 후에는 무효화를 브로커로 발행 → 모든 프로세스가 다음 판별 시 재적재
+    - (작업자, 비콘)별 최근 RSSI를 링 버퍼(window)로 보관해 이동 평균
+    - 여러 비콘 판독값을 구역별 1/d² 가중 합으로 집계해 가장 가까운 구역 판별
+      (비콘 좌표가 없어 기하학적 삼변측량 대신 구역 단위 가중 판별)
+    """
+    CHANNEL = "beacon_registry"
+
+    def __init__(self, window: int = 5, stale_after: float = 30.0, reload_interval: float = 300.0):
+        self.window = window
+        self.stale_after = stale_after
+        self.reload_interval = reload_interval
+        self.by_id: Dict[int, dict] = {}
+        self.by_key: Dict[Tuple[str, int, int], dict] = {}
+        self.loaded_at: Optional[float] = None
+        self.version = 0
+        self._invalidations = 0  # 적재 중 도착한 무효화 감지용
+        self._lock = asyncio.Lock()
+        # (worker_id, beacon_id) -> (RSSI 링 버퍼, 마지막 수신 시각)
+        self.rssi_windows: Dict[Tuple[int, int], Tuple[Deque[int], float]] = {}
+        self._evicted_at = time.monotonic()
+        self.broker = None
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 (startup에서 broker.start() 전에 호출)"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+
+    async def _on_broker_message(self, payload: dict):
+        self._invalidate()
+
+    def _invalidate(self):
+        self.loaded_at = None
+        self._invalidations += 1
+
+    async def ensure_loaded(self):
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.reload_interval:
+            return
+        async with self._lock:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.reload_interval:
+                return
+            invalidations = self._invalidations
+            rows = await beacons_repository.get_all()
+            self.by_id = {r["id"]: r for r in rows}
+            self.by_key = {(r["uuid"].lower(), r["major"], r["minor"]): r for r in rows}
+            # 조회 도중 무효화됐으면 변경 전 목록일 수 있으므로 다음 판별 시 다시 적재
+            self.loaded_at = time.monotonic() if invalidations == self._invalidations else None
+            self.version += 1
+
+    async def invalidate(self):
+        """다음 판별 시 레지스트리 재적재 (모든 프로세스)"""
+        self._invalidate()
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {})
+
+    def lookup(self, reading: dict) -> Optional[dict]:
+        if reading.get("beacon_id") is not None:
+            return self.by_id.get(reading["beacon_id"])
+        if reading.get("uuid") is not None:
+            return self.by_key.get((reading["uuid"].lower(), reading.get("major"), reading.get("minor")))
+        return None
+
+    def smooth_rssi(self, worker_id: int, beacon_id: int, rssi: int, now: float) -> float:
+        key = (worker_id, beacon_id)
+        entry = self.rssi_windows.get(key)
+        if entry is None or now - entry[1] > self.stale_after:
+            buf: Deque[int] = deque(maxlen=self.window)
+        else:
+            buf = entry[0]
+        buf.append(rssi)
+        self.rssi_windows[key] = (buf, now)
+        return sum(buf) / len(buf)
+
+    def evict_stale(self):
+        """오래 수신되지 않은 RSSI 버퍼 정리 (메모리 상한 유지)"""
+        limit = time.monotonic() - self.stale_after
+        for key in [k for k, v in self.rssi_windows.items() if v[1] < limit]:
+            del self.rssi_windows[key]
+
+    async def resolve(self, worker_id: int, readings: List[dict]) -> Optional[dict]:
+        """
+        비콘 판독값 목록 -> 구역 판별
+        :return: {zone_id, zone_name, zone_type, project_id, beacon_id, distance} 또는 None
+        """
+        await self.ensure_loaded()
+        now = time.monotonic()
+        if now - self._evicted_at > self.stale_after:
+            self.evict_stale()
+            self._evicted_at = now
+
+        zone_weights: Dict[int, float] = {}
+        nearest: Dict[int, Tuple[float, dict]] = {}
+        for reading in readings:
+            beacon = self.lookup(reading)
+            if beacon is None or beacon["zone_id"] is None:
+                continue
+
+            if reading.get("rssi") is not None:
+                distance = estimate_distance(self.smooth_rssi(worker_id, beacon["id"], reading["rssi"], now))
+            elif reading.get("distance") is not None:
+                distance = reading["distance"]
+            else:
+                continue
+
+            distance = max(distance, 0.1)
+            zone_id = beacon["zone_id"]
+            zone_weights[zone_id] = zone_weights.get(zone_id, 0.0) + 1 / (distance * distance)
+            if zone_id not in nearest or distance < nearest[zone_id][0]:
+                nearest[zone_id] = (distance, beacon)
+
+        if not zone_weights:
+            return None
+
+        zone_id = max(zone_weights, key=zone_weights.get)
+        distance, beacon = nearest[zone_id]
+        return {
+            "zone_id": zone_id,
+            "zone_name": beacon["zone_name"],
+            "zone_type": beacon["zone_type"],
+            "project_id": beacon["project_id"],
+            "beacon_id": beacon["id"],
+            "distance": round(distance, 2),
+        }
+
+# 싱글톤 인스턴스
+beacon_registry = BeaconRegistry()
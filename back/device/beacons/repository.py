@@ -0,0 +1,32 @@
+
+from back.database import fetch_all, insert_and_return
+
+class beacons_repository:
+    """[DEVICE_BEACONS] 비콘 장비 데이터 접근"""
+    @staticmethod
+    async def get_all():
+        """비콘 + 설치 구역 정보 (레지스트리 적재용)"""
+        sql = """
+            SELECT b.id, b.uuid, b.major, b.minor, b.zone_id, b.description, b.mac_address,
+                   z.name as zone_name, z.level, z.zone_type, z.project_id
+            FROM device_beacons b
+            LEFT JOIN project_zones z ON b.zone_id = z.id
+            ORDER BY b.id
+        """
+        return await fetch_all(sql)
+
+    @staticmethod
+    async def create(data: dict):
+        sql = """
+            INSERT INTO device_beacons (uuid, major, minor, zone_id, description, mac_address)
+            VALUES (:uuid, :major, :minor, :zone_id, :description, :mac_address)
+            RETURNING *
+        """
+        return await insert_and_return(sql, data)
+
+    @staticmethod
+    async def delete(beacon_id: int):
+        return await insert_and_return(
+            "DELETE FROM device_beacons WHERE id = :id RETURNING id",
+            {"id": beacon_id}
+        )
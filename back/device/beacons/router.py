@@ -0,0 +1,40 @@
+
+from fastapi import APIRouter, HTTPException
+from back.device.beacons.repository import beacons_repository
+from back.device.beacons.registry import beacon_registry
+
+router = APIRouter()
+
+@router.get("")
+async def list_beacons():
+    data = await beacons_repository.get_all()
+    return {"success": True, "data": data}
+
+@router.post("")
+async def create_beacon(data: dict):
+    """비콘 등록 (uuid, major, minor, zone_id, description, mac_address)"""
+    beacon = await beacons_repository.create({
+        "uuid": data["uuid"],
+        "major": int(data["major"]),
+        "minor": int(data["minor"]),
+        "zone_id": data.get("zone_id"),
+        "description": data.get("description"),
+        "mac_address": data.get("mac_address")
+    })
+    await beacon_registry.invalidate()
+    return {"success": True, "data": beacon}
+
+@router.delete("/{beacon_id}")
+async def delete_beacon(beacon_id: int):
+    deleted = await beacons_repository.delete(beacon_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="비콘을 찾을 수 없습니다.")
+    await beacon_registry.invalidate()
+    return {"success": True, "message": "비콘이 삭제되었습니다."}
+
+@router.post("/reload")
+async def reload_registry():
+    """DB 직접 수정 후 비콘 레지스트리 즉시 재적재"""
+    await beacon_registry.invalidate()
+    await beacon_registry.ensure_loaded()
+    return {"success": True, "data": {"count": len(beacon_registry.by_id), "version": beacon_registry.version}}
@@ -11,17 +11,41 @@ from back.content.danger_info.router import router as danger_info_router
 from back.daily.attendance.router import router as attendance_router
 from back.daily.notices.router import router as notices_router
 from back.daily.task_plans.router import router as task_plans_router
-from back.daily.safety_logs.router import router as safety_logs_router
+from back.daily.safety_logs.router import router as safety_logs_router, uploads_router as danger_uploads_router
 from back.daily.worker_locations.router import router as worker_locations_router
 from back.content.safety_info.router import router as safety_info_router
 from back.manager.router import router as manager_router
 from back.admin.router import router as admin_router
+from back.device.beacons.router import router as beacons_router
+from back.project.locations.map_router import router as map_router
+from back.daily.worker_locations.buffer import location_write_buffer
+from back.daily.worker_locations.partitions import location_partition_manager
+from back.daily.worker_locations.geofence import geofence_engine
+from back.device.beacons.registry import beacon_registry
+from back.daily.safety_logs.variants import danger_image_variants
+from back.daily.safety_logs.storage import danger_image_store
+from back.utils.websocket_manager import worker_position_manager
+from back.utils.sse_manager import sse_notice_manager
+from back.utils.broker import broker
+from back.project.locations.snapshot import zone_snapshot_store
+from back.utils.versioning import resource_versions
+from back.database import DBRequestScopeMiddleware
+from back.utils.upload_utils import UploadBodyLimitMiddleware
 
-from fastapi.staticfiles import StaticFiles
+from back.utils.static_files import ImmutableStaticFiles
 
 app = FastAPI(title="Smart Security API")
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# 위험 구역 사진이 원격(S3) 저장소에 있으면 서명 URL 리다이렉트 (같은 경로이므로 마운트보다 먼저 등록)
+if not danger_image_store.is_local:
+    app.include_router(danger_uploads_router)
+app.mount("/uploads", ImmutableStaticFiles(directory="uploads"), name="uploads")
+
+# 요청 단위 DB 연결 공유 (헬퍼 호출마다 checkout하지 않음)
+app.add_middleware(DBRequestScopeMiddleware)
+
+# 업로드 요청 본문 크기 제한 (임시 파일로 다 받기 전에 413)
+app.add_middleware(UploadBodyLimitMiddleware)
 
 # CORS 해결: allow_origins를 와일드카드(*) 대신 실제 주소로 명시
 app.add_middleware(
@@ -46,6 +70,7 @@ app.include_router(companies_router, prefix="/api/sys/companies", tags=["SYS_Com
 # [PROJECT]
 app.include_router(project_router, prefix="/api/project/master", tags=["Project_Master"])
 app.include_router(locations_router, prefix="/api/project/locations", tags=["Project_Locations"])
+app.include_router(map_router, prefix="/api/project/map", tags=["Project_Map"])
 
 # [CONTENT]
 app.include_router(work_info_router, prefix="/api/content/work_info", tags=["Content_WorkInfo"])
@@ -59,6 +84,42 @@ app.include_router(task_plans_router, prefix="/api/daily/task_plans", tags=["Dai
 app.include_router(safety_logs_router, prefix="/api/daily/safety_logs", tags=["Daily_SafetyLogs"])
 app.include_router(manager_router, prefix="/api/manager", tags=["Manager"])
 app.include_router(admin_router, prefix="/api/admin", tags=["Admin"])
+app.include_router(worker_locations_router)  # prefix: /api/daily/worker/location
+
+# [DEVICE]
+app.include_router(beacons_router, prefix="/api/device/beacons", tags=["Device_Beacons"])
+
+@app.on_event("startup")
+async def on_startup():
+    # 실시간 푸시 매니저를 Pub/Sub 브로커에 연결 (PUBSUB_BACKEND=postgres 시 다중 워커/노드 간 전달)
+    sse_notice_manager.attach(broker)
+    notice_ws_manager.attach(broker)
+    worker_position_manager.attach(broker)
+    zone_snapshot_store.attach(broker)
+    resource_versions.attach(broker)
+    geofence_engine.attach(broker)
+    beacon_registry.attach(broker)
+    await broker.start()
+    # 위치 로그 파티션 생성/보관기간 정리 (첫 flush 전에 오늘 파티션 보장)
+    await location_partition_manager.start()
+    # 위치 로그 Write-Behind 버퍼 주기 flush 시작
+    location_write_buffer.start()
+    # 관제 지도 위치 delta 주기 전송 시작
+    worker_position_manager.start()
+    # 위험 구역 사진 파생 이미지(썸네일/중간 크기) 생성 시작
+    await danger_image_variants.start()
+    # 위험 구역 사진 저장소 지연 GC 시작
+    danger_image_store.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # 종료 전 버퍼에 남은 위치 로그 저장
+    await location_write_buffer.stop()
+    await location_partition_manager.stop()
+    await danger_image_variants.stop()
+    await danger_image_store.stop()
+    await worker_position_manager.stop()
+    await broker.stop()
 
 @app.get("/")
 async def root():
@@ -2,6 +2,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from back.database import fetch_all, execute
+from back.daily.worker_locations.geofence import geofence_engine
+from back.project.master.service import master_service
 
 router = APIRouter()
 
@@ -64,14 +66,13 @@ async def get_companies(project_id: int):
 async def approve_or_reject_worker(req: WorkerApprovalRequest):
     """작업자 프로젝트 투입 승인/거절"""
     # [수정] 요청 바디에서 project_id를 가져옴
-    
     if req.action == "approve":
         await execute("""
             UPDATE project_users 
             SET status = 'ACTIVE', joined_at = NOW()
             WHERE project_id = :pid AND user_id = :uid
         """, {"pid": req.project_id, "uid": req.user_id})
-        return {"success": True, "message": "작업자가 승인되었습니다."}
+        message = "작업자가 승인되었습니다."
     
     elif req.action == "reject":
         await execute("""
@@ -79,7 +80,12 @@ async def approve_or_reject_worker(req: WorkerApprovalRequest):
             SET status = 'REJECTED'
             WHERE project_id = :pid AND user_id = :uid
         """, {"pid": req.project_id, "uid": req.user_id})
-        return {"success": True, "message": "작업자가 거절되었습니다."}
+        message = "작업자가 거절되었습니다."
     
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
+
+    # 변경 반영 후 캐시 무효화 (먼저 지우면 그 사이 조회가 변경 전 데이터를 다시 캐시함)
+    await geofence_engine.forget_worker(req.user_id)  # 위치 판별용 소속 프로젝트 매핑 갱신
+    master_service.invalidate_detail(req.project_id)  # 대시보드 상세 캐시 갱신
+    return {"success": True, "message": message}
@@ -1,10 +1,11 @@
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
-import shutil
 import os
 import uuid
 from typing import List, Optional
 from back.project.locations.schema import RiskZone, WorkerBox
+from back.utils.websocket_manager import worker_position_manager
+from back.utils.upload_utils import save_upload_stream, UploadTooLarge
 
 router = APIRouter()
 
@@ -25,11 +26,12 @@ async def upload_blueprint(file: UploadFile = File(...)):
         save_path = f"back/static/blueprints/{filename}"
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
         
-        with open(save_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await save_upload_stream(file, save_path)
             
         current_blueprint_url = f"/static/blueprints/{filename}"
         return {"url": current_blueprint_url}
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -38,30 +40,17 @@ async def get_blueprint():
     return {"url": current_blueprint_url}
 
 # --- WebSocket 관리자 ---
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try: await connection.send_json(message)
-            except: pass
-
-manager = ConnectionManager()
+# 위치 수신 경로(worker_locations)와 공유하도록 utils의 싱글톤 사용
+manager = worker_position_manager
 
 @router.websocket("/ws/workers")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, project_id: Optional[int] = None):
+    """작업자 실시간 위치 구독 (project_id 미지정 시 전체 프로젝트)"""
+    await manager.connect(websocket, project_id)
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
+    finally:
+        manager.disconnect(websocket, project_id)
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, JSON
 from back.database import Base
 
 
@@ -15,3 +15,4 @@ class project_zones(Base):
     zone_type = Column(String, default="NORMAL") # NORMAL, DANGER, RESTRICTED
     lat = Column(Float, nullable=True)
     lng = Column(Float, nullable=True)
+    points = Column(JSON, nullable=True, comment="비정형 구역 폴리곤 [[lat, lng], ...] (크레인 반경 등)")
@@ -1,6 +1,8 @@
 
-from back.database import fetch_all, fetch_one
+from back.database import fetch_all, fetch_one, insert_and_return
 from datetime import date as date_type
+from typing import Dict, List, Optional
+from back.content.catalog import work_info_catalog, danger_info_catalog
 
 class locations_repository:
     """[PROJECT_LOCATIONS] 프로젝트·구역 데이터 접근 (project_sites 미사용, project_master + project_zones만 사용)"""
@@ -16,19 +18,35 @@ class locations_repository:
         )
     
     @staticmethod
-    async def get_zones_with_details(pid: int, target_date):
-        """구역별 작업, 작업자, 위험요소 통합 조회"""
-        if isinstance(target_date, str):
-            target_date = date_type.fromisoformat(target_date)
-        
-        # 1. 모든 구역 조회
-        zones = await fetch_all(
-            "SELECT * FROM project_zones WHERE project_id = :pid ORDER BY level, row_index, col_index",
-            {"pid": pid}
+    async def get_zones_by_level(pid: int, level: str):
+        return await fetch_all(
+            "SELECT * FROM project_zones WHERE project_id = :pid AND level = :level",
+            {"pid": pid, "level": level}
         )
-        
-        # 2. 오늘의 작업 계획 조회 (JSON aggregation)
-        tasks_sql = """
+
+    @staticmethod
+    async def create_zone(data: dict):
+        """비정형(폴리곤) 구역 생성"""
+        sql = """
+            INSERT INTO project_zones (project_id, name, level, zone_type, points)
+            VALUES (:project_id, :name, :level, :zone_type, :points)
+            RETURNING *
+        """
+        return await insert_and_return(sql, data)
+
+    @staticmethod
+    async def delete_zone(zone_id: int):
+        """구역 삭제 (삭제된 행 반환, 없으면 None)"""
+        return await insert_and_return(
+            "DELETE FROM project_zones WHERE id = :id RETURNING id, project_id, level",
+            {"id": zone_id}
+        )
+
+    @staticmethod
+    async def get_zone_tasks(pid: int, target_date, zone_ids: Optional[List[int]] = None):
+        """구역별 작업 계획 + 투입 작업자 (zone_ids 지정 시 해당 구역만)"""
+        zone_filter = "AND dwt.zone_id = ANY(:zids)" if zone_ids is not None else ""
+        tasks_sql = f"""
             SELECT 
                 dwt.id as task_id,
                 dwt.zone_id, 
@@ -36,8 +54,6 @@ class locations_repository:
                 dwt.calculated_risk_score, 
                 dwt.status,
                 dwt.work_info_id,
-                wi.work_type,
-                COALESCE(wi.checklist_items, '[]'::json) as checklist_items,
                 COALESCE(
                     json_agg(
                         json_build_object(
@@ -50,18 +66,25 @@ class locations_repository:
                     '[]'::json
                 ) as workers
             FROM daily_work_plans dwt
-            LEFT JOIN content_work_info wi ON dwt.work_info_id = wi.id
             LEFT JOIN daily_worker_users dwu ON dwt.id = dwu.plan_id
             LEFT JOIN sys_users u ON dwu.worker_id = u.id
             LEFT JOIN sys_companies c ON u.company_id = c.id
-            WHERE dwt.project_id = :pid AND dwt.date = :date
-            GROUP BY dwt.id, dwt.zone_id, dwt.description, dwt.calculated_risk_score, dwt.status, wi.id, wi.work_type, wi.checklist_items::text
+            WHERE dwt.project_id = :pid AND dwt.date = :date {zone_filter}
+            GROUP BY dwt.id, dwt.zone_id, dwt.description, dwt.calculated_risk_score, dwt.status
         """
-        tasks = await fetch_all(tasks_sql, {"pid": pid, "date": target_date})
-        
-        # 3. 오늘의 위험 구역 조회
-        # 3. 오늘의 위험 구역 조회 (이미지 포함)
-        dangers_sql = """
+        tasks = await fetch_all(tasks_sql, {"pid": pid, "date": target_date, "zids": zone_ids})
+        # 공종명/점검항목은 콘텐츠 카탈로그 캐시에서 채움 (조인 제거)
+        return await work_info_catalog.enrich(
+            tasks, "work_info_id",
+            {"work_type": "work_type", "checklist_items": "checklist_items"},
+            defaults={"checklist_items": []}
+        )
+
+    @staticmethod
+    async def get_zone_dangers(pid: int, target_date, zone_ids: Optional[List[int]] = None):
+        """구역별 위험 구역 + 이미지 (zone_ids 지정 시 해당 구역만)"""
+        zone_filter = "AND ddz.zone_id = ANY(:zids)" if zone_ids is not None else ""
+        dangers_sql = f"""
             SELECT 
                 ddz.id,
                 ddz.zone_id, 
@@ -69,37 +92,50 @@ class locations_repository:
                 ddz.status,
                 ddz.risk_type,
                 ddz.danger_info_id,
-                COALESCE(di.danger_type, ddz.risk_type) as danger_type_label,
-                di.icon, 
-                di.color, 
-                di.risk_level, 
                 COALESCE(
                     json_agg(ddi.image_url) FILTER (WHERE ddi.image_url IS NOT NULL), 
                     '[]'::json
-                ) as images
+                ) as images,
+                -- 크기별 파일명 (파생 이미지 생성 전에는 원본으로 대체)
+                COALESCE(
+                    json_agg(json_build_object(
+                        'id', ddi.id,
+                        'original', ddi.image_url,
+                        'thumb', COALESCE(ddi.thumb_url, ddi.image_url),
+                        'medium', COALESCE(ddi.medium_url, ddi.image_url)
+                    ) ORDER BY ddi.id) FILTER (WHERE ddi.image_url IS NOT NULL),
+                    '[]'::json
+                ) as image_variants
             FROM daily_danger_zones ddz
-            LEFT JOIN content_danger_info di ON ddz.danger_info_id = di.id
             LEFT JOIN daily_danger_images ddi ON ddz.id = ddi.danger_zone_id
             WHERE ddz.zone_id IN (SELECT id FROM project_zones WHERE project_id = :pid) 
-            AND ddz.date = :date
-            GROUP BY ddz.id, di.id
+            AND ddz.date = :date {zone_filter}
+            GROUP BY ddz.id
         """
-        dangers = await fetch_all(dangers_sql, {"pid": pid, "date": target_date})
+        dangers = await fetch_all(dangers_sql, {"pid": pid, "date": target_date, "zids": zone_ids})
+        return await enrich_danger_info(dangers)
+
+    @staticmethod
+    async def get_zones_with_details(pid: int, target_date):
+        """구역별 작업, 작업자, 위험요소 통합 조회"""
+        if isinstance(target_date, str):
+            target_date = date_type.fromisoformat(target_date)
         
-        # 4. 구역별로 데이터 매핑
-        tasks_by_zone = {}
-        for task in tasks:
-            zone_id = task['zone_id']
-            if zone_id not in tasks_by_zone:
-                tasks_by_zone[zone_id] = []
-            tasks_by_zone[zone_id].append(task)
+        # 1. 모든 구역 조회
+        zones = await fetch_all(
+            "SELECT * FROM project_zones WHERE project_id = :pid ORDER BY level, row_index, col_index",
+            {"pid": pid}
+        )
         
-        dangers_by_zone = {}
-        for danger in dangers:
-            zone_id = danger['zone_id']
-            if zone_id not in dangers_by_zone:
-                dangers_by_zone[zone_id] = []
-            dangers_by_zone[zone_id].append(danger)
+        # 2. 오늘의 작업 계획 조회 (JSON aggregation)
+        tasks = await locations_repository.get_zone_tasks(pid, target_date)
+        
+        # 3. 오늘의 위험 구역 조회 (이미지 포함)
+        dangers = await locations_repository.get_zone_dangers(pid, target_date)
+        
+        # 4. 구역별로 데이터 매핑
+        tasks_by_zone = group_by_zone(tasks)
+        dangers_by_zone = group_by_zone(dangers)
         
         # 5. 구역에 데이터 추가
         for zone in zones:
@@ -107,3 +143,19 @@ class locations_repository:
             zone['dangers'] = dangers_by_zone.get(zone['id'], [])
         
         return zones
+
+async def enrich_danger_info(dangers: list) -> list:
+    """위험 요소 표시 정보(유형명/아이콘/색상/위험도)를 카탈로그 캐시에서 채움"""
+    await danger_info_catalog.enrich(
+        dangers, "danger_info_id",
+        {"danger_type_label": "danger_type", "icon": "icon", "color": "color", "risk_level": "risk_level"}
+    )
+    for danger in dangers:
+        danger["danger_type_label"] = danger["danger_type_label"] or danger.get("risk_type")
+    return dangers
+
+def group_by_zone(rows: list) -> Dict[int, list]:
+    grouped: Dict[int, list] = {}
+    for row in rows:
+        grouped.setdefault(row['zone_id'], []).append(row)
+    return grouped
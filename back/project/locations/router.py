@@ -1,9 +1,10 @@
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from typing import Optional
 from datetime import date
 from back.project.locations.service import locations_service
-from back.project.locations.repository import locations_repository
+from back.project.locations.snapshot import zone_snapshot_store
+from back.utils.http_cache import etag_matches
 
 router = APIRouter()
 
@@ -12,9 +13,29 @@ async def list_sites(project_id: int):
     return await locations_service.get_project_layout(project_id)
 
 @router.get("/{project_id}/zones/details")
-async def get_zones_with_details(project_id: int, date: Optional[str] = None):
-    """구역별 작업, 작업자, 위험요소 통합 조회"""
+async def get_zones_with_details(project_id: int, request: Request, date: Optional[str] = None):
+    """
+    구역별 작업, 작업자, 위험요소 통합 조회
+    - 미리 구성된 스냅샷 응답 사용, If-None-Match가 일치하면 304
+    """
     from datetime import date as date_type
-    target_date = date or str(date_type.today())
-    zones = await locations_repository.get_zones_with_details(project_id, target_date)
-    return {"success": True, "data": zones}
+    target_date = date_type.fromisoformat(date) if date else date_type.today()
+    snap = await zone_snapshot_store.get(project_id, target_date)
+    headers = {"ETag": snap.etag, "Cache-Control": "no-cache", "X-Snapshot-Version": str(snap.version)}
+    if etag_matches(request.headers.get("if-none-match"), snap.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snap.payload, media_type="application/json", headers=headers)
+
+@router.post("/{project_id}/zones")
+async def create_polygon_zone(project_id: int, data: dict):
+    """
+    비정형 구역(폴리곤) 등록 (크레인 반경, 출입 통제 구역 등)
+    - data: { name, level, zone_type, points: [[lat, lng], ...] }
+    """
+    zone = await locations_service.create_polygon_zone(project_id, data)
+    return {"success": True, "data": zone}
+
+@router.delete("/zones/{zone_id}")
+async def delete_zone(zone_id: int):
+    await locations_service.delete_zone(zone_id)
+    return {"success": True, "message": "구역이 삭제되었습니다."}
@@ -1,5 +1,10 @@
 
+import json
+from fastapi import HTTPException
 from back.project.locations.repository import locations_repository
+from back.daily.worker_locations.geofence import geofence_engine
+from back.device.beacons.registry import beacon_registry
+from back.project.locations.snapshot import zone_snapshot_store
 
 class locations_service:
     """[PROJECT_LOCATIONS] 비즈니스 로직 (프로젝트 1개 = 사이트 1개, 구역은 project_zones)"""
@@ -10,3 +15,31 @@ class locations_service:
             return []
         zones = await locations_repository.get_zones_by_project(pid)
         return [{"id": project["id"], "name": project["name"], "zones": zones}]
+
+    @staticmethod
+    async def create_polygon_zone(pid: int, data: dict):
+        """비정형 구역 등록 후 해당 층 공간 색인 갱신"""
+        points = data.get("points") or []
+        if len(points) < 3:
+            raise HTTPException(status_code=400, detail="폴리곤은 3개 이상의 좌표가 필요합니다.")
+
+        zone = await locations_repository.create_zone({
+            "project_id": pid,
+            "name": data["name"],
+            "level": data.get("level", "1F"),
+            "zone_type": data.get("zone_type", "RESTRICTED"),
+            "points": json.dumps([[float(p[0]), float(p[1])] for p in points])
+        })
+        await geofence_engine.on_zone_changed(pid, zone["level"])
+        await zone_snapshot_store.mark_project(pid)
+        return zone
+
+    @staticmethod
+    async def delete_zone(zone_id: int):
+        deleted = await locations_repository.delete_zone(zone_id)
+        if not deleted:
+            raise HTTPException(status_code=404, detail="구역을 찾을 수 없습니다.")
+        await geofence_engine.on_zone_changed(deleted["project_id"], deleted["level"])
+        await zone_snapshot_store.mark_project(deleted["project_id"])
+        await beacon_registry.invalidate()  # 설치 구역이 SET NULL 처리됨
+        return True
@@ -0,0 +1,163 @@
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import date
+from typing import Dict, Iterable, Optional, Set, Tuple
+from fastapi.encoders import jsonable_encoder
+from back.project.locations.repository import locations_repository, group_by_zone
+
+# 반영되지 않은 변경(다른 경로/외부 수정)에 대비한 전체 재구성 주기(초)
+ZONE_SNAPSHOT_MAX_AGE = float(os.getenv("ZONE_SNAPSHOT_MAX_AGE", "60"))
+ZONE_SNAPSHOT_MAX_ENTRIES = int(os.getenv("ZONE_SNAPSHOT_MAX_ENTRIES", "256"))
+
+class ZoneSnapshot:
+    """프로젝트 1개, 날짜 1개의 구역 현황 (구역 + 작업 + 작업자 + 위험요소)"""
+    __slots__ = ("project_id", "date", "zones", "zone_index", "dirty", "stale",
+                 "version", "payload", "etag", "built_at", "used_at")
+
+    def __init__(self, project_id: int, d: date):
+        self.project_id = project_id
+        self.date = d
+        self.zones: list = []
+        self.zone_index: Dict[int, dict] = {}
+        self.dirty: Set[int] = set()
+        self.stale = True
+        self.version = 0
+        self.payload: bytes = b""
+        self.etag = ""
+        self.built_at = 0.0
+        self.used_at = 0.0
+
+class ZoneSnapshotStore:
+    """
+    [관제 지도] 구역 현황 스냅샷 (프로젝트+날짜 단위, 메모리)
+    - 최초 조회 시 전체 구성, 이후 작업/작업자 배정/위험 구역 변경 시 해당 구역만 dirty 표시 후 부분 갱신
+    - 응답 JSON을 미리 직렬화해 두고 내용 해시로 ETag 생성 → 변경 없는 폴링은 304
+    - 변경 표시는 Pub/Sub 브로커로 전파 (다중 워커/노드에서도 동일하게 갱신)
+    """
+    CHANNEL = "zone_snapshot"
+
+    def __init__(self, max_age: float = ZONE_SNAPSHOT_MAX_AGE, max_entries: int = ZONE_SNAPSHOT_MAX_ENTRIES):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.snapshots: Dict[Tuple[int, date], ZoneSnapshot] = {}
+        self._locks: Dict[Tuple[int, date], asyncio.Lock] = {}
+        self.broker = None
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 (startup에서 broker.start() 전에 호출)"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+
+    async def _on_broker_message(self, payload: dict):
+        d = date.fromisoformat(payload["date"]) if payload.get("date") else None
+        if payload.get("zone_ids") is None:
+            self._mark_project(payload["project_id"], d)
+        else:
+            self._mark_zones(payload.get("project_id"), payload["zone_ids"], d)
+
+    async def get(self, project_id: int, d: date) -> ZoneSnapshot:
+        key = (project_id, d)
+        snap = self.snapshots.get(key)
+        if snap is not None and not snap.stale and not snap.dirty and time.monotonic() - snap.built_at < self.max_age:
+            snap.used_at = time.monotonic()
+            return snap
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            snap = self.snapshots.get(key)
+            if snap is None:
+                snap = ZoneSnapshot(project_id, d)
+                self._evict()
+                self.snapshots[key] = snap
+            if snap.stale or time.monotonic() - snap.built_at >= self.max_age:
+                await self._rebuild(snap)
+            elif snap.dirty:
+                await self._refresh_zones(snap)
+            snap.used_at = time.monotonic()
+        return snap
+
+    async def _rebuild(self, snap: ZoneSnapshot):
+        snap.dirty.clear()
+        snap.stale = False
+        zones = await locations_repository.get_zones_with_details(snap.project_id, snap.date)
+        snap.zones = zones
+        snap.zone_index = {z["id"]: z for z in zones}
+        self._serialize(snap)
+
+    async def _refresh_zones(self, snap: ZoneSnapshot):
+        """dirty 구역의 작업/위험요소만 다시 조회"""
+        zone_ids, snap.dirty = list(snap.dirty), set()
+        tasks = group_by_zone(await locations_repository.get_zone_tasks(snap.project_id, snap.date, zone_ids))
+        dangers = group_by_zone(await locations_repository.get_zone_dangers(snap.project_id, snap.date, zone_ids))
+        for zone_id in zone_ids:
+            zone = snap.zone_index.get(zone_id)
+            if zone is None:
+                continue
+            zone["tasks"] = tasks.get(zone_id, [])
+            zone["dangers"] = dangers.get(zone_id, [])
+        self._serialize(snap, rebuilt=False)
+
+    @staticmethod
+    def _serialize(snap: ZoneSnapshot, rebuilt: bool = True):
+        payload = json.dumps(
+            jsonable_encoder({"success": True, "data": snap.zones}),
+            ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        if payload != snap.payload:
+            snap.payload = payload
+            snap.etag = '"' + hashlib.blake2b(payload, digest_size=12).hexdigest() + '"'
+            snap.version += 1
+        if rebuilt:
+            snap.built_at = time.monotonic()
+
+    def _evict(self):
+        while len(self.snapshots) >= self.max_entries:
+            key = min(self.snapshots, key=lambda k: self.snapshots[k].used_at)
+            del self.snapshots[key]
+            self._locks.pop(key, None)
+
+    def _targets(self, project_id: Optional[int], d: Optional[date]):
+        for (pid, snap_date), snap in self.snapshots.items():
+            if (project_id is None or pid == project_id) and (d is None or snap_date == d):
+                yield snap
+
+    def _mark_zones(self, project_id: Optional[int], zone_ids: Iterable[int], d: Optional[date]):
+        zone_ids = set(zone_ids)
+        for snap in self._targets(project_id, d):
+            hit = zone_ids & snap.zone_index.keys()
+            if hit:
+                snap.dirty |= hit
+            elif project_id is not None:
+                snap.stale = True  # 스냅샷에 없는 구역 (새로 생성됨)
+
+    def _mark_project(self, project_id: int, d: Optional[date]):
+        for snap in self._targets(project_id, d):
+            snap.stale = True
+
+    async def mark_zones(self, zone_ids: Iterable[int], d: Optional[date] = None, project_id: Optional[int] = None):
+        """작업 계획/작업자 배정/위험 구역 변경 시 해당 구역 갱신 표시 (d 미지정 시 모든 날짜)"""
+        zone_ids = [z for z in zone_ids if z is not None]
+        if not zone_ids:
+            return
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {
+                "project_id": project_id, "zone_ids": zone_ids, "date": d.isoformat() if d else None
+            })
+        else:
+            self._mark_zones(project_id, zone_ids, d)
+
+    async def mark_project(self, project_id: int, d: Optional[date] = None):
+        """구역 추가/삭제 등 구조 변경 시 프로젝트 스냅샷 전체 재구성 표시"""
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {
+                "project_id": project_id, "zone_ids": None, "date": d.isoformat() if d else None
+            })
+        else:
+            self._mark_project(project_id, d)
+
+# 싱글톤 인스턴스
+zone_snapshot_store = ZoneSnapshotStore()
@@ -1,6 +1,7 @@
 
-from back.database import fetch_all, fetch_one, execute, insert_and_return
+from back.database import fetch_all, fetch_one, execute, insert_and_return, transaction
 from datetime import date
+import json
 
 class project_repository:
     @staticmethod
@@ -26,65 +27,78 @@ class project_repository:
         if data.get('end_date') and isinstance(data['end_date'], str):
             end_date = date.fromisoformat(data['end_date'])
         
-        proj = await insert_and_return(project_sql, {
-            "name": data['name'],
-            "location_address": data.get('location_address'),
-            "lat": data.get('lat', 37.5665),
-            "lng": data.get('lng', 126.9780),
-            "grid_cols": int(data.get('grid_cols', 5)),
-            "grid_rows": int(data.get('grid_rows', 5)),
-            "grid_spacing": float(data.get('grid_spacing', 10.0)),
-            "grid_angle": float(data.get('grid_angle', 0.0)),
-            "floors_above": int(data.get('floors_above', 1)),
-            "floors_below": int(data.get('floors_below', 0)),
-            "budget": int(data.get('budget')) if data.get('budget') else None,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-        pid = proj['id']
-
-        # 2. 관련 회사 연결 (project_companies)
-        if data.get('client_id'):
-            await execute("INSERT INTO project_companies (project_id, company_id, role) VALUES (:pid, :cid, 'CLIENT')", {"pid": pid, "cid": int(data['client_id'])})
-        if data.get('constructor_id'):
-            await execute("INSERT INTO project_companies (project_id, company_id, role) VALUES (:pid, :cid, 'CONSTRUCTOR')", {"pid": pid, "cid": int(data['constructor_id'])})
-        
-        # 협력사 다중 배정
-        partner_ids = data.get('partner_ids', [])
-        for p_id in partner_ids:
-            if p_id:
-                await execute("INSERT INTO project_companies (project_id, company_id, role) VALUES (:pid, :cid, 'PARTNER')", {"pid": pid, "cid": int(p_id)})
-
-        # 3. 핵심 인력 배정 (project_users)
-        if data.get('manager_id'):
-            await execute("INSERT INTO project_users (project_id, user_id, role_name, status) VALUES (:pid, :uid, 'manager', 'ACTIVE')", {"pid": pid, "uid": int(data['manager_id'])})
-        if data.get('safety_manager_id'):
-            await execute("INSERT INTO project_users (project_id, user_id, role_name, status) VALUES (:pid, :uid, 'safety_manager', 'ACTIVE')", {"pid": pid, "uid": int(data['safety_manager_id'])})
-
-        # 4. 자동 구역(Zones) 생성
         floors_above = int(data.get('floors_above', 1))
         floors_below = int(data.get('floors_below', 0))
         grid_rows = int(data.get('grid_rows', 5))
         grid_cols = int(data.get('grid_cols', 5))
-        
-        # 지상 층 (1F, 2F...)
-        for f in range(1, floors_above + 1):
-            await project_repository._generate_floor_zones(pid, f"{f}F", grid_rows, grid_cols)
-        # 지하 층 (B1, B2...)
-        for f in range(1, floors_below + 1):
-            await project_repository._generate_floor_zones(pid, f"B{f}", grid_rows, grid_cols)
+
+        # 프로젝트/업체/인력/구역 생성을 하나의 트랜잭션으로 처리 (실패 시 전체 롤백)
+        async with transaction():
+            proj = await insert_and_return(project_sql, {
+                "name": data['name'],
+                "location_address": data.get('location_address'),
+                "lat": data.get('lat', 37.5665),
+                "lng": data.get('lng', 126.9780),
+                "grid_cols": grid_cols,
+                "grid_rows": grid_rows,
+                "grid_spacing": float(data.get('grid_spacing', 10.0)),
+                "grid_angle": float(data.get('grid_angle', 0.0)),
+                "floors_above": floors_above,
+                "floors_below": floors_below,
+                "budget": int(data.get('budget')) if data.get('budget') else None,
+                "start_date": start_date,
+                "end_date": end_date
+            })
+            pid = proj['id']
+
+            # 2. 관련 회사 연결 (project_companies) - 발주처, 시공사, 협력사 다중 배정
+            company_links = []
+            if data.get('client_id'):
+                company_links.append((int(data['client_id']), 'CLIENT'))
+            if data.get('constructor_id'):
+                company_links.append((int(data['constructor_id']), 'CONSTRUCTOR'))
+            for p_id in data.get('partner_ids', []):
+                if p_id:
+                    company_links.append((int(p_id), 'PARTNER'))
+            if company_links:
+                await execute("""
+                    INSERT INTO project_companies (project_id, company_id, role)
+                    SELECT CAST(:pid AS integer), t.company_id, t.role
+                    FROM unnest(CAST(:cids AS integer[]), CAST(:roles AS text[])) AS t(company_id, role)
+                """, {"pid": pid, "cids": [c for c, _ in company_links], "roles": [r for _, r in company_links]})
+
+            # 3. 핵심 인력 배정 (project_users)
+            user_links = []
+            if data.get('manager_id'):
+                user_links.append((int(data['manager_id']), 'manager'))
+            if data.get('safety_manager_id'):
+                user_links.append((int(data['safety_manager_id']), 'safety_manager'))
+            if user_links:
+                await execute("""
+                    INSERT INTO project_users (project_id, user_id, role_name, status)
+                    SELECT CAST(:pid AS integer), t.user_id, t.role_name, 'ACTIVE'
+                    FROM unnest(CAST(:uids AS integer[]), CAST(:roles AS text[])) AS t(user_id, role_name)
+                """, {"pid": pid, "uids": [u for u, _ in user_links], "roles": [r for _, r in user_links]})
+
+            # 4. 자동 구역(Zones) 생성 - 지상 층 (1F, 2F...), 지하 층 (B1, B2...)
+            levels = [f"{f}F" for f in range(1, floors_above + 1)] + [f"B{f}" for f in range(1, floors_below + 1)]
+            await project_repository._generate_zones(pid, levels, grid_rows, grid_cols)
 
         return pid
 
     @staticmethod
-    async def _generate_floor_zones(pid, level, rows, cols):
-        for r in range(rows):
-            for c in range(cols):
-                zone_name = f"{level}-{chr(65+r)}{c+1}"
-                await execute(
-                    "INSERT INTO project_zones (project_id, name, level, row_index, col_index) VALUES (:pid, :n, :l, :ri, :ci)",
-                    {"pid": pid, "n": zone_name, "l": level, "ri": r, "ci": c}
-                )
+    async def _generate_zones(pid, levels, rows, cols):
+        """층 x 행 x 열 전체 구역을 한 번의 INSERT로 생성 (이름 예: 1F-A1, B1-C3)"""
+        if not levels or rows <= 0 or cols <= 0:
+            return
+        await execute("""
+            INSERT INTO project_zones (project_id, name, level, row_index, col_index)
+            SELECT CAST(:pid AS integer), lv.level || '-' || chr(65 + r) || (c + 1), lv.level, r, c
+            FROM unnest(CAST(:levels AS text[])) WITH ORDINALITY AS lv(level, ord)
+            CROSS JOIN generate_series(0, CAST(:rows AS integer) - 1) AS r
+            CROSS JOIN generate_series(0, CAST(:cols AS integer) - 1) AS c
+            ORDER BY lv.ord, r, c
+        """, {"pid": pid, "levels": levels, "rows": rows, "cols": cols})
 
     @staticmethod
     async def get_all():
@@ -137,121 +151,86 @@ class project_repository:
         return True
 
     @staticmethod
-    async def get_project_detail(pid: int):
-        """프로젝트 상세 정보 (업체, 관리자, 협력업체, 작업자 포함)"""
-        # 1. 프로젝트 기본 정보
-        project = await fetch_one("SELECT * FROM project_master WHERE id = :pid", {"pid": pid})
-        if not project:
-            return None
-        
-        # 2. 발주처, 시공사
-        client = await fetch_one("""
-            SELECT c.* FROM sys_companies c
-            JOIN project_companies pc ON c.id = pc.company_id
-            WHERE pc.project_id = :pid AND pc.role = 'CLIENT'
-        """, {"pid": pid})
-        
-        constructor = await fetch_one("""
-            SELECT c.* FROM sys_companies c
-            JOIN project_companies pc ON c.id = pc.company_id
-            WHERE pc.project_id = :pid AND pc.role = 'CONSTRUCTOR'
-        """, {"pid": pid})
-        
-        # 3. 소장, 안전관리자
-        manager = await fetch_one("""
-            SELECT u.* FROM sys_users u
-            JOIN project_users pu ON u.id = pu.user_id
-            WHERE pu.project_id = :pid AND pu.role_name = 'manager' AND pu.status = 'ACTIVE'
-        """, {"pid": pid})
-        
-        safety_manager = await fetch_one("""
-            SELECT u.* FROM sys_users u
-            JOIN project_users pu ON u.id = pu.user_id
-            WHERE pu.project_id = :pid AND pu.role_name = 'safety_manager' AND pu.status = 'ACTIVE'
-        """, {"pid": pid})
-        
-        # 4. 협력업체 목록
-        partners = await fetch_all("""
-            SELECT c.* FROM sys_companies c
-            JOIN project_companies pc ON c.id = pc.company_id
-            WHERE pc.project_id = :pid AND pc.role = 'PARTNER'
-            ORDER BY c.name
-        """, {"pid": pid})
-        
-        # 5. 승인된 작업자 (project_users에 있는 worker)
-        approved_workers = await fetch_all("""
-            SELECT u.id, u.username, u.full_name, u.role, u.job_title, u.company_id, c.name as company_name, pu.status
-            FROM sys_users u
-            JOIN project_users pu ON u.id = pu.user_id
-            JOIN sys_companies c ON u.company_id = c.id
-            WHERE pu.project_id = :pid AND u.role = 'worker' AND pu.status = 'ACTIVE'
-            ORDER BY c.name, u.full_name
-        """, {"pid": pid})
-        
-        # 6. 승인 대기 작업자 (협력업체 소속이지만 project_users에 없음)
-        pending_workers = await fetch_all("""
-            SELECT u.id, u.username, u.full_name, u.role, u.job_title, u.company_id, c.name as company_name
-            FROM sys_users u
-            JOIN sys_companies c ON u.company_id = c.id
-            WHERE u.role = 'worker' 
-            AND c.id IN (
-                SELECT company_id FROM project_companies 
-                WHERE project_id = :pid AND role = 'PARTNER'
-            )
-            AND u.id NOT IN (
-                SELECT user_id FROM project_users WHERE project_id = :pid
+    async def get_project_detail(pid: int, today: date = None):
+        """
+        프로젝트 상세 정보 (업체, 관리자, 협력업체, 작업자, 오늘 출역/작업/위험 포함)
+        - CTE + json_agg로 한 번의 쿼리로 조회 (기존 9회 왕복 → 1회)
+        """
+        today = today or date.today()
+        row = await fetch_one("""
+            WITH companies AS (
+                SELECT pc.role, c.name, to_jsonb(c) AS company
+                FROM project_companies pc
+                JOIN sys_companies c ON c.id = pc.company_id
+                WHERE pc.project_id = :pid
+            ),
+            staff AS (
+                SELECT pu.role_name, to_jsonb(u) AS staff_user
+                FROM project_users pu
+                JOIN sys_users u ON u.id = pu.user_id
+                WHERE pu.project_id = :pid AND pu.status = 'ACTIVE'
+                  AND pu.role_name IN ('manager', 'safety_manager')
+            ),
+            approved AS (
+                SELECT u.id, u.username, u.full_name, u.role, u.job_title, u.company_id, c.name as company_name, pu.status
+                FROM sys_users u
+                JOIN project_users pu ON u.id = pu.user_id
+                JOIN sys_companies c ON u.company_id = c.id
+                WHERE pu.project_id = :pid AND u.role = 'worker' AND pu.status = 'ACTIVE'
+            ),
+            pending AS (
+                SELECT u.id, u.username, u.full_name, u.role, u.job_title, u.company_id, c.name as company_name
+                FROM sys_users u
+                JOIN sys_companies c ON u.company_id = c.id
+                WHERE u.role = 'worker'
+                AND c.id IN (SELECT company_id FROM project_companies WHERE project_id = :pid AND role = 'PARTNER')
+                AND NOT EXISTS (SELECT 1 FROM project_users pu WHERE pu.project_id = :pid AND pu.user_id = u.id)
+            ),
+            attendance AS (
+                SELECT
+                    da.id, da.user_id, da.check_in_time, da.check_out_time, da.status,
+                    u.full_name, u.username, c.name as company_name
+                FROM daily_attendance da
+                JOIN sys_users u ON da.user_id = u.id
+                JOIN sys_companies c ON u.company_id = c.id
+                WHERE da.project_id = :pid AND da.date = :today
+            ),
+            work_tasks AS (
+                SELECT
+                    dwt.id, dwt.zone_id, dwt.work_info_id, dwt.description,
+                    dwt.calculated_risk_score, dwt.status,
+                    pz.name as zone_name, pz.level,
+                    cwi.work_type
+                FROM daily_work_plans dwt
+                JOIN project_zones pz ON dwt.zone_id = pz.id
+                LEFT JOIN content_work_info cwi ON dwt.work_info_id = cwi.id
+                WHERE dwt.project_id = :pid AND dwt.date = :today
+            ),
+            danger_zones AS (
+                SELECT
+                    ddz.id, ddz.zone_id, ddz.risk_type, ddz.description,
+                    pz.name as zone_name, pz.level
+                FROM daily_danger_zones ddz
+                JOIN project_zones pz ON ddz.zone_id = pz.id
+                WHERE pz.project_id = :pid AND ddz.date = :today
             )
-            ORDER BY c.name, u.full_name
-        """, {"pid": pid})
-        
-        # 7. 오늘 출퇴근 현황 (승인된 작업자 대상)
-        today = date.today()
-        attendance = await fetch_all("""
-            SELECT 
-                da.id, da.user_id, da.check_in_time, da.check_out_time, da.status,
-                u.full_name, u.username, c.name as company_name
-            FROM daily_attendance da
-            JOIN sys_users u ON da.user_id = u.id
-            JOIN sys_companies c ON u.company_id = c.id
-            WHERE da.project_id = :pid AND da.date = :today
-            ORDER BY da.check_in_time DESC
-        """, {"pid": pid, "today": today})
-        
-        # 8. 오늘 작업 계획 (층별, 구역별)
-        work_tasks = await fetch_all("""
-            SELECT 
-                dwt.id, dwt.zone_id, dwt.work_info_id, dwt.description, 
-                dwt.calculated_risk_score, dwt.status,
-                pz.name as zone_name, pz.level,
-                cwi.work_type
-            FROM daily_work_plans dwt
-            JOIN project_zones pz ON dwt.zone_id = pz.id
-            LEFT JOIN content_work_info cwi ON dwt.work_info_id = cwi.id
-            WHERE dwt.project_id = :pid AND dwt.date = :today
-            ORDER BY pz.level, pz.name
-        """, {"pid": pid, "today": today})
-        
-        # 9. 오늘 위험 구역
-        danger_zones = await fetch_all("""
-            SELECT 
-                ddz.id, ddz.zone_id, ddz.risk_type, ddz.description,
-                pz.name as zone_name, pz.level
-            FROM daily_danger_zones ddz
-            JOIN project_zones pz ON ddz.zone_id = pz.id
-            WHERE pz.project_id = :pid AND ddz.date = :today
-            ORDER BY pz.level, pz.name
+            SELECT
+                to_jsonb(p) AS project,
+                (SELECT company FROM companies WHERE role = 'CLIENT' LIMIT 1) AS client,
+                (SELECT company FROM companies WHERE role = 'CONSTRUCTOR' LIMIT 1) AS constructor,
+                (SELECT staff_user FROM staff WHERE role_name = 'manager' LIMIT 1) AS manager,
+                (SELECT staff_user FROM staff WHERE role_name = 'safety_manager' LIMIT 1) AS safety_manager,
+                COALESCE((SELECT json_agg(company ORDER BY name) FROM companies WHERE role = 'PARTNER'), '[]') AS partners,
+                COALESCE((SELECT json_agg(a ORDER BY a.company_name, a.full_name) FROM approved a), '[]') AS approved_workers,
+                COALESCE((SELECT json_agg(w ORDER BY w.company_name, w.full_name) FROM pending w), '[]') AS pending_workers,
+                COALESCE((SELECT json_agg(t ORDER BY t.check_in_time DESC) FROM attendance t), '[]') AS attendance,
+                COALESCE((SELECT json_agg(t ORDER BY t.level, t.zone_name) FROM work_tasks t), '[]') AS work_tasks,
+                COALESCE((SELECT json_agg(t ORDER BY t.level, t.zone_name) FROM danger_zones t), '[]') AS danger_zones
+            FROM project_master p
+            WHERE p.id = :pid
         """, {"pid": pid, "today": today})
-        
-        return {
-            "project": project,
-            "client": client,
-            "constructor": constructor,
-            "manager": manager,
-            "safety_manager": safety_manager,
-            "partners": partners,
-            "approved_workers": approved_workers,
-            "pending_workers": pending_workers,
-            "attendance": attendance,
-            "work_tasks": work_tasks,
-            "danger_zones": danger_zones
-        }
+        if not row:
+            return None
+
+        # json/jsonb 컬럼이 문자열로 올 경우(드라이버 코덱 미설정) 대비
+        return {k: json.loads(v) if isinstance(v, str) else v for k, v in row.items()}
@@ -1,7 +1,9 @@
 
 from fastapi import APIRouter, HTTPException, Request
 from back.project.master.repository import project_repository
+from back.project.master.service import master_service
 from back.database import execute
+from back.daily.worker_locations.geofence import geofence_engine
 
 router = APIRouter()
 
@@ -30,7 +32,7 @@ async def get_project(project_id: int):
 @router.get("/{project_id}/detail")
 async def get_project_detail(project_id: int):
     """프로젝트 상세 정보 (업체, 관리자, 협력업체, 작업자 포함)"""
-    detail = await project_repository.get_project_detail(project_id)
+    detail = await master_service.get_project_detail(project_id)
     if not detail:
         raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다.")
     return {"success": True, "data": detail}
@@ -41,6 +43,8 @@ async def update_project(project_id: int, request: Request):
     data = await request.json()
     try:
         await project_repository.update_project(project_id, data)
+        await geofence_engine.invalidate(project_id)  # 격자 중심/각도 변경 반영
+        master_service.invalidate_detail(project_id)
         return {"success": True, "message": "프로젝트 정보가 업데이트되었습니다."}
     except Exception as e:
         print(f"Project Update Error: {e}")
@@ -53,9 +57,13 @@ async def approve_worker(project_id: int, user_id: int):
         "INSERT INTO project_users (project_id, user_id, role_name, status) VALUES (:pid, :uid, 'worker', 'ACTIVE')",
         {"pid": project_id, "uid": user_id}
     )
+    await geofence_engine.forget_worker(user_id)
+    master_service.invalidate_detail(project_id)
     return {"success": True, "message": "작업자가 승인되었습니다."}
 
 @router.delete("/{project_id}")
 async def delete_project(project_id: int):
     await project_repository.delete_project(project_id)
+    await geofence_engine.invalidate(project_id)
+    master_service.invalidate_detail(project_id)
     return {"success": True, "message": "프로젝트가 삭제되었습니다."}
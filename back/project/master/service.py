@@ -1,8 +1,34 @@
 
-from back.project.master.repository import master_repository
+import os
+from back.project.master.repository import project_repository
+from back.utils.cache import TTLCache
+from back.utils.date_utils import get_today
+
+# 대시보드 상세 캐시 TTL(초), 0이면 캐시 사용 안 함
+PROJECT_DETAIL_CACHE_TTL = float(os.getenv("PROJECT_DETAIL_CACHE_TTL", "5"))
+project_detail_cache = TTLCache(ttl=PROJECT_DETAIL_CACHE_TTL)
 
 class master_service:
     """[PROJECT_MASTER] 비즈니스 로직"""
     @staticmethod
     async def list_all():
-        return await master_repository.get_all()
+        return await project_repository.get_all()
+
+    @staticmethod
+    async def get_project_detail(pid: int):
+        """프로젝트 상세 (project_id + 날짜 단위 단기 캐시)"""
+        key = (pid, get_today())
+        detail = project_detail_cache.get(key)
+        if detail is None:
+            detail = await project_repository.get_project_detail(pid, key[1])
+            if detail is not None:
+                project_detail_cache.set(key, detail)
+        return detail
+
+    @staticmethod
+    def invalidate_detail(pid: int = None):
+        """프로젝트/소속 변경 시 상세 캐시 무효화 (pid 미지정 시 전체)"""
+        if pid is None:
+            project_detail_cache.invalidate()
+        else:
+            project_detail_cache.invalidate(lambda key: key[0] == pid)
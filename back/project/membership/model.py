@@ -1,11 +1,14 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from back.database import Base
 from datetime import datetime
 
 class project_users(Base):
     """[PROJECT] 프로젝트 멤버 (사용자)"""
     __tablename__ = "project_users"
+    __table_args__ = (
+        Index("ix_project_users_project_id_status", "project_id", "status"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("project_master.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("sys_users.id", ondelete="CASCADE"), nullable=False)
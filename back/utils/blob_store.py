@@ -0,0 +1,333 @@
+import asyncio
+import mimetypes
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from back.utils.cache import TTLCache
+
+try:
+    import boto3
+except ImportError:  # S3 백엔드 사용 시에만 필요
+    boto3 = None
+
+# === Blob 저장소 설정 ===
+BLOB_GC_GRACE = float(os.getenv("BLOB_GC_GRACE", "600"))  # 참조가 사라진 뒤 실제 삭제까지 유예(초)
+BLOB_GC_INTERVAL = float(os.getenv("BLOB_GC_INTERVAL", "300"))
+BLOB_URL_EXPIRES = int(os.getenv("BLOB_URL_EXPIRES", "86400"))  # 원격 저장소 서명 URL 유효 시간(초)
+
+class BlobBackend:
+    """Blob 백엔드 인터페이스 (키 = 파일명, 모든 I/O는 스레드 풀에서 실행)"""
+    async def put_file(self, key: str, src_path: str):
+        """로컬 파일을 key로 저장 (src_path는 이동/삭제됨)"""
+        raise NotImplementedError
+
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    async def touch(self, key: str):
+        """중복 업로드로 재사용된 blob의 수정 시각 갱신 (GC 유예 판단용)"""
+
+    async def modified_at(self, key: str) -> Optional[float]:
+        raise NotImplementedError
+
+    async def delete(self, keys: List[str]):
+        raise NotImplementedError
+
+    async def list_keys(self) -> List[str]:
+        raise NotImplementedError
+
+    async def purge_temp(self, older_than: float) -> int:
+        """쓰다 만 임시 파일(.*.part) 중 older_than초 이상 지난 것 삭제 (로컬 백엔드만)"""
+        return 0
+
+    def local_path(self, key: str) -> Optional[str]:
+        """로컬 파일 경로 (로컬 백엔드만, 그 외 None)"""
+        return None
+
+    def signed_url(self, key: str, expires: int) -> Optional[str]:
+        """브라우저가 직접 받을 수 있는 서명 URL (원격 백엔드만, 로컬은 /uploads로 서빙하므로 None)"""
+        return None
+
+class LocalBlobBackend(BlobBackend):
+    """로컬 디스크 (Flat 구조: root/키, /uploads StaticFiles로 서빙)"""
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def put_file(self, key: str, src_path: str):
+        await asyncio.to_thread(os.replace, src_path, self.local_path(key))
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self.local_path(key))
+
+    async def touch(self, key: str):
+        try:
+            await asyncio.to_thread(os.utime, self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    async def modified_at(self, key: str) -> Optional[float]:
+        try:
+            return await asyncio.to_thread(os.path.getmtime, self.local_path(key))
+        except FileNotFoundError:
+            return None
+
+    async def delete(self, keys: List[str]):
+        def _remove(paths):
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"파일 삭제 실패: {path}, {e}")
+        await asyncio.to_thread(_remove, [self.local_path(k) for k in keys])
+
+    async def list_keys(self) -> List[str]:
+        def _scan():
+            with os.scandir(self.root) as entries:
+                return [e.name for e in entries if e.is_file() and not e.name.startswith(".")]
+        return await asyncio.to_thread(_scan)
+
+    async def purge_temp(self, older_than: float) -> int:
+        def _purge():
+            limit = time.time() - older_than
+            removed = 0
+            with os.scandir(self.root) as entries:
+                for e in entries:
+                    if not (e.name.startswith(".") and e.name.endswith(".part")):
+                        continue
+                    try:
+                        if e.stat().st_mtime < limit:
+                            os.remove(e.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+            return removed
+        return await asyncio.to_thread(_purge)
+
+class S3BlobBackend(BlobBackend):
+    """
+    S3 호환 스토리지 (AWS S3 / MinIO) - boto3 필요
+    - endpoint_url 지정 시 MinIO 등 S3 호환 서버 사용 (docker-compose의 minio 서비스)
+    """
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, prefix: str = "",
+                 access_key: Optional[str] = None, secret_key: Optional[str] = None, region: Optional[str] = None):
+        if boto3 is None:
+            raise RuntimeError("S3 백엔드를 사용하려면 boto3가 필요합니다 (pip install boto3)")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            "s3", endpoint_url=endpoint_url, region_name=region,
+            aws_access_key_id=access_key, aws_secret_access_key=secret_key,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def put_file(self, key: str, src_path: str):
+        # 키가 내용 해시이므로 객체는 변하지 않음 → 브라우저/CDN 장기 캐시
+        extra = {
+            "ContentType": mimetypes.guess_type(key)[0] or "application/octet-stream",
+            "CacheControl": "public, max-age=31536000, immutable",
+        }
+        await asyncio.to_thread(self.client.upload_file, src_path, self.bucket, self._key(key), ExtraArgs=extra)
+        await asyncio.to_thread(os.remove, src_path)
+
+    async def touch(self, key: str):
+        """
+        자기 자신으로 복사(MetadataDirective=REPLACE)해 LastModified 갱신
+        - 중복 업로드로 재사용된 blob이 유예 판단에서 오래된 것으로 보여 GC되지 않도록 함
+        """
+        head = await self._head(key)
+        if head is None:
+            return
+        await asyncio.to_thread(
+            self.client.copy_object,
+            Bucket=self.bucket, Key=self._key(key),
+            CopySource={"Bucket": self.bucket, "Key": self._key(key)},
+            MetadataDirective="REPLACE",
+            Metadata={**head.get("Metadata", {}), "touched-at": str(int(time.time()))},
+            ContentType=head.get("ContentType") or "application/octet-stream",
+            CacheControl=head.get("CacheControl") or "public, max-age=31536000, immutable",
+        )
+
+    def signed_url(self, key: str, expires: int) -> str:
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": self._key(key)}, ExpiresIn=expires,
+        )
+
+    async def _head(self, key: str) -> Optional[dict]:
+        try:
+            return await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def exists(self, key: str) -> bool:
+        return await self._head(key) is not None
+
+    async def modified_at(self, key: str) -> Optional[float]:
+        head = await self._head(key)
+        return head["LastModified"].timestamp() if head else None
+
+    async def delete(self, keys: List[str]):
+        # DeleteObjects는 요청당 최대 1000개
+        for i in range(0, len(keys), 1000):
+            objects = [{"Key": self._key(k)} for k in keys[i:i + 1000]]
+            await asyncio.to_thread(self.client.delete_objects, Bucket=self.bucket, Delete={"Objects": objects, "Quiet": True})
+
+    async def list_keys(self) -> List[str]:
+        def _list():
+            keys = []
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+                keys.extend(obj["Key"][len(self.prefix):] for obj in page.get("Contents", []))
+            return keys
+        return await asyncio.to_thread(_list)
+
+class BlobStore:
+    """
+    [Storage] 내용 주소(sha256) 기반 중복 제거 저장소
+    - 키 = sha256 + 확장자: 같은 사진은 한 번만 저장하고 여러 행이 같은 키를 참조
+    - 참조 수는 DB(count_refs)가 기준, 별도 카운터 컬럼 없음
+    - 삭제는 release()로 GC 후보에 올리고, 유예 시간이 지난 뒤 참조가 없을 때만 삭제 (지연 GC)
+      · 유예 중 같은 내용이 다시 업로드되면 touch로 수정 시각이 갱신되어 삭제되지 않음
+      · 같은 프로세스의 중복 업로드(exists → touch)는 GC 잠금 안에서 처리 → 확인~삭제 사이에 재사용되지 않음
+      · 다른 프로세스 대비 수정 시각은 키마다 삭제 직전에 확인
+    - 키마다 함께 지울 파생 파일(썸네일 등)을 지정할 수 있음
+    """
+    def __init__(self, backend: BlobBackend,
+                 find_referenced: Callable[[List[str]], Awaitable[Set[str]]],
+                 grace: float = BLOB_GC_GRACE, gc_interval: float = BLOB_GC_INTERVAL):
+        self.backend = backend
+        self.find_referenced = find_referenced  # 키 목록 중 DB에서 아직 참조 중인 키 집합
+        self.grace = grace
+        self.gc_interval = gc_interval
+        # GC 후보: 키 -> (release 시각, 함께 지울 파생 키)
+        self.pending: Dict[str, tuple] = {}
+        self.stats = {"stored": 0, "deduplicated": 0, "collected": 0}
+        self._task: Optional[asyncio.Task] = None
+        self._gc_lock = asyncio.Lock()
+        # 같은 키는 유효 시간 절반 동안 같은 서명 URL 재사용 (URL이 같아야 브라우저 캐시 적중)
+        self._urls = TTLCache(ttl=BLOB_URL_EXPIRES / 2, max_entries=20000)
+
+    @property
+    def is_local(self) -> bool:
+        return isinstance(self.backend, LocalBlobBackend)
+
+    def signed_url(self, key: str) -> Optional[str]:
+        """원격 백엔드 객체의 서명 URL (로컬 백엔드는 None)"""
+        url = self._urls.get(key)
+        if url is None:
+            url = self.backend.signed_url(key, BLOB_URL_EXPIRES)
+            if url is not None:
+                self._urls.set(key, url)
+        return url
+
+    @staticmethod
+    def content_key(sha256: str, ext: str) -> str:
+        return f"{sha256}{ext}"
+
+    async def put_staged(self, staged: dict) -> str:
+        """stage_uploads 결과 1건을 저장하고 키 반환 (이미 있는 내용이면 임시 파일만 삭제)"""
+        key = self.content_key(staged["sha256"], staged["ext"])
+        self.pending.pop(key, None)
+        if await self.backend.exists(key):
+            # GC가 같은 키를 확인~삭제하는 중이면 끝날 때까지 대기 후 다시 확인 (삭제됐으면 새로 저장)
+            async with self._gc_lock:
+                reused = await self.backend.exists(key)
+                if reused:
+                    await self.backend.touch(key)
+            if reused:
+                await asyncio.to_thread(_remove_quietly, staged["path"])
+                self.stats["deduplicated"] += 1
+                return key
+        await self.backend.put_file(key, staged["path"])
+        self.stats["stored"] += 1
+        return key
+
+    def release(self, key: str, derived: Iterable[str] = ()):
+        """참조 행 삭제 후 호출: GC 후보로 등록 (실제 삭제는 유예 후 참조 확인)"""
+        prev = self.pending.get(key)
+        names = set(derived) | (prev[1] if prev else set())
+        self.pending[key] = (time.time(), names)
+
+    async def collect(self, force_all: bool = False) -> int:
+        """
+        유예가 지난 GC 후보 중 참조 없는 blob 삭제
+        - force_all: 백엔드 전체 키를 대상으로 고아 blob 정리 (재시작으로 유실된 후보 포함)
+        """
+        async with self._gc_lock:
+            now = time.time()
+            if force_all:
+                candidates = {k: self.pending.get(k, (0.0, set())) for k in await self.backend.list_keys()}
+            else:
+                candidates = {k: v for k, v in self.pending.items() if now - v[0] >= self.grace}
+            if not candidates:
+                return 0
+
+            referenced = await self.find_referenced(list(candidates))
+            collected = 0
+            for key, (_, derived) in candidates.items():
+                self.pending.pop(key, None)
+                if key in referenced:
+                    continue
+                # 참조 확인 이후 재사용됐을 수 있으므로 키마다 삭제 직전에 수정 시각 확인
+                modified = await self.backend.modified_at(key)
+                if modified is not None and time.time() - modified < self.grace:
+                    continue  # 최근 업로드/재사용된 blob (DB 기록 전일 수 있음)
+                await self.backend.delete([key, *derived])
+                collected += 1 + len(derived)
+
+            self.stats["collected"] += collected
+            return collected
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            try:
+                await self.collect()
+                # 파생 이미지 생성 중 강제 종료된 워커가 남긴 임시 파일
+                await self.backend.purge_temp(self.grace)
+            except Exception as e:
+                print(f"❌ Blob GC 실패: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "pending_gc": len(self.pending), "backend": type(self.backend).__name__}
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def create_backend(local_root: str, prefix: str = "") -> BlobBackend:
+    """BLOB_BACKEND 환경변수에 따라 백엔드 생성 (local 기본, s3)"""
+    if os.getenv("BLOB_BACKEND", "local").lower() == "s3":
+        return S3BlobBackend(
+            bucket=os.getenv("S3_BUCKET", "smart-security"),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            prefix=prefix,
+            access_key=os.getenv("S3_ACCESS_KEY") or None,
+            secret_key=os.getenv("S3_SECRET_KEY") or None,
+            region=os.getenv("S3_REGION") or None,
+        )
+    return LocalBlobBackend(local_root)
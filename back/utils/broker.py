@@ -0,0 +1,153 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+Handler = Callable[[dict], Awaitable[None]]
+
+# PostgreSQL NOTIFY payload 최대 8000 byte → 조각당 글자 수 제한 (UTF-8 최대 4 byte/글자 + 헤더 여유)
+NOTIFY_CHUNK_CHARS = 1900
+
+class BaseBroker:
+    """
+    [Pub/Sub] 프로세스 간 메시지 브로커 인터페이스
+    - SSE/WebSocket 매니저는 publish()로 메시지를 보내고, subscribe()로 등록한 핸들러에서 로컬 연결에 전달
+    - 구현체: InProcessBroker(단일 프로세스), PostgresBroker(LISTEN/NOTIFY, 다중 워커/노드)
+    """
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, channel: str, handler: Handler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    async def publish(self, channel: str, payload: dict):
+        raise NotImplementedError
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def _dispatch(self, channel: str, payload: dict):
+        for handler in self.handlers.get(channel, []):
+            try:
+                await handler(payload)
+            except Exception as e:
+                print(f"❌ [Broker] '{channel}' 핸들러 오류: {e}")
+
+class InProcessBroker(BaseBroker):
+    """같은 프로세스 안에서 바로 전달 (기본값, uvicorn 단일 워커)"""
+    async def publish(self, channel: str, payload: dict):
+        await self._dispatch(channel, payload)
+
+class PostgresBroker(BaseBroker):
+    """
+    PostgreSQL LISTEN/NOTIFY 기반 브로커 (uvicorn 다중 워커/다중 노드)
+    - 수신: 전용 asyncpg 연결 1개로 LISTEN, 끊기면 재연결
+    - 발행: pg_notify() (자신이 보낸 메시지도 NOTIFY로 돌아오므로 로컬 직접 전달은 하지 않음)
+    - 8KB를 넘는 메시지는 조각으로 나눠 한 트랜잭션에서 발행 (같은 트랜잭션의 NOTIFY는 순서대로 전달) 후 수신 측에서 재조립
+    """
+    def __init__(self, dsn: str, reconnect_interval: float = 3.0, chunk_timeout: float = 30.0):
+        super().__init__()
+        self.dsn = dsn
+        self.reconnect_interval = reconnect_interval
+        self.chunk_timeout = chunk_timeout
+        self._conn = None
+        self._task: Optional[asyncio.Task] = None
+        # msg_id -> (수신 시작 시각, 조각 목록)
+        self._partials: Dict[str, tuple] = {}
+
+    @staticmethod
+    def _pg_channel(channel: str) -> str:
+        return f"ss_{channel}"
+
+    async def publish(self, channel: str, payload: dict):
+        from back.database import execute
+
+        body = json.dumps(payload, default=str, ensure_ascii=False)
+        msg_id = uuid.uuid4().hex[:12]
+        pieces = [body[i:i + NOTIFY_CHUNK_CHARS] for i in range(0, len(body), NOTIFY_CHUNK_CHARS)] or [""]
+        parts = [f"{msg_id}:{i}:{len(pieces)}:{piece}" for i, piece in enumerate(pieces)]
+        await execute("""
+            SELECT pg_notify(:channel, t.part)
+            FROM unnest(CAST(:parts AS text[])) WITH ORDINALITY AS t(part, ord)
+            ORDER BY t.ord
+        """, {"channel": self._pg_channel(channel), "parts": parts})
+
+    def _reassemble(self, message: str) -> Optional[str]:
+        msg_id, index, total, piece = message.split(":", 3)
+        total = int(total)
+        if total == 1:
+            return piece
+
+        now = time.monotonic()
+        started, pieces = self._partials.setdefault(msg_id, (now, [None] * total))
+        pieces[int(index)] = piece
+        if all(p is not None for p in pieces):
+            del self._partials[msg_id]
+            return "".join(pieces)
+
+        # 유실된 조각 정리
+        for key in [k for k, (t, _) in self._partials.items() if now - t > self.chunk_timeout]:
+            del self._partials[key]
+        return None
+
+    def _on_notify(self, conn, pid, pg_channel, message):
+        channel = pg_channel[len("ss_"):]
+        try:
+            body = self._reassemble(message)
+            if body is None:
+                return
+            payload = json.loads(body)
+        except ValueError:
+            return
+        asyncio.get_running_loop().create_task(self._dispatch(channel, payload))
+
+    async def _listen(self):
+        import asyncpg
+
+        self._conn = await asyncpg.connect(self.dsn)
+        for channel in self.handlers:
+            await self._conn.add_listener(self._pg_channel(channel), self._on_notify)
+
+    async def _supervise(self):
+        """LISTEN 연결 감시 및 재연결"""
+        while True:
+            try:
+                if self._conn is None or self._conn.is_closed():
+                    await self._listen()
+                    print("✅ [Broker] PostgreSQL LISTEN 연결")
+            except Exception as e:
+                print(f"❌ [Broker] LISTEN 연결 실패: {e}")
+                self._conn = None
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._supervise())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+def create_broker() -> BaseBroker:
+    """PUBSUB_BACKEND 환경변수로 구현체 선택 (memory | postgres)"""
+    backend = os.getenv("PUBSUB_BACKEND", "memory").lower()
+    if backend == "postgres":
+        from back.database import DATABASE_URL
+        return PostgresBroker(DATABASE_URL.replace("+asyncpg", ""))
+    return InProcessBroker()
+
+# 싱글톤 인스턴스
+broker = create_broker()
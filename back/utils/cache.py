@@ -0,0 +1,45 @@
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    [Cache] 짧은 TTL 메모리 캐시 (프로세스 단위)
+    - 만료된 항목은 조회 시 제거, max_entries 초과 시 가장 먼저 만료될 항목부터 제거
+      (TTL이 고정이므로 저장 순서 = 만료 순서 → 제거 O(1))
+    - 쓰기 경로에서 invalidate()로 즉시 무효화
+    """
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._store: Dict[Hashable, Tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._store[key]
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl <= 0:
+            return
+        # 재저장 시 맨 뒤로 이동해 저장 순서를 만료 순서와 일치시킴
+        if self._store.pop(key, None) is None and len(self._store) >= self.max_entries:
+            del self._store[next(iter(self._store))]
+        self._store[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, match: Optional[Callable[[Hashable], bool]] = None):
+        """조건에 맞는 키 제거 (미지정 시 전체)"""
+        if match is None:
+            self._store.clear()
+            return
+        for key in [k for k in self._store if match(k)]:
+            del self._store[key]
+
+    def get_stats(self) -> dict:
+        return {"entries": len(self._store), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
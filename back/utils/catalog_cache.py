@@ -0,0 +1,84 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+from back.utils.versioning import resource_versions
+
+RowT = TypeVar("RowT", bound=dict)
+
+# 앱 밖(시드 스크립트 등)에서 바뀐 경우를 위한 최대 보관 시간(초)
+CATALOG_CACHE_MAX_AGE = float(os.getenv("CATALOG_CACHE_MAX_AGE", "300"))
+
+class CatalogCache(Generic[RowT]):
+    """
+    [Cache] 거의 바뀌지 않는 콘텐츠 마스터 테이블 전체를 메모리에 올려두는 read-through 캐시
+    - 첫 조회 시 loader로 전체 적재, id 색인 유지
+    - resource_versions의 리소스 토큰이 바뀌면(생성/수정 경로의 bump) 다음 조회에서 재적재
+      → bump는 Pub/Sub 브로커로 전파되므로 모든 프로세스가 함께 갱신
+    - 반환된 행은 공유 객체이므로 수정하지 말 것 (목록이 필요하면 get_all()이 복사본 반환)
+    """
+    def __init__(self, resource: str, loader: Callable[[], Awaitable[List[RowT]]], max_age: float = CATALOG_CACHE_MAX_AGE):
+        self.resource = resource
+        self.loader = loader
+        self.max_age = max_age
+        self.rows: List[RowT] = []
+        self.by_id: Dict[int, RowT] = {}
+        self.version: Optional[str] = None
+        self.loaded_at = 0.0
+        self.loads = 0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self.version is not None
+            and self.version == resource_versions.current(self.resource)[0]
+            and time.monotonic() - self.loaded_at < self.max_age
+        )
+
+    async def _ensure(self):
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            # 적재 전 버전을 기록 (적재 중 변경되면 다음 조회에서 다시 적재)
+            version = resource_versions.current(self.resource)[0]
+            rows = await self.loader()
+            self.rows = rows
+            self.by_id = {r["id"]: r for r in rows}
+            self.version = version
+            self.loaded_at = time.monotonic()
+            self.loads += 1
+
+    async def get_all(self) -> List[RowT]:
+        await self._ensure()
+        return [dict(r) for r in self.rows]
+
+    async def get(self, row_id: Optional[int]) -> Optional[RowT]:
+        await self._ensure()
+        return self.by_id.get(row_id)
+
+    async def get_many(self, ids: Iterable[Optional[int]]) -> Dict[int, RowT]:
+        await self._ensure()
+        return {i: self.by_id[i] for i in ids if i in self.by_id}
+
+    async def enrich(self, rows: List[dict], fk: str, fields: Dict[str, str], defaults: Optional[Dict[str, object]] = None) -> List[dict]:
+        """
+        조인 대신 캐시로 컬럼 채우기
+        - fields: {결과 컬럼명: 캐시 컬럼명}, 참조 행이 없거나 값이 NULL이면 defaults 값
+        """
+        await self._ensure()
+        defaults = defaults or {}
+        for row in rows:
+            ref = self.by_id.get(row.get(fk))
+            for out_name, src_name in fields.items():
+                value = ref.get(src_name) if ref is not None else None
+                row[out_name] = value if value is not None else defaults.get(out_name)
+        return rows
+
+    async def invalidate(self):
+        """생성/수정 경로에서 호출 (모든 프로세스의 캐시 및 목록 ETag 갱신)"""
+        await resource_versions.bump(self.resource)
+
+    def get_stats(self) -> dict:
+        return {"resource": self.resource, "rows": len(self.rows), "loads": self.loads, "version": self.version}
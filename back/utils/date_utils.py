@@ -9,6 +9,10 @@ def get_now() -> datetime:
     """현재 날짜와 시간을 반환합니다 (datetime 객체). 출퇴근 기록용으로 권장됩니다."""
     return datetime.now()
 
+def to_local_naive(dt: datetime) -> datetime:
+    """timezone 포함 시각을 서버 로컬 시각(naive)으로 변환합니다. DB 컬럼은 timestamp without time zone입니다."""
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo else dt
+
 def ensure_date(val: Union[str, date, datetime]) -> date:
     """
     다양한 입력을 date 객체로 안전하게 변환합니다.
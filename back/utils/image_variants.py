@@ -0,0 +1,178 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 미설치 시 파생 이미지 생성 비활성 (원본만 사용)
+    Image = None
+    ImageOps = None
+
+# === 파생 이미지 설정 ===
+# (접미사, 긴 변 최대 px)
+VARIANT_SIZES: Tuple[Tuple[str, int], ...] = (
+    ("thumb", int(os.getenv("IMAGE_THUMB_SIZE", "256"))),
+    ("medium", int(os.getenv("IMAGE_MEDIUM_SIZE", "1280"))),
+)
+VARIANT_FORMAT = os.getenv("IMAGE_VARIANT_FORMAT", "WEBP").upper()  # WEBP 또는 JPEG
+VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+TEMP_SUFFIX = ".part"  # 저장 중인 파생 이미지 임시 파일 (완료 시 최종 이름으로 rename)
+
+def variant_filename(filename: str, suffix: str, fmt: str = VARIANT_FORMAT) -> str:
+    """원본 파일명 → 파생 이미지 파일명 (예: 12_ab.jpg → 12_ab_thumb.webp)"""
+    ext = ".webp" if fmt == "WEBP" else ".jpg"
+    return f"{os.path.splitext(filename)[0]}_{suffix}{ext}"
+
+def render_variants(directory: str, filename: str, sizes=VARIANT_SIZES,
+                    fmt: str = VARIANT_FORMAT, quality: int = VARIANT_QUALITY) -> Dict[str, str]:
+    """
+    [프로세스 풀에서 실행] 원본 이미지로 크기별 파생 이미지 생성
+    - EXIF 회전 반영, 원본보다 크게 늘리지 않음, 메타데이터 제거
+    - 파생 파일이 이미 모두 있으면 재사용 (내용 주소 저장소에서 같은 원본을 여러 행이 공유)
+    :return: {접미사: 파생 파일명}
+    """
+    src = os.path.join(directory, filename)
+    result: Dict[str, str] = {suffix: variant_filename(filename, suffix, fmt) for suffix, _ in sizes}
+    if all(os.path.exists(os.path.join(directory, name)) for name in result.values()):
+        return result
+    with Image.open(src) as img:
+        img.draft("RGB", (max(s for _, s in sizes),) * 2)  # JPEG는 디코딩 단계에서 축소 (메모리/시간 절감)
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA") or (fmt == "JPEG" and img.mode == "RGBA"):
+            img = img.convert("RGB")
+        # 큰 크기부터 축소해 다음 크기의 입력으로 재사용
+        for suffix, max_side in sorted(sizes, key=lambda s: -s[1]):
+            img.thumbnail((max_side, max_side), Image.LANCZOS)
+            name = result[suffix]
+            # 임시 파일명에 pid 포함 (다른 워커가 같은 원본을 동시에 변환해도 충돌 없음)
+            tmp = os.path.join(directory, f".{name}.{os.getpid()}{TEMP_SUFFIX}")
+            try:
+                if fmt == "WEBP":
+                    img.save(tmp, format=fmt, quality=quality, method=4)
+                else:
+                    img.save(tmp, format=fmt, quality=quality, optimize=True, progressive=True)
+                os.replace(tmp, os.path.join(directory, name))
+            except BaseException:
+                # 저장 실패 시 임시 파일 정리 (프로세스가 강제 종료된 경우는 Blob GC가 오래된 임시 파일 정리)
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+    return result
+
+class ImageVariantWorker:
+    """
+    [Background] 업로드 이미지 파생본(썸네일/중간 크기) 생성 큐
+    - 업로드 요청은 enqueue 후 바로 응답, 변환은 프로세스 풀에서 실행 (이벤트 루프/GIL 영향 없음)
+    - 완료 시 on_complete(image_id, {접미사: 파일명}) 호출 (DB 기록 등)
+    - 변환 실패(디코딩 불가 등) 시 on_failed(image_id) 호출 → 재기동 시 다시 시도하지 않도록 기록
+    - 기동 시 backfill() 컨텍스트가 넘겨준 [{id, image_url}]을 큐에 적재하고 처리될 때까지 컨텍스트 유지
+      (advisory lock 등으로 여러 워커 중 한 곳에서만 백필하도록 호출 측에서 구성)
+    - Pillow 미설치 시 비활성 (API는 원본 URL로 대체)
+    """
+    def __init__(self, directory: str,
+                 on_complete: Callable[[int, Dict[str, str]], Awaitable[None]],
+                 on_failed: Optional[Callable[[int], Awaitable[None]]] = None,
+                 backfill: Optional[Callable[[], AsyncContextManager[List[dict]]]] = None,
+                 workers: int = VARIANT_WORKERS):
+        self.directory = directory
+        self.on_complete = on_complete
+        self.on_failed = on_failed
+        self.backfill = backfill
+        self.workers = workers
+        self.enabled = Image is not None
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.processed = 0
+        self.failed = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # fork는 스레드/DB 연결을 가진 부모 프로세스 상태를 복제하므로 spawn 사용
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def enqueue(self, images: List[dict]):
+        """[{id, image_url}] 변환 예약"""
+        if not self.enabled:
+            return
+        for image in images:
+            self.queue.put_nowait((image["id"], image["image_url"]))
+
+    async def _render(self, filename: str) -> Dict[str, str]:
+        """프로세스 풀에서 변환 - 작업 프로세스 비정상 종료(거대 이미지 등) 시 풀을 재생성하고 1회 재시도"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                return await loop.run_in_executor(pool, render_variants, self.directory, filename)
+            except BrokenProcessPool:
+                # 같은 시점에 실행 중이던 다른 변환도 함께 실패하므로, 먼저 감지한 쪽만 풀 교체
+                if self._pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = self._new_pool()
+                if attempt == 1:
+                    raise
+
+    async def _process(self, image_id: int, filename: str):
+        try:
+            variants = await self._render(filename)
+        except FileNotFoundError:
+            return  # 변환 전에 삭제된 이미지
+        except Exception as e:
+            self.failed += 1
+            print(f"❌ 파생 이미지 생성 실패 ({filename}): {e}")
+            if self.on_failed is not None:
+                await self.on_failed(image_id)
+            return
+        await self.on_complete(image_id, variants)
+        self.processed += 1
+
+    async def _run(self):
+        while True:
+            image_id, filename = await self.queue.get()
+            try:
+                await self._process(image_id, filename)
+            except Exception as e:
+                print(f"❌ 파생 이미지 처리 실패 ({filename}): {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _run_backfill(self):
+        try:
+            async with self.backfill() as images:
+                if images:
+                    self.enqueue(images)
+                    await self.queue.join()
+        except Exception as e:
+            print(f"❌ 파생 이미지 백필 실패: {e}")
+
+    async def start(self):
+        if not self.enabled:
+            print("ℹ️ Pillow 미설치: 파생 이미지 생성 비활성")
+            return
+        self._pool = self._new_pool()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._run()) for _ in range(self.workers)]
+        if self.backfill is not None:
+            self._tasks.append(loop.create_task(self._run_backfill()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> dict:
+        return {"enabled": self.enabled, "queued": self.queue.qsize(), "processed": self.processed, "failed": self.failed}
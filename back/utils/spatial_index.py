@@ -0,0 +1,88 @@
+import math
+from typing import Any, List, Sequence, Tuple
+
+BBox = Tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+Point = Tuple[float, float]
+
+def polygon_bbox(points: Sequence[Point]) -> BBox:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def polygon_area(points: Sequence[Point]) -> float:
+    """신발끈 공식 (절대값)"""
+    area = 0.0
+    n = len(points)
+    for i in range(n):
+        x1, y1 = points[i]
+        x2, y2 = points[(i + 1) % n]
+        area += x1 * y2 - x2 * y1
+    return abs(area) / 2
+
+def point_in_polygon(x: float, y: float, points: Sequence[Point]) -> bool:
+    """Ray casting 방식 점-다각형 포함 판정"""
+    inside = False
+    n = len(points)
+    j = n - 1
+    for i in range(n):
+        xi, yi = points[i]
+        xj, yj = points[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+class STRTree:
+    """
+    [Spatial Index] Sort-Tile-Recursive 방식으로 일괄 구성하는 정적 R-Tree
+    - 구성: O(n log n), 점 질의: O(log n + k)
+    - 항목 변경 시에는 해당 트리만 다시 구성 (프로젝트/층 단위로 작게 나눠 사용)
+    """
+    def __init__(self, items: List[Tuple[BBox, Any]], node_capacity: int = 8):
+        self.node_capacity = max(2, node_capacity)
+        self.size = len(items)
+        self.root = self._build([(bbox, item) for bbox, item in items], leaf=True) if items else None
+
+    def _build(self, entries: list, leaf: bool):
+        cap = self.node_capacity
+        if len(entries) <= cap:
+            return (self._union(entries), entries, leaf)
+
+        # x 중심으로 정렬 후 세로 슬라이스, 각 슬라이스는 y 중심으로 정렬해 노드 단위로 묶음
+        node_count = math.ceil(len(entries) / cap)
+        slice_count = math.ceil(math.sqrt(node_count))
+        slice_size = slice_count * cap
+        entries = sorted(entries, key=lambda e: e[0][0] + e[0][2])
+
+        nodes = []
+        for s in range(0, len(entries), slice_size):
+            vertical = sorted(entries[s:s + slice_size], key=lambda e: e[0][1] + e[0][3])
+            for n in range(0, len(vertical), cap):
+                group = vertical[n:n + cap]
+                nodes.append((self._union(group), group, leaf))
+        return self._build([(node[0], node) for node in nodes], leaf=False)
+
+    @staticmethod
+    def _union(entries: list) -> BBox:
+        return (
+            min(e[0][0] for e in entries), min(e[0][1] for e in entries),
+            max(e[0][2] for e in entries), max(e[0][3] for e in entries),
+        )
+
+    def query_point(self, x: float, y: float) -> List[Any]:
+        """점을 bbox로 포함하는 항목 후보 목록"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            bbox, children, leaf = stack.pop()
+            if not (bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]):
+                continue
+            for child_bbox, child in children:
+                if child_bbox[0] <= x <= child_bbox[2] and child_bbox[1] <= y <= child_bbox[3]:
+                    if leaf:
+                        found.append(child)
+                    else:
+                        stack.append(child)
+        return found
@@ -1,47 +1,136 @@
 import asyncio
 import json
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 
 class SSENoticeManager:
-    def __init__(self):
+    """
+    [SSE] 프로젝트/사용자별 공지·알림 구독 관리
+    - 구독자마다 크기 제한 큐 사용, 가득 차면 가장 오래된 메시지를 버림 (drop-oldest)
+    - 전송은 put_nowait로 즉시 적재 → 느린 구독자가 다른 구독자/요청 경로를 막지 않음
+    - 구독자별 적재/전달/폐기 건수와 대기 건수(lag) 집계
+    - attach(broker) 후에는 브로커를 거쳐 모든 프로세스의 구독자에게 전달 (다중 워커/노드)
+    """
+    CHANNEL = "sse_notice"
+
+    def __init__(self, queue_size: int = 100, heartbeat_interval: float = 15.0):
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
         # project_id별 -> user_id별 -> 큐 목록
         self.project_queues: Dict[int, Dict[int, List[asyncio.Queue]]] = {}
+        # 큐 -> 구독자 통계
+        self.subscriber_stats: Dict[asyncio.Queue, dict] = {}
+        self.broker = None
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 (startup에서 broker.start() 전에 호출)"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+
+    async def _on_broker_message(self, payload: dict):
+        if payload.get("user_id") is not None:
+            self._deliver_to_user(payload["project_id"], payload["user_id"], payload["data"])
+        else:
+            self._deliver_broadcast(payload["project_id"], payload["data"])
 
     def subscribe(self, project_id: int, user_id: int) -> asyncio.Queue:
         """새로운 구독자(근로자)를 위한 큐 생성"""
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=self.queue_size)
         if project_id not in self.project_queues:
             self.project_queues[project_id] = {}
-        
+
         if user_id not in self.project_queues[project_id]:
             self.project_queues[project_id][user_id] = []
-            
+
         self.project_queues[project_id][user_id].append(queue)
+        self.subscriber_stats[queue] = {
+            "project_id": project_id,
+            "user_id": user_id,
+            "connected_at": time.time(),
+            "enqueued": 0,
+            "delivered": 0,
+            "dropped": 0,
+        }
         return queue
 
     def unsubscribe(self, project_id: int, user_id: int, queue: asyncio.Queue):
         """구독 해지 시 큐 제거"""
+        self.subscriber_stats.pop(queue, None)
         if project_id in self.project_queues:
             if user_id in self.project_queues[project_id]:
                 if queue in self.project_queues[project_id][user_id]:
                     self.project_queues[project_id][user_id].remove(queue)
                 if not self.project_queues[project_id][user_id]:
                     del self.project_queues[project_id][user_id]
+            if not self.project_queues[project_id]:
+                del self.project_queues[project_id]
+
+    def _offer(self, queue: asyncio.Queue, message: str):
+        """대기 없이 적재, 큐가 가득 차면 가장 오래된 메시지 폐기"""
+        stats = self.subscriber_stats.get(queue)
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(message)
+            if stats is not None:
+                stats["dropped"] += 1
+        if stats is not None:
+            stats["enqueued"] += 1
+
+    async def next_message(self, queue: asyncio.Queue) -> Optional[str]:
+        """다음 메시지 대기 (heartbeat_interval 동안 없으면 None → keepalive 전송용)"""
+        try:
+            message = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_interval)
+        except asyncio.TimeoutError:
+            return None
+        stats = self.subscriber_stats.get(queue)
+        if stats is not None:
+            stats["delivered"] += 1
+        return message
 
     async def send_to_user(self, project_id: int, user_id: int, data: dict):
         """특정 프로젝트의 특정 사용자에게 메시지 전송"""
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {"project_id": project_id, "user_id": user_id, "data": data})
+        else:
+            self._deliver_to_user(project_id, user_id, data)
+
+    async def broadcast(self, project_id: int, data: dict):
+        """특정 프로젝트의 모든 구독자에게 메시지 전송"""
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {"project_id": project_id, "user_id": None, "data": data})
+        else:
+            self._deliver_broadcast(project_id, data)
+
+    def _deliver_to_user(self, project_id: int, user_id: int, data: dict):
+        """현재 프로세스에 연결된 해당 사용자 구독자에게 적재"""
         if project_id in self.project_queues and user_id in self.project_queues[project_id]:
             message = json.dumps(data, default=str)
             for queue in self.project_queues[project_id][user_id]:
-                await queue.put(message)
+                self._offer(queue, message)
 
-    async def broadcast(self, project_id: int, data: dict):
-        """특정 프로젝트의 모든 구독자에게 메시지 전송"""
+    def _deliver_broadcast(self, project_id: int, data: dict):
+        """현재 프로세스에 연결된 프로젝트 구독자 전체에게 적재"""
         if project_id in self.project_queues:
             message = json.dumps(data, default=str)
             for user_queues in self.project_queues[project_id].values():
                 for queue in user_queues:
-                    await queue.put(message)
+                    self._offer(queue, message)
+
+    def get_stats(self, project_id: Optional[int] = None) -> dict:
+        """구독자별 지연(lag = 대기 건수) 및 폐기 통계"""
+        subscribers = []
+        for queue, stats in self.subscriber_stats.items():
+            if project_id is not None and stats["project_id"] != project_id:
+                continue
+            subscribers.append({**stats, "lag": queue.qsize()})
+        return {
+            "subscriber_count": len(subscribers),
+            "total_lag": sum(s["lag"] for s in subscribers),
+            "total_dropped": sum(s["dropped"] for s in subscribers),
+            "subscribers": subscribers,
+        }
 
 # 싱글톤 인스턴스
 sse_notice_manager = SSENoticeManager()
@@ -0,0 +1,96 @@
+import mimetypes
+import os
+import re
+import stat
+from email.utils import formatdate
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# === 정적 파일 캐시 설정 ===
+STATIC_IMMUTABLE_MAX_AGE = int(os.getenv("STATIC_IMMUTABLE_MAX_AGE", str(365 * 24 * 3600)))
+# 설정 시 파일 본문 대신 X-Accel-Redirect 헤더만 응답 → nginx가 sendfile로 직접 전송 (예: /_uploads_internal/)
+STATIC_ACCEL_REDIRECT = os.getenv("STATIC_ACCEL_REDIRECT", "")
+
+# 이름이 내용/업로드마다 유일한 파일 (uuid hex 32자, sha256 64자 포함) → 같은 URL의 내용이 바뀌지 않음
+UNIQUE_NAME_RE = re.compile(r"[0-9a-f]{32,}", re.IGNORECASE)
+# 내용 주소 파일명 (sha256 + 확장자) → 해시 자체를 ETag로 사용
+CONTENT_KEY_RE = re.compile(r"^([0-9a-f]{64})\.[0-9a-z]+$", re.IGNORECASE)
+
+# Accept-Encoding 우선순위별 사전 압축 파일 접미사
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    [Static] 캐시 친화적 업로드 파일 서빙
+    - 유일한 파일명: Cache-Control immutable + 1년 (브라우저가 재검증 없이 재사용)
+    - 그 외 파일명: no-cache (매번 ETag로 재검증, 변경 없으면 304)
+    - 강한 ETag: 내용 주소 파일은 sha256, 그 외는 크기+수정 시각
+    - 옆에 .br/.gz 파일이 있으면 Accept-Encoding에 맞춰 사전 압축본 전송 (Vary: Accept-Encoding)
+    - Range/zero-copy 전송은 FileResponse(pathsend 지원 서버) 또는 nginx X-Accel-Redirect에 위임
+    """
+    def __init__(self, *args, max_age: int = STATIC_IMMUTABLE_MAX_AGE,
+                 accel_redirect: Optional[str] = STATIC_ACCEL_REDIRECT or None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+        self.accel_redirect = accel_redirect
+
+    @staticmethod
+    def _precompressed(full_path: str, accept_encoding: str):
+        """허용된 인코딩의 사전 압축 파일 (encoding, 경로, stat) 또는 None"""
+        accepted = {token.split(";")[0].strip() for token in accept_encoding.lower().split(",")}
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            try:
+                st = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                return encoding, full_path + suffix, st
+        return None
+
+    @staticmethod
+    def _strong_etag(name: str, stat_result: os.stat_result, encoding: Optional[str]) -> str:
+        match = CONTENT_KEY_RE.match(name)
+        tag = match.group(1).lower() if match else f"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+        # 인코딩별 표현이 다르므로 강한 ETag도 구분
+        return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        name = os.path.basename(full_path)
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"  # 사전 압축본도 원본 타입으로 응답
+
+        serve_path, serve_stat, encoding = full_path, stat_result, None
+        variant = self._precompressed(full_path, request_headers.get("accept-encoding", ""))
+        if variant is not None:
+            encoding, serve_path, serve_stat = variant
+
+        if UNIQUE_NAME_RE.search(name):
+            cache_control = f"public, max-age={self.max_age}, immutable"
+        else:
+            cache_control = "no-cache"
+        headers = {
+            "cache-control": cache_control,
+            "etag": self._strong_etag(name, serve_stat, encoding),
+            "last-modified": formatdate(serve_stat.st_mtime, usegmt=True),
+            "vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["content-encoding"] = encoding
+
+        if self.is_not_modified(Headers(headers), request_headers):
+            return NotModifiedResponse(Headers(headers))
+
+        if self.accel_redirect:
+            # nginx internal location이 같은 파일을 sendfile로 전송 (Range 포함), 헤더는 여기서 지정한 값 사용
+            rel = os.path.relpath(serve_path, self.directory).replace(os.sep, "/")
+            headers["x-accel-redirect"] = self.accel_redirect.rstrip("/") + "/" + rel
+            return Response(status_code=status_code, headers=headers, media_type=media_type)
+
+        return FileResponse(serve_path, status_code=status_code, headers=headers,
+                            media_type=media_type, stat_result=serve_stat)
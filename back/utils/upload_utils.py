@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import Iterable, List, Optional
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+# === 업로드 설정 ===
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))  # 파일 1개 최대 크기
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# multipart 요청 본문 전체 최대 크기 (여러 파일 + 폼 필드), 파일 1개 제한과 별도로 수신 단계에서 적용
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", str(UPLOAD_MAX_BYTES * 4)))
+
+class UploadTooLarge(Exception):
+    """업로드 파일이 크기 제한을 넘음 (라우터에서 413으로 변환)"""
+    def __init__(self, filename: Optional[str], max_bytes: int):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        super().__init__(f"파일 크기 제한 초과 ({filename}, 최대 {max_bytes / (1024 * 1024):.1f}MB)")
+
+def file_ext(filename: Optional[str]) -> str:
+    """원본 파일명의 확장자 (소문자, 점 포함)"""
+    return os.path.splitext(filename or "")[1].lower()
+
+def _write_chunk(fh, digest, chunk: bytes):
+    fh.write(chunk)
+    if digest is not None:
+        digest.update(chunk)
+
+async def save_upload_stream(file: UploadFile, dest_path: str, max_bytes: int = UPLOAD_MAX_BYTES,
+                             chunk_size: int = UPLOAD_CHUNK_SIZE, digest=None) -> int:
+    """
+    업로드 파일을 청크 단위로 디스크에 저장 (파일 I/O는 스레드 풀에서 실행, 이벤트 루프 블로킹 없음)
+    - 저장 중 max_bytes 초과 시 중단하고 임시 파일 삭제 후 UploadTooLarge
+    - .part 임시 파일에 쓴 뒤 완료 시 dest_path로 교체 (중간 실패 시 불완전 파일이 남지 않음)
+    - digest(hashlib 객체) 지정 시 쓰는 동안 같은 스레드에서 해시 계산
+    :return: 저장된 바이트 수
+    """
+    await asyncio.to_thread(os.makedirs, os.path.dirname(dest_path) or ".", exist_ok=True)
+    part_path = f"{dest_path}.part"
+    fh = await asyncio.to_thread(open, part_path, "wb")
+    written = 0
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                raise UploadTooLarge(file.filename, max_bytes)
+            await asyncio.to_thread(_write_chunk, fh, digest, chunk)
+        await asyncio.to_thread(fh.close)
+        await asyncio.to_thread(os.replace, part_path, dest_path)
+        return written
+    except BaseException:
+        await asyncio.to_thread(fh.close)
+        await remove_files([part_path])
+        raise
+
+async def stage_uploads(files: List[UploadFile], directory: str, max_bytes: int = UPLOAD_MAX_BYTES) -> List[dict]:
+    """
+    여러 업로드 파일을 임시 이름으로 저장 (DB 기록 전 단계)
+    - 하나라도 실패하면 이미 저장한 파일까지 삭제 후 예외 전달
+    :return: [{"path", "ext", "size", "filename", "sha256"}]
+    """
+    staged: List[dict] = []
+    try:
+        for file in files:
+            if not file.filename:
+                continue
+            ext = file_ext(file.filename)
+            path = os.path.join(directory, f".staging_{uuid.uuid4().hex}{ext}")
+            digest = hashlib.sha256()
+            size = await save_upload_stream(file, path, max_bytes, digest=digest)
+            staged.append({"path": path, "ext": ext, "size": size, "filename": file.filename, "sha256": digest.hexdigest()})
+    except BaseException:
+        await remove_files(s["path"] for s in staged)
+        raise
+    return staged
+
+async def move_file(src: str, dest: str):
+    await asyncio.to_thread(os.replace, src, dest)
+
+async def remove_files(paths: Iterable[str]):
+    """파일 삭제 (없는 파일은 무시, 스레드 풀에서 실행)"""
+    def _remove(targets):
+        for path in targets:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"파일 삭제 실패: {path}, {e}")
+    await asyncio.to_thread(_remove, list(paths))
+
+class UploadBodyLimitMiddleware:
+    """
+    [Upload] multipart 요청 본문 크기 제한 (UploadFile 임시 파일로 받기 전 단계)
+    - Content-Length가 제한을 넘으면 본문을 읽지 않고 바로 413
+    - Content-Length 없이(chunked) 들어오면 받은 바이트를 세다가 초과 시 수신 중단 후 413
+      (본문 파싱 오류는 FastAPI가 400으로 바꾸므로 앱 응답을 버리고 413으로 대체)
+    """
+    def __init__(self, app, max_bytes: int = UPLOAD_MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large(self):
+        return JSONResponse(
+            {"detail": f"요청 크기 제한 초과 (최대 {self.max_bytes / (1024 * 1024):.1f}MB)"}, status_code=413
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+        length = headers.get("content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            await self._too_large()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge(None, self.max_bytes)
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded and not started:
+                return  # 초과 후 앱이 만든 응답(400 등)은 버림
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if started:
+                raise
+        if exceeded and not started:
+            await self._too_large()(scope, receive, send)
@@ -0,0 +1,117 @@
+import hashlib
+import time
+import uuid
+from datetime import date, datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from back.utils.http_cache import etag_matches
+
+class ResourceVersions:
+    """
+    [Conditional GET] 리소스 범위별 변경 토큰 → ETag / Last-Modified / 304
+    - 키: (리소스, 프로젝트, 날짜 ...) 계층 범위, 쓰기 경로에서 bump()
+    - 키마다 하위 변경 토큰(subtree)과 해당 범위 직접 변경 토큰(exact)을 유지
+      · 조회 ETag = 조회 범위 subtree + 상위 범위들의 exact
+      · 다른 프로젝트/날짜의 변경은 ETag를 바꾸지 않음
+    - 토큰은 bump 시 생성되어 Pub/Sub 브로커로 전파 → 같은 변경을 받은 프로세스끼리 ETag 동일
+    - 기동 직후 토큰은 프로세스 부트 토큰 (재시작 전 ETag는 재사용되지 않음)
+    """
+    CHANNEL = "resource_versions"
+
+    def __init__(self):
+        self.boot_token = uuid.uuid4().hex[:8]
+        self.boot_time = time.time()
+        # 범위 키 -> [subtree 토큰, exact 토큰, 최종 변경 시각]
+        self.entries: Dict[tuple, list] = {}
+        self.broker = None
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 (startup에서 broker.start() 전에 호출)"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+
+    async def _on_broker_message(self, payload: dict):
+        self._apply(tuple(payload["key"]), payload["token"], payload["ts"])
+
+    @staticmethod
+    def _key(resource: str, scope: tuple) -> tuple:
+        """None 이후 범위는 버림 (지정되지 않은 범위 = 상위 범위 전체)"""
+        key = [resource]
+        for part in scope:
+            if part is None:
+                break
+            key.append(part.isoformat() if isinstance(part, (date, datetime)) else part)
+        return tuple(key)
+
+    def _entry(self, key: tuple) -> list:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [self.boot_token, self.boot_token, self.boot_time]
+        return entry
+
+    def _apply(self, key: tuple, token: str, ts: float):
+        exact = self._entry(key)
+        exact[1] = token
+        for i in range(len(key), 0, -1):
+            entry = self._entry(key[:i])
+            entry[0] = token
+            entry[2] = max(entry[2], ts)
+
+    async def bump(self, resource: str, *scope):
+        """쓰기 경로에서 호출: 해당 범위(및 상위 범위 조회)의 ETag 변경"""
+        key = self._key(resource, scope)
+        token = uuid.uuid4().hex[:12]
+        ts = time.time()
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {"key": list(key), "token": token, "ts": ts})
+        else:
+            self._apply(key, token, ts)
+
+    def current(self, resource: str, *scope) -> Tuple[str, float]:
+        """조회 범위의 (ETag, Last-Modified 시각)"""
+        key = self._key(resource, scope)
+        tokens: List[str] = []
+        last_modified = self.boot_time
+        for i in range(1, len(key)):
+            entry = self._entry(key[:i])
+            tokens.append(entry[1])
+            last_modified = max(last_modified, entry[2])
+        entry = self._entry(key)
+        tokens.append(entry[0])
+        last_modified = max(last_modified, entry[2])
+
+        digest = hashlib.blake2b("|".join(map(str, key + tuple(tokens))).encode(), digest_size=10).hexdigest()
+        return f'W/"{digest}"', last_modified
+
+    def not_modified(self, request: Request, response: Response, resource: str, *scope) -> Optional[Response]:
+        """
+        ETag/Last-Modified 헤더를 응답에 설정하고, 클라이언트 캐시가 최신이면 304 응답 반환
+        - 반드시 데이터 조회 전에 호출 (조회 중 변경되면 다음 요청에서 새로 받음)
+        """
+        etag, last_modified = self.current(resource, *scope)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        response.headers.update(headers)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+            return None
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return None
+            if int(last_modified) <= int(since):
+                return Response(status_code=304, headers=headers)
+        return None
+
+# 싱글톤 인스턴스
+resource_versions = ResourceVersions()
@@ -1,10 +1,24 @@
-from typing import List, Dict
+import asyncio
+import time
+import uuid
+from typing import List, Dict, Optional, Set, Tuple
 from fastapi import WebSocket
 
 class NoticeNamespaceManager:
+    CHANNEL = "ws_notice"
+
     def __init__(self):
         # project_id별 연결된 클라이언트 관리
         self.active_connections: Dict[int, List[WebSocket]] = {}
+        self.broker = None
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 → 다른 프로세스에 연결된 클라이언트에도 전송"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+
+    async def _on_broker_message(self, payload: dict):
+        await self._deliver(payload["project_id"], payload["message"])
 
     async def connect(self, websocket: WebSocket, project_id: int):
         await websocket.accept()
@@ -18,6 +32,13 @@ class NoticeNamespaceManager:
 
     async def broadcast(self, project_id: int, message: dict):
         """특정 프로젝트의 모든 클라이언트에게 메시지 전송"""
+        if self.broker is not None:
+            await self.broker.publish(self.CHANNEL, {"project_id": project_id, "message": message})
+        else:
+            await self._deliver(project_id, message)
+
+    async def _deliver(self, project_id: int, message: dict):
+        """현재 프로세스에 연결된 클라이언트에게 전송"""
         if project_id in self.active_connections:
             for connection in self.active_connections[project_id]:
                 try:
@@ -28,3 +49,181 @@ class NoticeNamespaceManager:
 
 # 싱글톤 인스턴스
 notice_ws_manager = NoticeNamespaceManager()
+
+
+class WorkerPositionManager:
+    """
+    [관제 지도] 작업자 실시간 위치 WebSocket 팬아웃
+    - 위치 수신 시 publish()로 프로젝트별 최신 위치만 덮어써서 모아둠 (coalescing)
+    - tick(기본 500ms)마다 변경된 작업자 위치(delta)만 한 메시지로 전송
+    - 연결마다 크기 제한 큐 + 전용 송신 태스크 → 느린 클라이언트가 다른 클라이언트/수신 경로를 막지 않음
+    - 큐가 가득 찬 연결(느린 소비자)은 끊어버림
+    - attach(broker) 후에는 tick마다 모은 delta를 브로커로 발행 → 각 프로세스가 자기 연결에 전송
+    - 프로세스마다 구독 중인 프로젝트 목록을 주기적으로 알림 → 어느 프로세스에도 구독자가 없는 프로젝트는 발행하지 않음
+    """
+    CHANNEL = "worker_positions"
+    SUBSCRIBERS_CHANNEL = "worker_positions_subscribers"
+
+    def __init__(self, tick: float = 0.5, queue_size: int = 16, announce_interval: float = 10.0):
+        self.tick = tick
+        self.queue_size = queue_size
+        self.announce_interval = announce_interval
+        self.broker = None
+        self.node_id = uuid.uuid4().hex[:12]
+        # 다른 프로세스 node_id -> (구독 중인 project_id 집합(None=전체), 마지막 알림 시각)
+        self.remote_subscribers: Dict[str, Tuple[Set[Optional[int]], float]] = {}
+        self._announced: Set[Optional[int]] = set()
+        self._announced_at = 0.0
+        # project_id(None=전체 프로젝트 구독) -> {websocket: 송신 큐}
+        self.active_connections: Dict[Optional[int], Dict[WebSocket, asyncio.Queue]] = {}
+        self.senders: Dict[WebSocket, asyncio.Task] = {}
+        # project_id -> {worker_id: 최신 위치}
+        self.pending: Dict[int, Dict[int, dict]] = {}
+        self.dropped_clients = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self, websocket: WebSocket, project_id: Optional[int] = None):
+        await websocket.accept()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.active_connections.setdefault(project_id, {})[websocket] = queue
+        self.senders[websocket] = asyncio.get_running_loop().create_task(self._sender(websocket, project_id, queue))
+
+    def disconnect(self, websocket: WebSocket, project_id: Optional[int] = None):
+        conns = self.active_connections.get(project_id)
+        if conns is not None:
+            conns.pop(websocket, None)
+            if not conns:
+                del self.active_connections[project_id]
+        task = self.senders.pop(websocket, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _sender(self, websocket: WebSocket, project_id: Optional[int], queue: asyncio.Queue):
+        try:
+            while True:
+                message = await queue.get()
+                await websocket.send_json(message)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # 전송 실패 = 연결 끊김
+            self.disconnect(websocket, project_id)
+
+    def _offer(self, websocket: WebSocket, project_id: Optional[int], queue: asyncio.Queue, message: dict):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 느린 소비자: 대기 없이 연결 종료 (클라이언트는 재접속 후 최신 상태부터 수신)
+            self.dropped_clients += 1
+            self.disconnect(websocket, project_id)
+            asyncio.get_running_loop().create_task(self._close(websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    def attach(self, broker):
+        """Pub/Sub 브로커 연결 (startup에서 broker.start() 전에 호출)"""
+        self.broker = broker
+        broker.subscribe(self.CHANNEL, self._on_broker_message)
+        broker.subscribe(self.SUBSCRIBERS_CHANNEL, self._on_subscribers_message)
+
+    async def _on_broker_message(self, payload: dict):
+        self.broadcast(payload["project_id"], payload)
+
+    async def _on_subscribers_message(self, payload: dict):
+        node = payload["node"]
+        if node == self.node_id:
+            return
+        if payload.get("hello") and self.active_connections:
+            self._announced_at = 0.0  # 새로 뜬 프로세스에 다음 tick에서 바로 알림
+        if payload["projects"]:
+            self.remote_subscribers[node] = (set(payload["projects"]), time.monotonic())
+        else:
+            self.remote_subscribers.pop(node, None)
+
+    async def _sync_subscribers(self, hello: bool = False):
+        """구독 프로젝트 목록이 바뀌었거나 announce_interval이 지나면 다른 프로세스에 알림"""
+        if self.broker is None:
+            return
+        projects = set(self.active_connections)
+        now = time.monotonic()
+        if not hello and projects == self._announced and (not projects or now - self._announced_at < self.announce_interval):
+            return
+        await self.broker.publish(self.SUBSCRIBERS_CHANNEL, {"node": self.node_id, "projects": list(projects), "hello": hello})
+        self._announced = projects
+        self._announced_at = now
+
+    def has_subscribers(self, project_id: int) -> bool:
+        """이 프로젝트(또는 전체) 구독자가 현재 프로세스나 다른 프로세스에 있는지"""
+        if project_id in self.active_connections or None in self.active_connections:
+            return True
+        limit = time.monotonic() - self.announce_interval * 3
+        for node, (projects, seen) in list(self.remote_subscribers.items()):
+            if seen < limit:
+                del self.remote_subscribers[node]  # 알림이 끊긴 프로세스 (종료/장애)
+            elif project_id in projects or None in projects:
+                return True
+        return False
+
+    def publish(self, project_id: int, worker_id: int, position: dict):
+        """위치 수신 경로에서 호출 (즉시 반환, 같은 tick 내 중복 위치는 최신 값만 유지)"""
+        if not self.has_subscribers(project_id):
+            return
+        self.pending.setdefault(project_id, {})[worker_id] = position
+
+    def broadcast(self, project_id: Optional[int], message: dict):
+        """특정 프로젝트(및 전체 구독자)에게 메시지 즉시 적재"""
+        targets = [project_id, None] if project_id is not None else list(self.active_connections)
+        for pid in targets:
+            for websocket, queue in list(self.active_connections.get(pid, {}).items()):
+                self._offer(websocket, pid, queue, message)
+
+    async def flush(self):
+        pending, self.pending = self.pending, {}
+        for project_id, positions in pending.items():
+            if not self.has_subscribers(project_id):
+                continue  # tick 사이에 구독자가 모두 끊김
+            message = {
+                "type": "WORKER_POSITIONS",
+                "project_id": project_id,
+                "data": list(positions.values())
+            }
+            if self.broker is not None:
+                await self.broker.publish(self.CHANNEL, message)
+            else:
+                self.broadcast(project_id, message)
+
+    async def _run(self):
+        hello = True  # 기동 직후 다른 프로세스의 구독 목록을 바로 받기 위한 첫 알림
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                await self._sync_subscribers(hello)
+                hello = False
+                await self.flush()
+            except Exception as e:
+                print(f"❌ [WorkerPosition] 위치 발행 실패: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self.senders.values()):
+            task.cancel()
+        self.senders.clear()
+        self.active_connections.clear()
+
+# 싱글톤 인스턴스
+worker_position_manager = WorkerPositionManager()
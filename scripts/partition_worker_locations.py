@@ -0,0 +1,92 @@
+"""
+[DB] daily_worker_locations 파티션 테이블 이전 (1회성)
+
+일반 테이블로 쌓인 위치 로그를 RANGE 파티션 테이블로 옮깁니다.
+파티션 테이블에는 DEFAULT 파티션이 없으므로, 행을 복사하기 전에 과거 범위 파티션을 먼저 만듭니다.
+
+절차 (서버 중지 상태에서):
+    1. ALTER TABLE daily_worker_locations RENAME TO daily_worker_locations_legacy;
+       (기존 인덱스/PK 이름이 새 스키마와 겹치면 함께 RENAME)
+    2. atlas schema apply 로 새 스키마(파티션 부모 테이블) 적용
+    3. python scripts/partition_worker_locations.py [legacy 테이블명]
+       - 보관기간(LOCATION_RETENTION_DAYS) 안의 가장 오래된 행부터 premake 기간까지 파티션 생성
+       - 파티션 범위 단위로 INSERT ... SELECT (보관기간 이전 행은 복사하지 않음)
+       - id 시퀀스를 복사한 최대 id로 맞춤
+    4. 확인 후 DROP TABLE daily_worker_locations_legacy;
+"""
+import asyncio
+import io
+import os
+import sys
+from datetime import date, datetime, time, timedelta
+
+# Windows 환경에서 한글 출력이 깨지지 않도록 UTF-8 강제 설정
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text
+from back.database import engine, fetch_one
+from back.daily.worker_locations.partitions import TABLE, location_partition_manager as manager
+
+COLUMNS = "id, worker_id, tracking_mode, lat, lng, beacon_id, rssi, distance, zone_id, timestamp"
+
+
+async def migrate(legacy: str):
+    if not await manager.is_partitioned():
+        print(f"❌ {TABLE} 가 파티션 테이블이 아닙니다. 새 스키마를 먼저 적용하세요.")
+        return
+
+    today = date.today()
+    cutoff = datetime.combine(today - timedelta(days=manager.retention_days), time.min) if manager.retention_days > 0 else None
+    bounds = await fetch_one(
+        f"SELECT MIN(timestamp) AS lo, MAX(timestamp) AS hi, COUNT(*) AS cnt FROM {legacy}"
+        + (" WHERE timestamp >= :cutoff" if cutoff else ""),
+        {"cutoff": cutoff} if cutoff else {},
+    )
+    if not bounds["cnt"]:
+        print("ℹ️ 복사할 행이 없습니다.")
+        return
+    if bounds["hi"] >= datetime.combine(today + timedelta(days=manager.premake), time.min):
+        print(f"⚠️ 미래 시각 행은 파티션 범위 밖이라 복사하지 않습니다 (최대 {bounds['hi']})")
+
+    # 1. 과거 범위 파티션 생성 (가장 오래된 행 ~ 오늘 + premake)
+    await manager.ensure_range(bounds["lo"].date(), today + timedelta(days=manager.premake))
+    print(f"✅ 파티션 준비 완료 (생성 {manager.created}개, {bounds['lo']:%Y-%m-%d} ~)")
+
+    # 2. 파티션 범위마다 별도 트랜잭션으로 복사 (한 번에 전체를 잡지 않도록)
+    copied = 0
+    for p in await manager.list_partitions():
+        if p["lower"] is None or p["upper"] <= bounds["lo"] or p["lower"] > bounds["hi"]:
+            continue
+        async with engine.begin() as conn:
+            result = await conn.execute(text(f"""
+                INSERT INTO {TABLE} ({COLUMNS})
+                SELECT {COLUMNS} FROM {legacy}
+                WHERE timestamp >= :lower AND timestamp < :upper
+            """), {"lower": p["lower"], "upper": p["upper"]})
+        copied += result.rowcount
+        print(f"  - {p['name']}: {result.rowcount}건")
+
+    # 3. 새 테이블 id 시퀀스를 이어서 발급하도록 맞춤
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {TABLE}))"
+        ))
+    print(f"✅ 복사 완료: {copied} / {bounds['cnt']}건")
+
+
+async def main():
+    try:
+        await migrate(sys.argv[1] if len(sys.argv) > 1 else f"{TABLE}_legacy")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
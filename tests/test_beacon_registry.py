@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from back.device.beacons import registry as registry_module
+from back.device.beacons.registry import BeaconRegistry, estimate_distance
+from back.utils.broker import InProcessBroker
+
+BEACONS = [
+    {"id": 1, "uuid": "AAAA", "major": 1, "minor": 1, "zone_id": 10, "zone_name": "A", "zone_type": "NORMAL", "project_id": 1},
+    {"id": 2, "uuid": "AAAA", "major": 1, "minor": 2, "zone_id": 20, "zone_name": "B", "zone_type": "DANGER", "project_id": 1},
+]
+
+@pytest.fixture
+def fake_repository(monkeypatch):
+    calls = []
+
+    async def get_all():
+        calls.append(1)
+        return list(BEACONS)
+
+    monkeypatch.setattr(registry_module.beacons_repository, "get_all", staticmethod(get_all))
+    return calls
+
+def test_estimate_distance_at_reference_power():
+    assert estimate_distance(-59) == pytest.approx(1.0)
+    assert estimate_distance(-79) == pytest.approx(10.0)
+
+def test_resolve_picks_zone_with_strongest_weight(fake_repository):
+    registry = BeaconRegistry()
+    readings = [{"uuid": "aaaa", "major": 1, "minor": 1, "rssi": -80}, {"beacon_id": 2, "distance": 1.5}]
+    hit = asyncio.run(registry.resolve(7, readings))
+    assert hit["zone_id"] == 20 and hit["beacon_id"] == 2 and hit["distance"] == 1.5
+
+def test_invalidation_from_other_process_forces_reload(fake_repository):
+    registry = BeaconRegistry()
+    registry.attach(InProcessBroker())
+
+    async def scenario():
+        await registry.ensure_loaded()
+        await registry.ensure_loaded()
+        assert len(fake_repository) == 1
+        await registry._on_broker_message({})
+        await registry.ensure_loaded()
+        assert len(fake_repository) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import time
+
+from back.utils.blob_store import BlobStore, LocalBlobBackend
+
+def _stage(tmp_path, name: str, sha: str = "a" * 64) -> dict:
+    path = tmp_path / name
+    path.write_bytes(b"image")
+    return {"path": str(path), "sha256": sha, "ext": ".jpg"}
+
+def _age(backend: LocalBlobBackend, key: str, seconds: float):
+    old = time.time() - seconds
+    os.utime(backend.local_path(key), (old, old))
+
+def _store(tmp_path, referenced=frozenset(), grace: float = 60):
+    async def find_referenced(keys):
+        return set(keys) & set(referenced)
+    return BlobStore(LocalBlobBackend(str(tmp_path / "blobs")), find_referenced, grace=grace)
+
+def test_put_staged_deduplicates_same_content(tmp_path):
+    store = _store(tmp_path)
+
+    async def scenario():
+        first = await store.put_staged(_stage(tmp_path, "1.tmp"))
+        second = await store.put_staged(_stage(tmp_path, "2.tmp"))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == "a" * 64 + ".jpg"
+    assert store.stats["stored"] == 1 and store.stats["deduplicated"] == 1
+    assert not (tmp_path / "2.tmp").exists()
+
+def test_collect_respects_references_and_grace(tmp_path):
+    store = _store(tmp_path, referenced={"b" * 64 + ".jpg"})
+    backend = store.backend
+
+    async def scenario():
+        keys = [await store.put_staged(_stage(tmp_path, f"{c}.tmp", c * 64)) for c in "abc"]
+        for key in keys[:2]:
+            _age(backend, key, 120)
+            store.release(key, [f"thumb_{key}"])
+        store.release(keys[2])
+        store.pending = {k: (0.0, v[1]) for k, v in store.pending.items()}  # 유예 경과
+        return keys, await store.collect()
+
+    keys, collected = asyncio.run(scenario())
+    assert collected == 2  # 원본 + 파생 키
+    assert not os.path.exists(backend.local_path(keys[0]))
+    assert os.path.exists(backend.local_path(keys[1]))  # 참조 중
+    assert os.path.exists(backend.local_path(keys[2]))  # 최근 업로드
+
+def test_dedupe_during_gc_keeps_blob(tmp_path):
+    holder = {}
+
+    async def find_referenced(keys):
+        # GC가 참조를 확인한 직후 같은 내용이 다시 업로드됨
+        holder["upload"] = asyncio.get_running_loop().create_task(holder["store"].put_staged(_stage(tmp_path, "2.tmp")))
+        await asyncio.sleep(0)
+        return set()
+
+    store = BlobStore(LocalBlobBackend(str(tmp_path / "blobs")), find_referenced, grace=60)
+    holder["store"] = store
+
+    async def scenario():
+        key = await store.put_staged(_stage(tmp_path, "1.tmp"))
+        _age(store.backend, key, 120)
+        store.release(key)
+        store.pending[key] = (0.0, set())
+        await store.collect()
+        return key, await holder["upload"]
+
+    key, uploaded = asyncio.run(scenario())
+    assert uploaded == key
+    assert os.path.exists(store.backend.local_path(key))
+
+def test_purge_temp_removes_only_stale_part_files(tmp_path):
+    backend = LocalBlobBackend(str(tmp_path))
+    for name in (".old.webp.1.part", ".new.webp.2.part", "keep.jpg"):
+        (tmp_path / name).write_bytes(b"x")
+    _age(backend, ".old.webp.1.part", 120)
+    _age(backend, "keep.jpg", 120)
+
+    assert asyncio.run(backend.purge_temp(60)) == 1
+    assert sorted(os.listdir(tmp_path)) == [".new.webp.2.part", "keep.jpg"]
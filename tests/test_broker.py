@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+from back.utils.broker import NOTIFY_CHUNK_CHARS, InProcessBroker, PostgresBroker
+
+def _split(body: str, msg_id: str = "m1"):
+    """PostgresBroker.publish와 같은 형식의 조각 목록"""
+    pieces = [body[i:i + NOTIFY_CHUNK_CHARS] for i in range(0, len(body), NOTIFY_CHUNK_CHARS)] or [""]
+    return [f"{msg_id}:{i}:{len(pieces)}:{piece}" for i, piece in enumerate(pieces)]
+
+def test_single_chunk_passes_through():
+    broker = PostgresBroker("postgresql://unused")
+    assert broker._reassemble("abc:0:1:{\"a\": \"x:y\"}") == "{\"a\": \"x:y\"}"
+
+def test_multi_chunk_reassembly_out_of_order():
+    broker = PostgresBroker("postgresql://unused")
+    body = json.dumps({"data": ["가나다:" * 1500]}, ensure_ascii=False)
+    parts = _split(body)
+    assert len(parts) > 2
+    results = [broker._reassemble(p) for p in reversed(parts)]
+    assert results[:-1] == [None] * (len(parts) - 1)
+    assert results[-1] == body
+    assert broker._partials == {}
+
+def test_interleaved_messages_and_expiry():
+    broker = PostgresBroker("postgresql://unused", chunk_timeout=0.0)
+    a, b = _split("a" * (NOTIFY_CHUNK_CHARS + 1), "a"), _split("b" * (NOTIFY_CHUNK_CHARS + 1), "b")
+    assert broker._reassemble(a[0]) is None
+    # chunk_timeout=0 → 다음 조각 수신 시 끝나지 않은 다른 메시지는 정리됨
+    assert broker._reassemble(b[0]) is None
+    assert "a" not in broker._partials
+    assert broker._reassemble(b[1]) == "b" * (NOTIFY_CHUNK_CHARS + 1)
+
+def test_in_process_broker_isolates_handler_errors():
+    broker = InProcessBroker()
+    received = []
+
+    async def failing(payload):
+        raise RuntimeError("boom")
+
+    async def ok(payload):
+        received.append(payload)
+
+    broker.subscribe("ch", failing)
+    broker.subscribe("ch", ok)
+    asyncio.run(broker.publish("ch", {"x": 1}))
+    assert received == [{"x": 1}]
@@ -0,0 +1,41 @@
+from back.utils import cache as cache_module
+from back.utils.cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.get_stats() == {"entries": 0, "hits": 1, "misses": 1, "ttl": 10}
+
+def test_oldest_entry_evicted_and_reset_moves_to_end():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)  # 재저장 → b가 가장 오래된 항목
+    cache.set("c", 4)
+    assert cache.get("b") is None
+    assert cache.get("a") == 3 and cache.get("c") == 4
+
+def test_invalidate_by_predicate_and_zero_ttl():
+    cache = TTLCache(ttl=60)
+    cache.set((1, "x"), 1)
+    cache.set((2, "x"), 2)
+    cache.invalidate(lambda key: key[0] == 1)
+    assert cache.get((1, "x")) is None and cache.get((2, "x")) == 2
+    cache.invalidate()
+    assert cache.get((2, "x")) is None
+
+    disabled = TTLCache(ttl=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
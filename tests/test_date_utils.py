@@ -0,0 +1,31 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from back.utils.date_utils import to_local_naive
+
+@pytest.fixture
+def seoul_tz():
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset 미지원 (Windows)")
+    old = os.environ.get("TZ")
+    os.environ["TZ"] = "Asia/Seoul"
+    time.tzset()
+    yield
+    if old is None:
+        os.environ.pop("TZ")
+    else:
+        os.environ["TZ"] = old
+    time.tzset()
+
+def test_naive_is_unchanged():
+    dt = datetime(2026, 3, 10, 9, 30)
+    assert to_local_naive(dt) is dt
+
+def test_aware_is_converted_to_local_naive(seoul_tz):
+    utc = datetime(2026, 3, 10, 0, 30, tzinfo=timezone.utc)
+    assert to_local_naive(utc) == datetime(2026, 3, 10, 9, 30)
+    kst = datetime(2026, 3, 10, 9, 30, tzinfo=timezone(timedelta(hours=9)))
+    assert to_local_naive(kst) == datetime(2026, 3, 10, 9, 30)
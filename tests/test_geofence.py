@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from back.daily.worker_locations.geofence import ProjectGrid, METERS_PER_DEGREE
+
+PROJECT = {"id": 1, "lat": 37.5, "lng": 127.0, "grid_angle": 0, "grid_spacing": 10, "grid_rows": 4, "grid_cols": 4}
+
+def _offset(dx: float, dy: float):
+    """격자 중심에서 동쪽 dx, 북쪽 dy(m) 떨어진 위경도"""
+    grid = ProjectGrid(PROJECT, [])
+    return PROJECT["lat"] + dy / METERS_PER_DEGREE, PROJECT["lng"] + dx / (grid.cos_lat0 * METERS_PER_DEGREE)
+
+def test_grid_without_zones_locates_nothing():
+    grid = ProjectGrid(PROJECT, [])
+    assert grid.default_level == "1F"
+    assert grid.locate(37.5, 127.0) is None
+
+def test_cell_lookup_uses_row_from_north_and_col_from_west():
+    zones = [{"id": 7, "name": "A1", "level": "1F", "zone_type": "NORMAL", "row_index": 0, "col_index": 0}]
+    grid = ProjectGrid(PROJECT, zones)
+    assert grid.locate(*_offset(-15, 15)) == (7, "A1", "SAFE")
+    assert grid.locate(*_offset(15, -15)) is None
+    assert grid.locate(*_offset(-25, 15)) is None  # 격자 밖
+
+def test_polygon_takes_priority_and_higher_alert_wins():
+    square = lambda half: [_offset(-half, -half), _offset(half, -half), _offset(half, half), _offset(-half, half)]
+    zones = [
+        {"id": 1, "name": "cell", "level": "1F", "zone_type": "NORMAL", "row_index": 1, "col_index": 1},
+        {"id": 2, "name": "big", "level": "1F", "zone_type": "DANGER", "points": square(8)},
+        {"id": 3, "name": "small", "level": "1F", "zone_type": "RESTRICTED", "points": square(3)},
+    ]
+    grid = ProjectGrid(PROJECT, zones)
+    assert grid.locate(*_offset(-1, 1)) == (2, "big", "DANGER")
+    assert grid.locate(*_offset(-1, 1), level="B1") is None
+
+def test_danger_count_escalates_zone():
+    zones = [{"id": 7, "name": "A1", "level": "1F", "zone_type": "NORMAL", "row_index": 0, "col_index": 0}]
+    grid = ProjectGrid(PROJECT, zones)
+    grid.danger_counts[7] = 1
+    assert grid.locate(*_offset(-15, 15)) == (7, "A1", "DANGER")
+
+def test_rebuild_level_removes_zones_and_resets_default_level():
+    zones = [{"id": 7, "name": "B", "level": "B1", "zone_type": "NORMAL", "row_index": 0, "col_index": 0}]
+    grid = ProjectGrid(PROJECT, zones)
+    assert grid.default_level == "B1"
+    grid.rebuild_level("B1", [])
+    assert grid.zone_ids == set() and grid.levels == set()
+    assert grid.default_level == "1F"
+
+def test_engine_applies_changes_published_by_other_processes():
+    from datetime import date
+    from back.daily.worker_locations.geofence import GeofenceEngine
+    from back.utils.broker import InProcessBroker
+
+    zones = [{"id": 7, "name": "A1", "level": "1F", "zone_type": "NORMAL", "row_index": 0, "col_index": 0}]
+    grid = ProjectGrid(PROJECT, zones)
+    grid.danger_date = date(2026, 3, 10)
+    engine = GeofenceEngine()
+    engine.attach(InProcessBroker())
+    engine.grids[1] = grid
+    engine.worker_projects[5] = 1
+
+    async def scenario():
+        # 다른 프로세스가 발행한 메시지는 브로커 핸들러로만 들어옴
+        await engine._on_broker_message({"kind": "danger", "zone_id": 7, "date": "2026-03-10", "delta": 1})
+        assert grid.danger_counts == {7: 1}
+        await engine._on_broker_message({"kind": "danger", "zone_id": 7, "date": "2026-03-09", "delta": 1})
+        assert grid.danger_counts == {7: 1}
+        await engine.on_danger_changed(7, date(2026, 3, 10), -1)
+        assert grid.danger_counts == {}
+        await engine._on_broker_message({"kind": "forget_worker", "worker_id": 5})
+        assert engine.worker_projects == {}
+        await engine._on_broker_message({"kind": "invalidate", "project_id": 1})
+        assert 1 not in engine.grids
+
+    asyncio.run(scenario())
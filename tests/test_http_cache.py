@@ -0,0 +1,17 @@
+from back.utils.http_cache import etag_matches
+
+def test_etag_matches_exact_and_weak():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+
+def test_etag_matches_list_and_wildcard():
+    assert etag_matches('"x", W/"abc" , "y"', '"abc"')
+    assert etag_matches(" * ", '"abc"')
+    assert not etag_matches('"x", "y"', '"abc"')
+
+def test_etag_matches_missing_values():
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches("", '"abc"')
+    assert not etag_matches('"abc"', "")
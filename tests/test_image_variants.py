@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from back.utils import image_variants
+from back.utils.image_variants import render_variants, variant_filename
+
+def test_variant_filename():
+    assert variant_filename("12_ab.jpg", "thumb", "WEBP") == "12_ab_thumb.webp"
+    assert variant_filename("ab.png", "medium", "JPEG") == "ab_medium.jpg"
+
+def _source(tmp_path, size=(400, 200)) -> str:
+    Image = pytest.importorskip("PIL.Image")
+    Image.new("RGB", size, (200, 10, 10)).save(tmp_path / "src.jpg")
+    return "src.jpg"
+
+def test_render_variants_resizes_without_upscaling(tmp_path):
+    name = _source(tmp_path)
+    result = render_variants(str(tmp_path), name, sizes=(("thumb", 100), ("medium", 1000)), fmt="JPEG")
+    assert result == {"thumb": "src_thumb.jpg", "medium": "src_medium.jpg"}
+
+    from PIL import Image
+    with Image.open(tmp_path / "src_thumb.jpg") as thumb:
+        assert thumb.size == (100, 50)
+    with Image.open(tmp_path / "src_medium.jpg") as medium:
+        assert medium.size == (400, 200)
+    assert not [n for n in os.listdir(tmp_path) if n.endswith(".part")]
+
+def test_render_variants_removes_temp_file_on_save_error(tmp_path, monkeypatch):
+    name = _source(tmp_path)
+    original_save = image_variants.Image.Image.save
+
+    def failing_save(self, fp, *args, **kwargs):
+        original_save(self, fp, *args, **kwargs)  # 일부 기록 후 실패
+        raise OSError("disk full")
+
+    monkeypatch.setattr(image_variants.Image.Image, "save", failing_save)
+    with pytest.raises(OSError):
+        render_variants(str(tmp_path), name, sizes=(("thumb", 100),), fmt="JPEG")
+    assert os.listdir(tmp_path) == ["src.jpg"]
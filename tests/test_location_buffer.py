@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from back.daily.worker_locations import buffer as buffer_module
+from back.daily.worker_locations.buffer import LocationWriteBuffer
+
+class FakeRepository:
+    """worker_id가 bad에 있으면 FK 위반, down이면 연결 장애"""
+    def __init__(self, bad=(), down=False):
+        self.bad = set(bad)
+        self.down = down
+        self.saved = []
+
+    async def bulk_insert(self, rows):
+        if self.down:
+            raise OperationalError("INSERT", {}, Exception("connection refused"))
+        if any(r["worker_id"] in self.bad for r in rows):
+            raise IntegrityError("INSERT", {}, Exception("fk violation"))
+        self.saved.extend(rows)
+
+@pytest.fixture
+def repo(monkeypatch):
+    fake = FakeRepository()
+    monkeypatch.setattr(buffer_module, "worker_locations_repository", fake)
+    return fake
+
+def _rows(*worker_ids):
+    return [{"worker_id": w} for w in worker_ids]
+
+def test_flush_saves_in_batches(repo):
+    buf = LocationWriteBuffer(max_rows=2)
+    buf.pending = _rows(1, 2, 3)
+    asyncio.run(buf.flush())
+    assert repo.saved == _rows(1, 2, 3) and buf.pending == []
+
+def test_bad_rows_are_isolated_and_rejected(repo):
+    repo.bad = {3, 6}
+    buf = LocationWriteBuffer(max_rows=8)
+    buf.pending = _rows(1, 2, 3, 4, 5, 6, 7)
+    asyncio.run(buf.flush())
+    assert [r["worker_id"] for r in repo.saved] == [1, 2, 4, 5, 7]
+    assert buf.rejected == 2 and buf.pending == []
+
+def test_transient_failure_requeues_rows(repo):
+    repo.down = True
+    buf = LocationWriteBuffer(max_rows=2)
+    buf.pending = _rows(1, 2, 3)
+    asyncio.run(buf.flush())
+    assert buf.pending == _rows(1, 2, 3) and buf.rejected == 0
+
+def test_pending_is_capped(repo):
+    buf = LocationWriteBuffer(max_rows=100, max_pending=3)
+    buf.add(_rows(1, 2, 3, 4, 5))
+    assert buf.pending == _rows(3, 4, 5) and buf.dropped == 2
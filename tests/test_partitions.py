@@ -0,0 +1,40 @@
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from back.daily.worker_locations.partitions import LocationPartitionManager
+
+TODAY = date(2026, 3, 10)  # 화요일
+
+def _manager(**kwargs) -> LocationPartitionManager:
+    manager = LocationPartitionManager(**kwargs)
+    manager.partitioned = True
+    return manager
+
+def test_accepts_everything_before_migration():
+    manager = LocationPartitionManager()
+    assert manager.accepts(datetime(2000, 1, 1), today=TODAY)
+
+def test_accepts_window_bounds():
+    manager = _manager(premake=3, retention_days=90)
+    assert manager.accepts(datetime(2026, 3, 12, 23, 59), today=TODAY)
+    assert not manager.accepts(datetime(2026, 3, 13), today=TODAY)
+    assert manager.accepts(datetime(2025, 12, 10), today=TODAY)
+    assert not manager.accepts(datetime(2025, 12, 9, 23, 59), today=TODAY)
+
+def test_accepts_rejects_before_earliest_partition_without_retention():
+    manager = _manager(retention_days=0)
+    manager.earliest = datetime(2026, 1, 1)
+    assert manager.accepts(datetime(2026, 1, 1), today=TODAY)
+    assert not manager.accepts(datetime(2025, 12, 31, 23, 59), today=TODAY)
+
+def test_weekly_partitions_start_on_monday():
+    manager = LocationPartitionManager(interval="week")
+    assert manager._period_start(TODAY) == date(2026, 3, 9)
+    assert LocationPartitionManager.partition_name(date(2026, 3, 9)) == "daily_worker_locations_p20260309"
+
+def test_invalid_interval():
+    with pytest.raises(ValueError):
+        LocationPartitionManager(interval="month")
@@ -0,0 +1,41 @@
+import random
+
+from back.utils.spatial_index import STRTree, point_in_polygon, polygon_area, polygon_bbox
+
+SQUARE = [(0, 0), (4, 0), (4, 4), (0, 4)]
+L_SHAPE = [(0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)]
+
+def test_polygon_helpers():
+    assert polygon_bbox(L_SHAPE) == (0, 0, 4, 4)
+    assert polygon_area(SQUARE) == 16
+    assert polygon_area(list(reversed(L_SHAPE))) == 7
+
+def test_point_in_polygon_concave():
+    assert point_in_polygon(0.5, 3, L_SHAPE)
+    assert point_in_polygon(3, 0.5, L_SHAPE)
+    assert not point_in_polygon(3, 3, L_SHAPE)
+    assert not point_in_polygon(5, 1, SQUARE)
+
+def test_empty_tree():
+    tree = STRTree([])
+    assert tree.root is None and tree.size == 0
+    assert tree.query_point(0, 0) == []
+
+def test_query_matches_brute_force():
+    rng = random.Random(7)
+    items = []
+    for i in range(300):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        w, h = rng.uniform(1, 40), rng.uniform(1, 40)
+        items.append(((x, y, x + w, y + h), i))
+    tree = STRTree(items, node_capacity=4)
+    assert tree.size == 300
+
+    for _ in range(500):
+        px, py = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        expected = {i for (x1, y1, x2, y2), i in items if x1 <= px <= x2 and y1 <= py <= y2}
+        assert set(tree.query_point(px, py)) == expected
+
+def test_point_on_shared_edge_returns_both():
+    tree = STRTree([((0, 0, 1, 1), "a"), ((1, 0, 2, 1), "b")])
+    assert sorted(tree.query_point(1, 0.5)) == ["a", "b"]
@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from back.utils.static_files import ImmutableStaticFiles
+
+SHA = "ab" * 32
+
+def _client(tmp_path, **kwargs) -> TestClient:
+    (tmp_path / f"{SHA}.jpg").write_bytes(b"jpeg-bytes")
+    (tmp_path / "logo.png").write_bytes(b"png-bytes")
+    app = Starlette(routes=[Mount("/uploads", ImmutableStaticFiles(directory=str(tmp_path), **kwargs))])
+    return TestClient(app)
+
+def test_content_key_gets_hash_etag_and_immutable_cache(tmp_path):
+    res = _client(tmp_path).get(f"/uploads/{SHA}.jpg", headers={"accept-encoding": "identity"})
+    assert res.status_code == 200
+    assert res.headers["etag"] == f'"{SHA}"'
+    assert "immutable" in res.headers["cache-control"]
+    assert res.headers["content-type"] == "image/jpeg"
+
+def test_plain_name_revalidates_and_returns_304(tmp_path):
+    client = _client(tmp_path)
+    first = client.get("/uploads/logo.png", headers={"accept-encoding": "identity"})
+    assert first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+    assert not etag.startswith("W/")
+
+    second = client.get("/uploads/logo.png", headers={"if-none-match": f'"other", {etag}', "accept-encoding": "identity"})
+    assert second.status_code == 304
+    assert second.content == b""
+
+def test_precompressed_variant_has_its_own_etag(tmp_path):
+    client = _client(tmp_path)
+    (tmp_path / "logo.png.br").write_bytes(b"brotli")
+    res = client.get("/uploads/logo.png", headers={"accept-encoding": "gzip, br"})
+    assert res.headers["content-encoding"] == "br"
+    assert res.headers["etag"].endswith('-br"')
+    assert res.headers["content-type"] == "image/png"
+    assert res.headers["vary"] == "Accept-Encoding"
+
+def test_accel_redirect_returns_header_without_body(tmp_path):
+    client = _client(tmp_path, accel_redirect="/_uploads_internal/")
+    res = client.get(f"/uploads/{SHA}.jpg", headers={"accept-encoding": "identity"})
+    assert res.headers["x-accel-redirect"] == f"/_uploads_internal/{SHA}.jpg"
+    assert res.content == b""
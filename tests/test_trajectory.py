@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from back.daily.worker_locations.trajectory import LocalProjection, douglas_peucker, radial_filter, strip_projection
+
+LAT0, LNG0 = 37.5, 127.0
+
+def _rows(points_m):
+    """기준점에서 (동쪽, 북쪽) m 오프셋 목록 → 위경도 행"""
+    projection = LocalProjection(LAT0, LNG0)
+    return [{"i": i, "lat": LAT0 + y / projection.ky, "lng": LNG0 + x / projection.kx} for i, (x, y) in enumerate(points_m)]
+
+async def _aiter(rows):
+    for row in rows:
+        yield row
+
+def _projected(points_m):
+    return [{"i": i, "_x": x, "_y": y} for i, (x, y) in enumerate(points_m)]
+
+def test_radial_filter_drops_stationary_points_but_keeps_last():
+    rows = _rows([(0, 0), (0.5, 0), (1, 0), (5, 0), (5.2, 0)])
+    kept = asyncio.run(radial_filter(_aiter(rows), 2.0))
+    assert [r["i"] for r in kept] == [0, 3, 4]
+    assert abs(kept[1]["_x"] - 5) < 1e-6
+
+def test_douglas_peucker_keeps_corners_and_drops_collinear():
+    points = _projected([(0, 0), (1, 0.1), (2, 0), (3, 0), (3, 1), (3, 2)])
+    assert [p["i"] for p in douglas_peucker(points, 0.5)] == [0, 3, 5]
+
+def test_douglas_peucker_small_inputs_and_duplicates():
+    assert douglas_peucker([], 1.0) == []
+    same = _projected([(0, 0), (0, 0), (0, 0)])
+    assert [p["i"] for p in douglas_peucker(same, 1.0)] == [0, 2]
+
+def test_strip_projection_removes_plane_coordinates():
+    points = strip_projection(_projected([(1, 2)]))
+    assert points == [{"i": 0}]
+
+def test_dp_trajectory_closes_stream_on_error(monkeypatch):
+    pytest.importorskip("sqlalchemy")
+    from datetime import datetime
+    from back.daily.worker_locations import service
+
+    closed = []
+
+    async def stream_trajectory(worker_id, start, end, interval_sec=None):
+        try:
+            yield {"lat": LAT0, "lng": LNG0}
+            yield {"lat": None, "lng": None}  # 잘못된 행 → radial_filter 오류
+            yield {"lat": LAT0, "lng": LNG0}
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(service.worker_locations_repository, "stream_trajectory", staticmethod(stream_trajectory))
+    async def scenario():
+        with pytest.raises(TypeError):
+            await service.get_worker_trajectory(1, datetime(2026, 3, 10, 9), datetime(2026, 3, 10, 10))
+        # 이벤트 루프 종료 시 정리(shutdown_asyncgens)가 아니라 오류 직후 바로 닫혀야 함
+        assert closed == [True]
+
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from starlette.responses import JSONResponse
+
+from back.utils.upload_utils import UploadBodyLimitMiddleware
+
+async def _reading_app(scope, receive, send):
+    """본문을 끝까지 읽은 뒤 크기를 응답 (파싱 오류는 400)"""
+    size = 0
+    try:
+        while True:
+            message = await receive()
+            size += len(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+    except Exception:
+        await JSONResponse({"detail": "parse error"}, status_code=400)(scope, receive, send)
+        raise
+    await JSONResponse({"size": size})(scope, receive, send)
+
+def _call(chunks, headers, max_bytes=10):
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]}
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1} for i, c in enumerate(chunks)]
+    received = list(messages)
+    sent = []
+
+    async def receive():
+        return received.pop(0) if received else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(UploadBodyLimitMiddleware(_reading_app, max_bytes=max_bytes)(scope, receive, send))
+    return sent[0]["status"], len(received)
+
+MULTIPART = {"content-type": "multipart/form-data; boundary=x"}
+
+def test_declared_length_over_limit_is_rejected_without_reading():
+    status, unread = _call([b"a" * 20], {**MULTIPART, "content-length": "20"})
+    assert status == 413 and unread == 1
+
+def test_streamed_body_over_limit_is_rejected():
+    status, unread = _call([b"a" * 6, b"a" * 6, b"a" * 6], MULTIPART)
+    assert status == 413 and unread == 1  # 초과 시점에서 수신 중단
+
+def test_body_within_limit_and_non_multipart_pass():
+    assert _call([b"a" * 5, b"a" * 5], MULTIPART)[0] == 200
+    assert _call([b"a" * 50], {"content-type": "application/json"})[0] == 200
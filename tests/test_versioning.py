@@ -0,0 +1,44 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from back.utils.broker import InProcessBroker
+from back.utils.versioning import ResourceVersions
+
+D1, D2 = date(2026, 3, 10), date(2026, 3, 11)
+
+def test_bump_changes_only_affected_scopes():
+    versions = ResourceVersions()
+    before = {
+        "project": versions.current("zones", 1)[0],
+        "day": versions.current("zones", 1, D1)[0],
+        "other_day": versions.current("zones", 1, D2)[0],
+        "other_project": versions.current("zones", 2)[0],
+    }
+    asyncio.run(versions.bump("zones", 1, D1))
+    assert versions.current("zones", 1)[0] != before["project"]  # 상위 범위 목록도 변경
+    assert versions.current("zones", 1, D1)[0] != before["day"]
+    assert versions.current("zones", 1, D2)[0] == before["other_day"]
+    assert versions.current("zones", 2)[0] == before["other_project"]
+
+def test_parent_bump_changes_child_scopes():
+    versions = ResourceVersions()
+    child = versions.current("zones", 1, D1)[0]
+    asyncio.run(versions.bump("zones", 1))
+    assert versions.current("zones", 1, D1)[0] != child
+
+def test_none_scope_means_whole_parent():
+    versions = ResourceVersions()
+    assert versions.current("zones", 1, None) == versions.current("zones", 1)
+
+def test_bump_token_is_shared_through_broker():
+    broker = InProcessBroker()
+    a, b = ResourceVersions(), ResourceVersions()
+    a.attach(broker)
+    b.attach(broker)
+    asyncio.run(a.bump("zones", 1))
+    # 발행한 프로세스도 브로커를 거쳐 반영 → 두 프로세스의 변경 토큰이 같음
+    assert a.entries[("zones", 1)][:2] == b.entries[("zones", 1)][:2]
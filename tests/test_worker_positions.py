@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from back.utils.broker import InProcessBroker
+from back.utils.websocket_manager import WorkerPositionManager
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+class CountingBroker(InProcessBroker):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    async def publish(self, channel, payload):
+        self.published.append(channel)
+        await super().publish(channel, payload)
+
+def _managers(broker):
+    # 같은 브로커를 공유하는 두 프로세스
+    a, b = WorkerPositionManager(), WorkerPositionManager()
+    a.attach(broker)
+    b.attach(broker)
+    return a, b
+
+def test_no_publish_without_subscribers_anywhere():
+    broker = CountingBroker()
+    a, b = _managers(broker)
+
+    async def scenario():
+        await a._sync_subscribers(hello=True)
+        await b._sync_subscribers(hello=True)
+        a.publish(1, 5, {"worker_id": 5})
+        await a.flush()
+
+    asyncio.run(scenario())
+    assert a.pending == {}
+    assert WorkerPositionManager.CHANNEL not in broker.published
+
+def test_positions_reach_subscriber_in_other_process():
+    broker = CountingBroker()
+    a, b = _managers(broker)
+    ws = FakeWebSocket()
+
+    async def scenario():
+        await b.connect(ws, project_id=1)
+        await b._sync_subscribers()
+        a.publish(2, 6, {"worker_id": 6})  # 구독자 없는 프로젝트
+        a.publish(1, 5, {"worker_id": 5, "lat": 1})
+        a.publish(1, 5, {"worker_id": 5, "lat": 2})
+        await a.flush()
+        await asyncio.sleep(0)
+        await b.stop()
+
+    asyncio.run(scenario())
+    assert broker.published.count(WorkerPositionManager.CHANNEL) == 1
+    assert ws.sent == [{"type": "WORKER_POSITIONS", "project_id": 1, "data": [{"worker_id": 5, "lat": 2}]}]
+
+def test_remote_subscribers_expire_and_clear():
+    broker = CountingBroker()
+    a, b = _managers(broker)
+
+    async def scenario():
+        await b.connect(FakeWebSocket(), project_id=None)
+        await b._sync_subscribers()
+        assert a.has_subscribers(3)
+        b.active_connections.clear()
+        await b._sync_subscribers()
+        assert not a.has_subscribers(3)
+        await b.stop()
+
+    asyncio.run(scenario())